@@ -0,0 +1,184 @@
+"""
+Logging that stays off the event loop's critical path.
+
+``configure_logging(mode="async")`` puts a bounded queue between the loop and
+the console. ``logging`` calls on the loop only enqueue the record, and a
+``QueueListener`` thread formats and writes it. When the consumer of stdout
+or stderr (a terminal, a container log driver) falls behind, the queue fills
+and records are dropped and counted instead of blocking every session on a
+full pipe. ``mode="sync"`` writes on the calling thread, as
+``logging.basicConfig`` does.
+
+``fmt="json"`` writes one JSON object per line, with any ``extra=`` fields
+(``session``, ``chunks``, ...) as keys.
+
+``ChunkLog`` covers the per-chunk messages of one session: outbound audio
+frames, transcript fragments and partial text. It counts them and writes at
+most one summary record per ``interval`` seconds, instead of a line per
+20-40 ms chunk.
+"""
+
+from __future__ import annotations
+
+import collections
+import datetime
+import json
+import logging
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Counter, List, Optional, TextIO, Union
+
+LOG_MODES = ("async", "sync")
+LOG_FORMATS = ("text", "json")
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+# Attributes every LogRecord has; anything else on a record came from ``extra=``.
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, and the ``extra=`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Enqueue records without formatting them and without ever blocking.
+
+    Records go to the listener as they are, so message formatting happens on
+    the listener thread. Arguments must therefore not be mutated after the
+    call; this app passes strings, numbers and fresh dicts. A full queue drops
+    the record. The drop count is reported by the next record that fits.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._unreported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self._unreported:
+                notice = logging.LogRecord(
+                    "async_logging", logging.WARNING, __file__, 0,
+                    "Log queue full: dropped %d records", (self._unreported,), None,
+                )
+                self.queue.put_nowait(notice)
+                self._unreported = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+
+
+class DrainingQueueListener(QueueListener):
+    """``stop()`` waits for room for its sentinel instead of failing on a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+def configure_logging(
+    mode: str = "async",
+    fmt: str = "text",
+    level: Union[int, str] = logging.INFO,
+    stream: Optional[TextIO] = None,
+    queue_size: int = 10000,
+) -> Optional[DrainingQueueListener]:
+    """
+    Install the root handler. In async mode, returns the started listener; stop it at
+    shutdown to flush what is queued.
+    """
+    if mode not in LOG_MODES:
+        raise ValueError(f"Unknown log mode {mode!r}; expected one of {LOG_MODES}")
+    if fmt not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format {fmt!r}; expected one of {LOG_FORMATS}")
+    output = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level)
+    if mode == "sync":
+        root.addHandler(output)
+        return None
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+    root.addHandler(DroppingQueueHandler(log_queue))
+    listener = DrainingQueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+class ChunkLog:
+    """
+    Per-session summary of per-chunk events, written at most once per ``interval``.
+
+    ``chunk`` is cheap when nothing is due: two counter updates and a clock
+    read. ``interval=0`` writes a record for every chunk.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        interval: float = 1.0,
+        logger: Optional[logging.Logger] = None,
+        clock: Callable[[], float] = time.monotonic,
+        max_text: int = 200,
+    ) -> None:
+        self.session_id = session_id
+        self.interval = interval
+        self._logger = logger or logging.getLogger("maitre_d.chunks")
+        self._clock = clock
+        self._max_text = max_text
+        self._counts: Counter[str] = collections.Counter()
+        self._bytes: Counter[str] = collections.Counter()
+        self._text: List[str] = []
+        self._text_len = 0
+        self._due = clock() + interval
+
+    def chunk(self, kind: str, size: int = 0, text: Optional[str] = None) -> None:
+        self._counts[kind] += 1
+        self._bytes[kind] += size
+        if text and self._text_len < self._max_text:
+            self._text.append(text)
+            self._text_len += len(text)
+        now = self._clock()
+        if now >= self._due:
+            self.flush(now)
+
+    def flush(self, now: Optional[float] = None) -> None:
+        """Write what has accumulated (also called at turn ends and on disconnect)."""
+        if self._counts and self._logger.isEnabledFor(logging.INFO):
+            summary = ", ".join(
+                f"{kind} x{count}" + (f" ({self._bytes[kind]} B)" if self._bytes[kind] else "")
+                for kind, count in self._counts.items()
+            )
+            text = "".join(self._text)[: self._max_text]
+            self._logger.info(
+                "[AGENT TO CLIENT] %s: %s%s", self.session_id, summary, f" | {text}" if text else "",
+                extra={"session": self.session_id, "chunks": dict(self._counts), "bytes": dict(+self._bytes)},
+            )
+        self._counts.clear()
+        self._bytes.clear()
+        self._text.clear()
+        self._text_len = 0
+        self._due = (self._clock() if now is None else now) + self.interval
@@ -0,0 +1,76 @@
+"""
+G.711 mu-law codec for the binary websocket audio path.
+
+Encoding and decoding are single NumPy table lookups (64 Ki-entry encode table,
+256-entry decode table), so a 20 ms frame costs a few microseconds. mu-law halves
+PCM16 payloads with telephone-grade quality, which is plenty for speech.
+"""
+
+from __future__ import annotations
+
+from typing import Union
+
+import numpy as np
+
+from wire_protocol import CODEC_MULAW, CODEC_PCM16
+
+_BIAS = 0x84
+_CLIP = 32635
+
+PcmChunk = Union[bytes, memoryview]
+
+
+def _build_encode_table() -> np.ndarray:
+    # Same arithmetic as the CCITT reference (14-bit magnitude, floor shift for negatives).
+    pcm = np.arange(-32768, 32768, dtype=np.int32)
+    value = pcm >> 2
+    sign = np.where(value < 0, 0x80, 0)
+    magnitude = np.minimum(np.abs(value), _CLIP >> 2) + (_BIAS >> 2)
+    exponent = np.clip(np.floor(np.log2(magnitude)).astype(np.int32) - 5, 0, 7)
+    mantissa = (magnitude >> (exponent + 1)) & 0x0F
+    encoded = (~(sign | (exponent << 4) | mantissa)) & 0xFF
+    # Index by the raw uint16 bit pattern of each int16 sample.
+    table = np.empty(65536, dtype=np.uint8)
+    table[pcm.astype(np.uint16)] = encoded.astype(np.uint8)
+    return table
+
+
+def _build_decode_table() -> np.ndarray:
+    code = ~np.arange(256, dtype=np.int32) & 0xFF
+    sign = code & 0x80
+    exponent = (code >> 4) & 0x07
+    mantissa = code & 0x0F
+    magnitude = (((mantissa << 3) + _BIAS) << exponent) - _BIAS
+    return np.where(sign, -magnitude, magnitude).astype("<i2")
+
+
+_ENCODE = _build_encode_table()
+_DECODE = _build_decode_table()
+
+CODECS = {"pcm16": CODEC_PCM16, "mulaw": CODEC_MULAW}
+
+
+def mulaw_encode(pcm: PcmChunk) -> bytes:
+    """16-bit little-endian PCM -> 8-bit mu-law."""
+    return _ENCODE[np.frombuffer(pcm, dtype="<u2")].tobytes()
+
+
+def mulaw_decode(encoded: PcmChunk) -> bytes:
+    """8-bit mu-law -> 16-bit little-endian PCM."""
+    return _DECODE[np.frombuffer(encoded, dtype=np.uint8)].tobytes()
+
+
+def to_pcm16(payload: PcmChunk, codec: int) -> PcmChunk:
+    if codec == CODEC_PCM16:
+        return payload
+    if codec == CODEC_MULAW:
+        return mulaw_decode(payload)
+    raise ValueError(f"Unsupported audio codec: {codec}")
+
+
+def from_pcm16(pcm: bytes, codec: int) -> bytes:
+    if codec == CODEC_PCM16:
+        return pcm
+    if codec == CODEC_MULAW:
+        return mulaw_encode(pcm)
+    raise ValueError(f"Unsupported audio codec: {codec}")
@@ -1,4 +1,5 @@
 import os
+import re
 import sys
 from pathlib import Path
 
@@ -13,10 +14,19 @@ from services.add_guest_tool import add_guest_tool
 from services.get_status_tool import get_status_tool
 from services.knowledge_tool import get_mg_cafe_knowledge
 from services.estimate_wait_time_tool import estimate_wait_time_tool
+from services.book_table_tool import book_table_tool
+from services.batch_tool import batch_tool
+
+from .instrumentation import instrument
+from .scripted_model import ScriptedLiveModel  # registers the "scripted" model name
+
+MODEL = os.getenv("DEMO_AGENT_MODEL")
+# google_search is a Gemini built-in; the scripted stand-in cannot serve it.
+SCRIPTED = MODEL is not None and any(re.fullmatch(p, MODEL) for p in ScriptedLiveModel.supported_models())
 
 root_agent = Agent(
     name="Concierge",
-    model=os.getenv("DEMO_AGENT_MODEL"),
+    model=MODEL,
     description="Agent to manage hotel/restaurant seating, waitlist, status updates, and provide grounded info.",
     instruction=(
         """
@@ -69,19 +79,28 @@ root_agent = Agent(
                    then tell their position.
 
         6. When asked about this venue’s details (hours, menu, amenities, payments, kids/pets, policies, specials),
-           first call `get_mg_cafe_knowledge` and answer strictly from the returned text. Do not invent facts.
+           first call `get_mg_cafe_knowledge` with `query` set to the guest’s question (or its key words)
+           and answer strictly from the returned text. Do not invent facts.
         7. If the user asks for the current time or date, call `google_search` to ground the answer.
         8. Before seating a guest (check_in), confirm with them, then seat. After seating, let them know the table.
         9. Before placing a guest on the waitlist, share the estimated wait and ask for a yes/no confirmation. Respect their choice.
-        10.Always speak in english, unless explitly spoken in another language or asked to do so.
+        10.For bookings at a later time, use `book_table_tool`: action="find_slot" with the party size and
+           requested time, confirm the offered time with the guest, then action="book". When a guest says
+           they have a reservation, use action="list" to find it and action="seat" with its id.
+        11.When staff ask for several changes at once (a tour group split across tables, checking out a
+           section at shift change), make them in one `batch_tool` call instead of one tool call each.
+        12.Always speak in english, unless explitly spoken in another language or asked to do so.
         """
     ),
-    tools=[
+    # Every function tool is counted, timed and traced (see instrumentation.py).
+    tools=[instrument(tool) for tool in (
         check_availability_tool,
         add_guest_tool,
         get_status_tool,
-        google_search,
+        *([] if SCRIPTED else [google_search]),
         get_mg_cafe_knowledge,
         estimate_wait_time_tool,
-    ],
+        book_table_tool,
+        batch_tool,
+    )],
 )
@@ -0,0 +1,100 @@
+"""
+Per-tool metrics and spans for the concierge agent's function tools.
+
+``instrument(tool)`` returns an ``InstrumentedFunctionTool`` that runs the
+same function with the same declaration, and around each call records:
+
+- ``tool_calls_total{tool, outcome}``: outcome is ``ok``, ``failed`` (the
+  tool returned ``success: False`` or an ``error``, e.g. ADK rejecting
+  missing arguments) or ``error`` (it raised). The error rate is the non-ok
+  share.
+- ``tool_call_latency_ms{tool, outcome}``: wall time of the call, including
+  its state transaction (with a shared backend, the threaded reads and
+  saves and any retries after a version conflict).
+- ``tool_result_bytes{tool}``: JSON size of what goes back to the model.
+
+Each call also runs in a ``tool <name>`` span, a child of ADK's own
+``execute_tool`` span, tagged with the session and venue.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any
+
+from google.adk.tools.function_tool import FunctionTool
+from google.adk.tools.tool_context import ToolContext
+from opentelemetry import metrics, trace
+
+from services.state_registry import get_current_session, get_current_venue
+
+_tracer = trace.get_tracer(__name__)
+_meter = metrics.get_meter(__name__)
+_call_counter = _meter.create_counter(
+    name="tool_calls_total",
+    unit="1",
+    description="Tool calls made by the model, by tool and outcome (ok/failed/error)",
+)
+_latency_hist = _meter.create_histogram(
+    name="tool_call_latency_ms",
+    unit="ms",
+    description="Latency for tool calls",
+)
+_result_bytes_hist = _meter.create_histogram(
+    name="tool_result_bytes",
+    unit="By",
+    description="JSON size of tool results returned to the model",
+)
+
+
+def _outcome(result: Any) -> str:
+    if isinstance(result, dict) and (result.get("success") is False or "error" in result):
+        return "failed"
+    return "ok"
+
+
+def _result_bytes(result: Any) -> int:
+    try:
+        return len(json.dumps(result, default=str))
+    except (TypeError, ValueError):
+        return len(str(result))
+
+
+class InstrumentedFunctionTool(FunctionTool):
+    """A ``FunctionTool`` that times, counts and traces every call."""
+
+    def __init__(self, tool: FunctionTool) -> None:
+        super().__init__(tool.func, require_confirmation=tool._require_confirmation)
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        attributes = {"tool": self.name}
+        with _tracer.start_as_current_span(f"tool {self.name}") as span:
+            span.set_attribute("tool.name", self.name)
+            session_id = get_current_session()
+            if session_id:
+                span.set_attribute("session.id", session_id)
+            span.set_attribute("venue.id", get_current_venue())
+            start = time.perf_counter()
+            try:
+                result = await super().run_async(args=args, tool_context=tool_context)
+            except Exception:
+                attributes["outcome"] = "error"  # the span records the exception itself
+                raise
+            else:
+                attributes["outcome"] = _outcome(result)
+                size = _result_bytes(result)
+                span.set_attribute("tool.outcome", attributes["outcome"])
+                span.set_attribute("tool.result_bytes", size)
+                _result_bytes_hist.record(size, attributes={"tool": self.name})
+                return result
+            finally:
+                _latency_hist.record((time.perf_counter() - start) * 1000, attributes=attributes)
+                _call_counter.add(1, attributes=attributes)
+
+
+def instrument(tool: Any) -> Any:
+    """Wrap a ``FunctionTool``; other tools (e.g. model built-ins) pass through unchanged."""
+    if isinstance(tool, FunctionTool) and not isinstance(tool, InstrumentedFunctionTool):
+        return InstrumentedFunctionTool(tool)
+    return tool
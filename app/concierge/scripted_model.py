@@ -0,0 +1,358 @@
+"""
+Scripted stand-in for the live model, for load and latency tests without a key or network.
+
+``DEMO_AGENT_MODEL=scripted`` makes ``root_agent`` use it. Each connection
+plays a script of turns. A user turn ends after ``end_of_speech_ms`` of no
+inbound audio (the app's voice gate already drops silence), or as soon as a
+text message arrives. The model then waits ``response_delay_ms`` and works
+through the turn's steps:
+
+- ``{"say": "..."}``: an output transcription, then 24 kHz PCM16 in
+  ``chunk_ms`` chunks, paced at ``words_per_second`` (text-only sessions
+  get the line as a partial text part instead).
+- ``{"call": "<tool>", "args": {...}}``: a function call, which the ADK flow
+  runs against the real tools. ``<tool>`` is the declared name the model
+  sees (the function name, e.g. ``_add_guest``). The model waits for the
+  response, and later steps can use it as ``{result[...]}``.
+- ``{"pause": seconds}``: think time.
+
+Audio that arrives while the model is speaking interrupts it, as a live model
+would. ``{name}``, ``{party_size}``, ``{session}`` and ``{cycle}`` fill in per
+connection, so concurrent sessions seat different guests. A value that is only
+a placeholder keeps its type: ``"{party_size}"`` stays an int. Waits scale by
+``1 / speed``, and ``speed=0`` skips them.
+
+Settings come from ``SCRIPTED_MODEL_*`` environment variables, or are passed as
+fields when the model is constructed directly. ``SCRIPTED_MODEL_SCRIPT`` points
+to a JSON file ``{"turns": [{"user": ..., "steps": [...]}], "repeat": true}``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import os
+import random
+import re
+import string
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+import numpy as np
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.base_llm_connection import BaseLlmConnection
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import types
+from pydantic import Field
+from websockets.exceptions import ConnectionClosedOK
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_RATE = 24000
+
+DEFAULT_SCRIPT: Dict[str, Any] = {
+    "repeat": True,
+    "turns": [
+        {
+            "user": "Hi, a table for {party_size} please.",
+            "steps": [{"say": "Good evening and welcome! May I have your name, please?"}],
+        },
+        {
+            "user": "It's {name}.",
+            "steps": [
+                {"call": "_check_availability", "args": {"party_size": "{party_size}"}},
+                {"say": "Thank you, {name}. Let me check the floor for a party of {party_size}."},
+                {"call": "_estimate_wait_time", "args": {"party_size": "{party_size}"}},
+                {"say": "Shall I go ahead and get you settled?"},
+            ],
+        },
+        {
+            "user": "Yes, please.",
+            "steps": [
+                {"call": "_add_guest", "args": {"name": "{name}", "party_size": "{party_size}", "action": "auto"}},
+                {"say": "{result[message]} Enjoy your evening!"},
+            ],
+        },
+        {
+            "user": "How busy is it tonight?",
+            "steps": [
+                {"call": "_get_status", "args": {}},
+                {"pause": 0.2},
+                {"say": "We're fairly busy, but the team is turning tables quickly tonight."},
+            ],
+        },
+    ],
+}
+
+# Process-wide: the agent builds a new model object per invocation, so connection numbers live here.
+_connection_numbers = itertools.count()
+
+_PLACEHOLDER = re.compile(r"^\{(\w+)\}$")
+_STEP_KINDS = ("say", "call", "pause")
+
+
+def load_script(path: str) -> Dict[str, Any]:
+    """Read and check a script file (see the module docstring for the format)."""
+    with open(path, encoding="utf-8") as handle:
+        script = json.load(handle)
+    if not script.get("turns"):
+        raise ValueError(f"Script {path} has no turns")
+    for number, turn in enumerate(script["turns"], 1):
+        for step in turn.get("steps", ()):
+            if not any(kind in step for kind in _STEP_KINDS):
+                raise ValueError(f"Script {path}, turn {number}: step {step!r} needs one of {', '.join(_STEP_KINDS)}")
+    return script
+
+
+class _Missing(dict):
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+def _fill(value: Any, context: Dict[str, Any]) -> Any:
+    """Substitute ``{placeholders}`` in strings, recursively; unknown ones are left as written."""
+    if isinstance(value, dict):
+        return {key: _fill(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, context) for item in value]
+    if not isinstance(value, str):
+        return value
+    whole = _PLACEHOLDER.match(value)
+    if whole and whole.group(1) in context:
+        return context[whole.group(1)]
+    try:
+        return string.Formatter().vformat(value, (), _Missing(context))
+    except (KeyError, IndexError, TypeError, ValueError):
+        return value
+
+
+@lru_cache(maxsize=8)
+def _voice_chunk(chunk_ms: int) -> bytes:
+    """A quiet vowel-like tone; every outbound chunk reuses the same bytes."""
+    t = np.arange(OUTPUT_RATE * chunk_ms // 1000) / OUTPUT_RATE
+    signal = 0.2 * np.sin(2 * np.pi * 180 * t) + 0.05 * np.sin(2 * np.pi * 540 * t)
+    return (signal * 32767).astype("<i2").tobytes()
+
+
+class ScriptedLiveModel(BaseLlm):
+    """A ``BaseLlm`` whose live connections play a script instead of calling out."""
+
+    model: str = "scripted"
+    script: Dict[str, Any] = Field(
+        default_factory=lambda: load_script(os.environ["SCRIPTED_MODEL_SCRIPT"])
+        if os.getenv("SCRIPTED_MODEL_SCRIPT") else DEFAULT_SCRIPT
+    )
+    speed: float = Field(default_factory=lambda: float(os.getenv("SCRIPTED_MODEL_SPEED", "1")))
+    response_delay_ms: float = Field(default_factory=lambda: float(os.getenv("SCRIPTED_MODEL_RESPONSE_DELAY_MS", "300")))
+    end_of_speech_ms: float = Field(default_factory=lambda: float(os.getenv("SCRIPTED_MODEL_END_OF_SPEECH_MS", "500")))
+    words_per_second: float = Field(default_factory=lambda: float(os.getenv("SCRIPTED_MODEL_WORDS_PER_SECOND", "2.5")))
+    chunk_ms: int = Field(default_factory=lambda: int(os.getenv("SCRIPTED_MODEL_CHUNK_MS", "40")))
+    tool_timeout_s: float = Field(default_factory=lambda: float(os.getenv("SCRIPTED_MODEL_TOOL_TIMEOUT_S", "10")))
+    barge_in: bool = Field(default_factory=lambda: os.getenv("SCRIPTED_MODEL_BARGE_IN", "true").lower() == "true")
+    seed: int = Field(default_factory=lambda: int(os.getenv("SCRIPTED_MODEL_SEED", "0")))
+
+    @classmethod
+    def supported_models(cls) -> List[str]:
+        return [r"scripted(-.*)?"]
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        # Non-live runs get the first line of the opening turn; the script is written for live sessions.
+        steps = self.script["turns"][0].get("steps", ())
+        text = next((step["say"] for step in steps if "say" in step), "")
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part.from_text(text=text)]))
+
+    @contextlib.asynccontextmanager
+    async def connect(self, llm_request: LlmRequest) -> AsyncGenerator[BaseLlmConnection, None]:
+        unknown = {
+            step["call"] for turn in self.script["turns"] for step in turn.get("steps", ())
+            if "call" in step and step["call"] not in llm_request.tools_dict
+        }
+        if unknown:
+            raise ValueError(f"Script calls tools the agent does not have: {sorted(unknown)}; "
+                             f"declared: {sorted(llm_request.tools_dict)}")
+        config = llm_request.live_connect_config
+        modalities = [str(getattr(m, "value", m)).upper() for m in (config.response_modalities or [])] if config else []
+        connection = ScriptedLlmConnection(self, next(_connection_numbers), text_only=modalities == ["TEXT"])
+        try:
+            yield connection
+        finally:
+            await connection.close()
+
+
+class ScriptedLlmConnection(BaseLlmConnection):
+    """One live session: turns in, scripted ``LlmResponse``s out through ``receive``."""
+
+    def __init__(self, model: ScriptedLiveModel, index: int, text_only: bool = False) -> None:
+        self._model = model
+        self._text_only = text_only
+        self._rng = random.Random(model.seed * 1_000_003 + index)
+        self._index = index
+        self._turns = itertools.cycle(model.script["turns"]) if model.script.get("repeat") else iter(model.script["turns"])
+        self._turn_count = 0
+        self._context: Dict[str, Any] = {}
+        self._new_cycle()
+        self._responses: asyncio.Queue[Optional[LlmResponse]] = asyncio.Queue()
+        self._tool_results: asyncio.Queue[List[types.FunctionResponse]] = asyncio.Queue()
+        self._turn_task: Optional[asyncio.Task] = None
+        self._speech_task: Optional[asyncio.Task] = None
+        self._last_audio = 0.0
+        self._speaking = False
+        self._closed = False
+
+    def _new_cycle(self) -> None:
+        cycle = self._turn_count // max(1, len(self._model.script["turns"]))
+        self._context.update(
+            session=self._index,
+            cycle=cycle,
+            name=f"Guest {self._index}-{cycle}",
+            party_size=self._rng.choice((1, 2, 2, 2, 3, 4, 4, 5, 6)),
+        )
+
+    # --- BaseLlmConnection ----------------------------------------------------------
+    async def send_history(self, history: List[types.Content]) -> None:
+        # History is not replayed: a reconnect starts the script from the first turn.
+        logger.debug("Scripted connection %s ignoring %d history items", self._index, len(history))
+
+    async def send_content(self, content: types.Content) -> None:
+        parts = content.parts or []
+        if parts and parts[0].function_response:
+            await self._tool_results.put([part.function_response for part in parts])
+        elif parts:
+            self._start_turn(" ".join(part.text for part in parts if part.text))
+
+    async def send_realtime(self, blob: types.Blob) -> None:
+        if isinstance(blob, types.ActivityStart):
+            self._barge_in()
+        elif isinstance(blob, types.ActivityEnd):
+            self._start_turn(None)
+        else:
+            self._barge_in()
+            self._last_audio = asyncio.get_running_loop().time()
+            if self._speech_task is None or self._speech_task.done():
+                self._speech_task = asyncio.create_task(self._await_end_of_speech())
+
+    async def receive(self) -> AsyncGenerator[LlmResponse, None]:
+        while True:
+            response = await self._responses.get()
+            if response is None:
+                # What the live client raises on a clean close; it ends the ADK receive loop.
+                raise ConnectionClosedOK(None, None)
+            yield response
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for task in (self._turn_task, self._speech_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._responses.put_nowait(None)
+
+    # --- Turns ----------------------------------------------------------------------
+    async def _await_end_of_speech(self) -> None:
+        loop = asyncio.get_running_loop()
+        silence = self._model.end_of_speech_ms / 1000
+        while (remaining := self._last_audio + silence - loop.time()) > 0:
+            await asyncio.sleep(remaining)
+        self._start_turn(None)
+
+    def _barge_in(self) -> None:
+        if self._speaking and self._model.barge_in and self._turn_task is not None:
+            self._turn_task.cancel()
+            self._speaking = False
+            self._emit(LlmResponse(interrupted=True))
+
+    def _start_turn(self, heard: Optional[str]) -> None:
+        if self._closed:
+            return
+        if self._turn_task is not None and not self._turn_task.done():
+            self._turn_task.cancel()
+        turn = next(self._turns, None)
+        if turn is None:
+            # Script exhausted: acknowledge the turn and stay quiet.
+            self._emit(LlmResponse(turn_complete=True))
+            return
+        if self._turn_count and self._turn_count % len(self._model.script["turns"]) == 0:
+            self._new_cycle()
+        self._turn_count += 1
+        self._turn_task = asyncio.create_task(self._play(turn, heard))
+
+    async def _play(self, turn: Dict[str, Any], heard: Optional[str]) -> None:
+        context = self._context
+        user_text = heard or _fill(turn.get("user", ""), context)
+        if user_text:
+            self._emit(LlmResponse(input_transcription=types.Transcription(text=user_text, finished=True)))
+        await self._wait(self._model.response_delay_ms / 1000)
+        try:
+            for step in turn.get("steps", ()):
+                if "say" in step:
+                    await self._say(_fill(step["say"], context))
+                elif "call" in step:
+                    context["result"] = await self._call(step["call"], _fill(step.get("args", {}), context))
+                elif "pause" in step:
+                    await self._wait(float(step["pause"]))
+        finally:
+            self._speaking = False
+        self._emit(LlmResponse(turn_complete=True))
+
+    async def _say(self, text: str) -> None:
+        model = self._model
+        if self._text_only:
+            self._emit(LlmResponse(
+                content=types.Content(role="model", parts=[types.Part.from_text(text=text)]), partial=True
+            ))
+            return
+        self._speaking = True
+        self._emit(LlmResponse(output_transcription=types.Transcription(text=text, finished=True)))
+        chunk = _voice_chunk(model.chunk_ms)
+        seconds = max(1, len(text.split())) / model.words_per_second
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for sequence in range(max(1, round(seconds * 1000 / model.chunk_ms))):
+            # Paced against the start time so a slow loop shows up as lateness, not drift.
+            if model.speed > 0:
+                delay = started + sequence * model.chunk_ms / 1000 / model.speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)
+            self._emit(LlmResponse(content=types.Content(
+                role="model",
+                parts=[types.Part(inline_data=types.Blob(data=chunk, mime_type=f"audio/pcm;rate={OUTPUT_RATE}"))],
+            )))
+        self._speaking = False
+
+    async def _call(self, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        self._emit(LlmResponse(content=types.Content(
+            role="model", parts=[types.Part(function_call=types.FunctionCall(name=name, args=args))]
+        )))
+        try:
+            return await asyncio.wait_for(self._response(name), self._model.tool_timeout_s)
+        except asyncio.TimeoutError:
+            logger.warning("Scripted connection %s: no response to %s within %.1f s", self._index, name,
+                           self._model.tool_timeout_s)
+            return {}
+
+    async def _response(self, name: str) -> Dict[str, Any]:
+        while True:
+            # Responses to calls of an interrupted turn can still arrive; skip them.
+            for response in await self._tool_results.get():
+                if response.name == name:
+                    return dict(response.response or {})
+
+    async def _wait(self, seconds: float) -> None:
+        await asyncio.sleep(seconds / self._model.speed if self._model.speed > 0 else 0)
+
+    def _emit(self, response: LlmResponse) -> None:
+        if not self._closed:
+            self._responses.put_nowait(response)
+
+
+LLMRegistry.register(ScriptedLiveModel)
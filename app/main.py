@@ -4,8 +4,8 @@ import asyncio
 import base64
 import warnings
 import logging
-import time
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -23,9 +23,9 @@ from google.adk.agents import LiveRequestQueue
 from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
 
-from fastapi import FastAPI, WebSocket
+from fastapi import FastAPI, Query, Request, WebSocket
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.websockets import WebSocketDisconnect
 
 from opentelemetry import trace, metrics
@@ -36,12 +36,92 @@ from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import ConsoleMetricExporter, PeriodicExportingMetricReader
 
 from concierge.agent import root_agent
-from services.state_registry import ensure_manager, set_current_session, get_current_manager
+from services.seating import SeatingOptimizer
+from services.state_registry import (
+    DEFAULT_VENUE,
+    VenueLimitError,
+    acquire_manager_async,
+    ensure_manager_async,
+    registry,
+    release_manager,
+    run_transaction_async,
+    set_current_session,
+)
+from services.state_backend import backend_from_url
+from async_logging import ChunkLog, configure_logging
+from audio_codec import CODECS, from_pcm16, to_pcm16
+from outbound_queue import OutboundQueue
+from status_hub import StatusHub
+from turn_latency import TurnTracker
+from vad import VoiceGate
+from wire_protocol import CODEC_PCM16, KIND_AUDIO, pack_frame, unpack_frame
 
 warnings.filterwarnings("ignore", category=UserWarning, module="pydantic")
 
 APP_NAME = "maitre_d"
 
+# Logging: "async" hands records to a writer thread through a bounded queue (dropping,
+# never blocking, when the console falls behind); "sync" writes on the event loop.
+# LOG_FORMAT is text or json. Per-chunk agent output (audio frames, transcript pieces)
+# is summarised per session at most every LOG_CHUNK_INTERVAL_S (0 = a line per chunk).
+LOG_MODE = os.getenv("LOG_MODE", "async")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_CHUNK_INTERVAL_S = float(os.getenv("LOG_CHUNK_INTERVAL_S", "1"))
+# Console span/metric exporters share stdout with the logs; set false under load.
+OTEL_CONSOLE_EXPORT = os.getenv("OTEL_CONSOLE_EXPORT", "true").lower() == "true"
+
+# Outbound websocket queue: size in messages, PCM policy when the client lags
+# (drop_oldest | drop_newest | block), and max age before queued PCM is discarded (0 = off).
+OUTBOUND_QUEUE_SIZE = int(os.getenv("OUTBOUND_QUEUE_SIZE", "64"))
+OUTBOUND_AUDIO_POLICY = os.getenv("OUTBOUND_AUDIO_POLICY", "drop_oldest")
+OUTBOUND_STALE_AUDIO_MS = float(os.getenv("OUTBOUND_STALE_AUDIO_MS", "0"))
+
+# Inbound voice gate: drop silent mic frames before they reach the model. Keep the
+# hangover longer than the model's end-of-speech silence or turns will not close.
+VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() == "true"
+VAD_THRESHOLD_DBFS = float(os.getenv("VAD_THRESHOLD_DBFS", "-50"))
+VAD_SNR_DB = float(os.getenv("VAD_SNR_DB", "10"))
+VAD_HANGOVER_MS = float(os.getenv("VAD_HANGOVER_MS", "800"))
+VAD_PREROLL_MS = float(os.getenv("VAD_PREROLL_MS", "300"))
+VAD_THIN_EVERY = int(os.getenv("VAD_THIN_EVERY", "0"))
+
+# Session registry: idle sessions expire after the TTL; LRU eviction past the caps (0 disables)
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "1000"))
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", "0"))
+SESSION_SWEEP_SECONDS = float(os.getenv("SESSION_SWEEP_SECONDS", "60"))
+
+# Venue state storage: "memory" (single worker) or "sqlite:///path.db" (shared by workers on one host)
+STATE_BACKEND = os.getenv("STATE_BACKEND", "memory")
+STATE_POLL_SECONDS = float(os.getenv("STATE_POLL_SECONDS", "1"))
+
+# Write-ahead journal per venue under JOURNAL_DIR (empty disables); fsync batching window and snapshot cadence
+JOURNAL_DIR = os.getenv("JOURNAL_DIR", "")
+JOURNAL_FSYNC_MS = float(os.getenv("JOURNAL_FSYNC_MS", "50"))
+JOURNAL_SNAPSHOT_EVERY = int(os.getenv("JOURNAL_SNAPSHOT_EVERY", "1000"))
+
+# Seating: waiting parties considered when choosing a table, and how many adjacent tables may be joined
+SEATING_LOOKAHEAD = int(os.getenv("SEATING_LOOKAHEAD", "0"))
+SEATING_MAX_TABLES = int(os.getenv("SEATING_MAX_TABLES", "3"))
+
+# Sessions that pass no ?venue= share this venue's floor plan
+VENUE_ID = os.getenv("VENUE_ID", DEFAULT_VENUE)
+VENUE_QUERY = Query(VENUE_ID, pattern=r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def _new_voice_gate():
+    if not VAD_ENABLED:
+        return None
+    return VoiceGate(
+        threshold_dbfs=VAD_THRESHOLD_DBFS,
+        snr_db=VAD_SNR_DB,
+        hangover_ms=VAD_HANGOVER_MS,
+        preroll_ms=VAD_PREROLL_MS,
+        thin_every=VAD_THIN_EVERY,
+    )
+
 session_service = InMemorySessionService()
 
 runner = Runner(
@@ -88,20 +168,36 @@ async def start_agent_session(user_id, is_audio=False):
     return session.id, live_events, live_request_queue
 
 
-async def agent_to_client_messaging(websocket, live_events):
-    """Agent to client communication."""
+async def agent_to_client_messaging(
+    outbound: OutboundQueue,
+    live_events,
+    binary_audio: bool = False,
+    audio_codec: int = CODEC_PCM16,
+    turns: TurnTracker | None = None,
+    chunk_log: ChunkLog | None = None,
+):
+    """Agent to client communication (enqueues; the outbound writer does the sending)."""
+    chunk_log = chunk_log or ChunkLog("-", interval=LOG_CHUNK_INTERVAL_S)
+    audio_sequence = 0
     try:
         async for event in live_events:
-            start_ts = time.time()
+            if turns is not None:
+                for call in event.get_function_calls():
+                    turns.tool_call(call.name)
+                for response in event.get_function_responses():
+                    turns.tool_result(response.name)
+
             if event.output_transcription and event.output_transcription.text:
+                if turns is not None:
+                    turns.agent_transcript()
                 transcript_text = event.output_transcription.text
                 message = {
                     "mime_type": "text/plain",
                     "data": transcript_text,
                     "is_transcript": True
                 }
-                await websocket.send_text(json.dumps(message))
-                print(f"[AGENT TO CLIENT]: audio transcript: {transcript_text}")
+                await outbound.send_text(json.dumps(message))
+                chunk_log.chunk("transcript", text=transcript_text)
 
             part: Part = (
                 event.content and event.content.parts and event.content.parts[0]
@@ -110,21 +206,30 @@ async def agent_to_client_messaging(websocket, live_events):
                 is_audio = part.inline_data and part.inline_data.mime_type.startswith("audio/pcm")
                 if is_audio:
                     audio_data = part.inline_data and part.inline_data.data
-                    if audio_data:
+                    if audio_data and turns is not None:
+                        turns.agent_audio()
+                    if audio_data and binary_audio:
+                        payload = from_pcm16(audio_data, audio_codec)
+                        await outbound.send_audio(pack_frame(payload, audio_sequence, codec=audio_codec))
+                        audio_sequence += 1
+                        chunk_log.chunk("audio/pcm frame", len(audio_data))
+                    elif audio_data:
                         message = {
                             "mime_type": "audio/pcm",
                             "data": base64.b64encode(audio_data).decode("ascii")
                         }
-                        await websocket.send_text(json.dumps(message))
-                        print(f"[AGENT TO CLIENT]: audio/pcm: {len(audio_data)} bytes.")
+                        await outbound.send_audio(json.dumps(message))
+                        chunk_log.chunk("audio/pcm", len(audio_data))
 
                     if part.text and event.partial:
+                        if turns is not None:
+                            turns.agent_transcript()
                         message = {
                             "mime_type": "text/plain",
                             "data": part.text
                         }
-                        await websocket.send_text(json.dumps(message))
-                        print(f"[AGENT TO CLIENT]: text/plain: {message}")
+                        await outbound.send_text(json.dumps(message))
+                        chunk_log.chunk("text/plain", text=part.text)
 
             # If the turn complete or interrupted, send it
             if event.turn_complete or event.interrupted:
@@ -132,80 +237,144 @@ async def agent_to_client_messaging(websocket, live_events):
                     "turn_complete": event.turn_complete,
                     "interrupted": event.interrupted,
                 }
-                await websocket.send_text(json.dumps(message))
-                print(f"[AGENT TO CLIENT]: {message}")
-
-            latency_ms = (time.time() - start_ts) * 1000
-            model_latency_hist.record(latency_ms, attributes={"event": "live_event"})
-            logging.info("Model event latency %.1f ms", latency_ms)
+                outbound.send_control(json.dumps(message), interrupted=bool(event.interrupted))
+                chunk_log.flush()
+                logging.info("[AGENT TO CLIENT] %s: %s", chunk_log.session_id, message,
+                             extra={"session": chunk_log.session_id})
+                if turns is not None:
+                    turns.turn_end(interrupted=bool(event.interrupted))
     except WebSocketDisconnect:
-        print("Client disconnected from agent_to_client_messaging")
+        logging.info("Client disconnected from agent_to_client_messaging")
     except Exception as e:
-        print(f"Error in agent_to_client_messaging: {e}")
+        logging.error("Error in agent_to_client_messaging: %s", e, extra={"session": chunk_log.session_id})
+    finally:
+        chunk_log.flush()
+        # Let the writer drain what is queued, then stop.
+        outbound.close()
 
 
-async def client_to_agent_messaging(websocket, live_request_queue, session_id: str):
+async def outbound_writer(outbound: OutboundQueue):
+    """Drain the outbound queue into the websocket."""
+    try:
+        await outbound.run()
+    except WebSocketDisconnect:
+        logging.info("Client disconnected from outbound_writer")
+    except Exception as e:
+        logging.error("Error in outbound_writer: %s", e)
+    finally:
+        outbound.close()
+        logging.info("Outbound queue closed: %s", outbound.stats())
+
+
+def _forward_audio(live_request_queue, audio, voice_gate, turns: TurnTracker | None = None) -> None:
+    if len(audio) % 2:
+        # Not whole 16-bit samples: forwarding it would shift every later sample by a byte.
+        vad_frame_counter.add(1, {"decision": "malformed"})
+        return
+    chunks = voice_gate.process(audio) if voice_gate else (audio,)
+    vad_frame_counter.add(1, {"decision": "forwarded" if chunks else "suppressed"})
+    # Without a gate there is no speech/silence decision, so audio turns go untimed.
+    if turns is not None and voice_gate is not None and voice_gate.last_voiced:
+        turns.user_speech()
+    for chunk in chunks:
+        # Blob.data must be bytes, so this is the only copy between the socket and the queue.
+        live_request_queue.send_realtime(Blob(data=bytes(chunk), mime_type="audio/pcm"))
+
+
+async def client_to_agent_messaging(
+    websocket,
+    live_request_queue,
+    session_id: str,
+    venue_id: str = DEFAULT_VENUE,
+    voice_gate=None,
+    turns: TurnTracker | None = None,
+):
     """Client to agent communication."""
     try:
         while True:
-            message_json = await websocket.receive_text()
-            message = json.loads(message_json)
+            received = await websocket.receive()
+            if received["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(received.get("code", 1000))
+
+            set_current_session(session_id, venue_id)
+
+            if received.get("bytes") is not None:
+                try:
+                    frame = unpack_frame(received["bytes"])
+                    if frame.kind != KIND_AUDIO:
+                        raise ValueError(f"Unsupported binary frame kind: {frame.kind}")
+                    audio = to_pcm16(frame.payload, frame.codec)
+                except ValueError as exc:
+                    # One bad frame (truncated, unknown kind or codec) is dropped, not the session.
+                    vad_frame_counter.add(1, {"decision": "malformed"})
+                    logging.debug("Dropped frame from %s: %s", session_id, exc, extra={"session": session_id})
+                    continue
+                _forward_audio(live_request_queue, audio, voice_gate, turns)
+                continue
+
+            message = json.loads(received["text"])
             mime_type = message["mime_type"]
             data = message["data"]
 
-            set_current_session(session_id)
-
             if mime_type == "text/plain":
                 content = Content(role="user", parts=[Part.from_text(text=data)])
-                start_ts = time.time()
                 live_request_queue.send_content(content=content)
-                model_latency_hist.record(
-                    (time.time() - start_ts) * 1000,
-                    attributes={"direction": "client_to_agent", "type": "text"},
-                )
-                print(f"[CLIENT TO AGENT]: {data}")
+                if turns is not None:
+                    turns.user_text()
+                logging.info("[CLIENT TO AGENT] %s: %s", session_id, data, extra={"session": session_id})
             elif mime_type == "audio/pcm":
-                decoded_data = base64.b64decode(data)
-                start_ts = time.time()
-                live_request_queue.send_realtime(Blob(data=decoded_data, mime_type=mime_type))
-                model_latency_hist.record(
-                    (time.time() - start_ts) * 1000,
-                    attributes={"direction": "client_to_agent", "type": "audio"},
-                )
+                _forward_audio(live_request_queue, base64.b64decode(data), voice_gate, turns)
             else:
                 raise ValueError(f"Mime type not supported: {mime_type}")
     except WebSocketDisconnect:
-        print("Client disconnected from client_to_agent_messaging")
+        logging.info("Client disconnected from client_to_agent_messaging")
     except Exception as e:
-        print(f"Error in client_to_agent_messaging: {e}")
+        logging.error("Error in client_to_agent_messaging: %s", e, extra={"session": session_id})
+    finally:
+        if voice_gate:
+            logging.info("Voice gate for %s: %s", session_id, voice_gate.stats())
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+    if SESSION_SWEEP_SECONDS > 0 and SESSION_TTL_SECONDS > 0:
+        tasks.append(asyncio.create_task(_sweep_sessions()))
+    if registry.backend.shared and STATE_POLL_SECONDS > 0:
+        tasks.append(asyncio.create_task(_poll_shared_state()))
+    yield
+    for task in tasks:
+        task.cancel()
+    registry.close()
+    if log_listener is not None:
+        log_listener.stop()  # flushes what is still queued
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 STATIC_DIR = Path("static")
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 
-def setup_observability() -> None:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s %(levelname)s %(name)s %(message)s",
-    )
+def setup_observability():
+    listener = configure_logging(LOG_MODE, LOG_FORMAT, level=LOG_LEVEL, queue_size=LOG_QUEUE_SIZE)
 
     resource = Resource(attributes={"service.name": APP_NAME})
 
     tracer_provider = TracerProvider(resource=resource)
-    tracer_provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+    if OTEL_CONSOLE_EXPORT:
+        tracer_provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
     trace.set_tracer_provider(tracer_provider)
 
     meter_provider = MeterProvider(
         resource=resource,
-        metric_readers=[PeriodicExportingMetricReader(ConsoleMetricExporter())],
+        metric_readers=[PeriodicExportingMetricReader(ConsoleMetricExporter())] if OTEL_CONSOLE_EXPORT else [],
     )
     metrics.set_meter_provider(meter_provider)
+    return listener
 
 
-setup_observability()
+log_listener = setup_observability()
 tracer = trace.get_tracer(__name__)
 meter = metrics.get_meter(__name__)
 ws_connection_counter = meter.create_counter(
@@ -213,21 +382,106 @@ ws_connection_counter = meter.create_counter(
     unit="1",
     description="Total websocket connections accepted",
 )
-tool_call_counter = meter.create_counter(
-    name="tool_calls_total",
+vad_frame_counter = meter.create_counter(
+    name="vad_frames_total",
+    unit="1",
+    description="Inbound microphone frames by voice-gate decision (forwarded/suppressed/malformed)",
+)
+session_eviction_counter = meter.create_counter(
+    name="session_evictions_total",
     unit="1",
-    description="Total tool calls sent to the model",
+    description="Venues and sessions evicted from the registry, by kind and reason (ttl/max_entries/max_bytes)",
 )
-tool_latency_hist = meter.create_histogram(
-    name="tool_call_latency_ms",
-    unit="ms",
-    description="Latency for tool calls",
+
+venue_refused_counter = meter.create_counter(
+    name="venue_refused_total",
+    unit="1",
+    description="Connections and requests for a new venue refused because the registry is at its caps",
 )
-model_latency_hist = meter.create_histogram(
-    name="model_response_latency_ms",
-    unit="ms",
-    description="Model response latency per event",
+
+
+def _observe_sessions(options):
+    stats = registry.stats()
+    yield metrics.Observation(stats["venues"], {"state": "venues"})
+    yield metrics.Observation(stats["sessions"], {"state": "sessions"})
+    yield metrics.Observation(stats["connected"], {"state": "connected"})
+
+
+def _observe_session_bytes(options):
+    yield metrics.Observation(registry.stats()["bytes"])
+
+
+meter.create_observable_gauge(
+    name="session_registry_sessions",
+    callbacks=[_observe_sessions],
+    unit="1",
+    description="Venues and sessions resident in the registry, and sessions with a live connection",
+)
+meter.create_observable_gauge(
+    name="session_registry_bytes",
+    callbacks=[_observe_session_bytes],
+    unit="By",
+    description="Estimated memory held by resident session state",
+)
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _on_venue_evicted(venue_id: str, manager, reason: str) -> None:
+    """Close the status hub of an evicted venue."""
+    session_eviction_counter.add(1, {"kind": "venue", "reason": reason})
+    logging.info("Evicted venue %s (%s)", venue_id, reason)
+    hub = _status_hubs.pop(venue_id, None)
+    if hub is not None:
+        hub.close()
+
+
+def _on_session_expired(session_id: str, venue_id: str, reason: str) -> None:
+    """Drop the ADK session (conversation history) of an expired session."""
+    session_eviction_counter.add(1, {"kind": "session", "reason": reason})
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(
+        session_service.delete_session(
+            app_name=APP_NAME, user_id=session_id.removeprefix(f"{APP_NAME}_"), session_id=session_id
+        )
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+registry.configure(
+    ttl_seconds=SESSION_TTL_SECONDS,
+    max_entries=SESSION_MAX_ENTRIES,
+    max_bytes=SESSION_MAX_BYTES,
+    backend=backend_from_url(STATE_BACKEND),
+    journal_dir=Path(JOURNAL_DIR) if JOURNAL_DIR else None,
+    fsync_interval=JOURNAL_FSYNC_MS / 1000,
+    snapshot_every=JOURNAL_SNAPSHOT_EVERY,
+    seating=SeatingOptimizer(lookahead=SEATING_LOOKAHEAD, max_tables=SEATING_MAX_TABLES),
 )
+registry.add_eviction_listener(_on_venue_evicted)
+registry.add_session_listener(_on_session_expired)
+
+
+async def _sweep_sessions():
+    # Access already sweeps; this catches sessions that expire while nothing is connecting.
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_SECONDS)
+        registry.sweep()
+
+
+async def _poll_shared_state():
+    # Picks up writes from other workers so their status hubs push the change.
+    while True:
+        await asyncio.sleep(STATE_POLL_SECONDS)
+        try:
+            await registry.poll_async()
+        except Exception:
+            logging.exception("Polling the shared state backend failed")
+
 
 
 @app.get("/")
@@ -236,65 +490,210 @@ async def root():
     return FileResponse(os.path.join(STATIC_DIR, "index.html"))
 
 
+@app.exception_handler(VenueLimitError)
+async def venue_limit_reached(request: Request, exc: VenueLimitError):
+    venue_refused_counter.add(1, {"transport": "http"})
+    logging.warning("%s", exc)
+    return JSONResponse({"success": False, "message": str(exc)}, status_code=503)
+
+
+async def _admit_venue(websocket: WebSocket, venue: str) -> bool:
+    """Load the venue before accepting; close with 1013 (try again later) if the registry is full."""
+    try:
+        await ensure_manager_async(venue)
+    except VenueLimitError as exc:
+        venue_refused_counter.add(1, {"transport": "websocket"})
+        logging.warning("%s", exc)
+        await websocket.close(code=1013, reason="Venue limit reached")
+        return False
+    return True
+
+
 @app.websocket("/ws/{user_id}")
-async def websocket_endpoint(websocket: WebSocket, user_id: str, is_audio: str):
-    """Client websocket endpoint."""
+async def websocket_endpoint(
+    websocket: WebSocket,
+    user_id: str,
+    is_audio: str,
+    proto: str = "json",
+    codec: str = "pcm16",
+    venue: str = VENUE_QUERY,
+):
+    """
+    Client websocket endpoint. ``proto=binary`` sends agent audio as binary frames,
+    encoded with ``codec`` (pcm16 or mulaw); inbound frames carry their own codec.
+    Every session with the same ``venue`` operates on the same floor plan.
+    """
+    if codec not in CODECS:
+        await websocket.close(code=1003, reason=f"Unsupported codec: {codec}")
+        return
+    if not await _admit_venue(websocket, venue):
+        return
 
     await websocket.accept()
     ws_connection_counter.add(1)
-    logging.info("Client #%s connected, audio mode: %s", user_id, is_audio)
+    logging.info("Client #%s connected, audio mode: %s, protocol: %s, codec: %s", user_id, is_audio, proto, codec)
 
     user_id_str = str(user_id)
     with tracer.start_as_current_span("start_agent_session"):
         session_id, live_events, live_request_queue = await start_agent_session(
             user_id_str, is_audio == "true"
         )
-    ensure_manager(session_id)
-    set_current_session(session_id)
+    # Pinned while connected; released in finally so the idle TTL starts on disconnect.
+    manager = await acquire_manager_async(venue, session_id)
+    set_current_session(session_id, venue)
+
+    outbound = OutboundQueue(
+        websocket,
+        max_items=OUTBOUND_QUEUE_SIZE,
+        audio_policy=OUTBOUND_AUDIO_POLICY,
+        stale_audio_ms=OUTBOUND_STALE_AUDIO_MS,
+    )
+
+    # Seatings and bookings made by this session end it on this channel; the venue-wide
+    # status stream carries every kiosk's events, so it must not.
+    def forward_own_events(change):
+        for event in change["events"]:
+            if event.get("session_id") == session_id:
+                outbound.send_control(json.dumps({"event": event}))
+
+    manager.add_listener(forward_own_events)
+
+    turns = TurnTracker(session_id, venue)
+    chunk_log = ChunkLog(session_id, interval=LOG_CHUNK_INTERVAL_S)
 
     # Run bidirectional messaging concurrently
+    writer_task = asyncio.create_task(outbound_writer(outbound))
     agent_to_client_task = asyncio.create_task(
-        agent_to_client_messaging(websocket, live_events)
+        agent_to_client_messaging(
+            outbound, live_events, binary_audio=proto == "binary", audio_codec=CODECS[codec],
+            turns=turns, chunk_log=chunk_log,
+        )
     )
     client_to_agent_task = asyncio.create_task(
-        client_to_agent_messaging(websocket, live_request_queue, session_id)
+        client_to_agent_messaging(websocket, live_request_queue, session_id, venue, _new_voice_gate(), turns)
     )
 
+    tasks = [agent_to_client_task, client_to_agent_task, writer_task]
     try:
-        # Wait for either task to complete (connection close or error)
-        tasks = [agent_to_client_task, client_to_agent_task]
-        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        # Wait for any task to finish (client disconnect, model stream end, or error). Waiting for
+        # all of them would hang: the model stream only ends once the queue below is closed.
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
 
         # Check for errors in completed tasks
         for task in done:
             if task.exception() is not None:
-                print(f"Task error for client #{user_id}: {task.exception()}")
-                import traceback
-                traceback.print_exception(type(task.exception()), task.exception(), task.exception().__traceback__)
+                logging.error("Task error for client #%s", user_id, exc_info=task.exception(),
+                              extra={"session": session_id})
     finally:
         # Clean up resources (always runs, even if asyncio.wait fails)
         live_request_queue.close()
-        print(f"Client #{user_id} disconnected")
+        outbound.close()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Closes the model connection now rather than when the generator is collected.
+        await live_events.aclose()
+        manager.remove_listener(forward_own_events)
+        turns.close()
+        logging.info("Turn latency for %s: %s", session_id, turns.stats())
+        release_manager(venue, session_id)
+        logging.info("Client #%s disconnected", user_id, extra={"session": session_id})
+
+
+async def _manager_for_user(user_id: str, venue: str = VENUE_ID):
+    """Ensure and bind the shared HotelManager of ``venue`` for a given user/session."""
+    session_id = f"{APP_NAME}_{user_id}"
+    set_current_session(session_id, venue)
+    return await ensure_manager_async(venue)
 
 
-def _manager_for_user(user_id: str):
-    """Ensure and bind a HotelManager for a given user/session."""
-    session_id = f"{APP_NAME}_{user_id}"
-    ensure_manager(session_id)
-    set_current_session(session_id)
-    return get_current_manager()
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
 
 
 @app.get("/api/status")
-async def status(user_id: str = "ui"):
-    manager = _manager_for_user(user_id)
-    return manager.get_status()
+async def status(request: Request, user_id: str = "ui", venue: str = VENUE_QUERY):
+    manager = await _manager_for_user(user_id, venue)
+    snapshot = manager.status_snapshot()
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+# One hub per venue: every kiosk and dashboard on that floor shares its deltas.
+_status_hubs: dict[str, StatusHub] = {}
+
+
+def _status_hub_for_venue(venue: str, manager) -> StatusHub:
+    hub = _status_hubs.get(venue)
+    if hub is None or hub.manager is not manager:
+        if hub is not None:
+            hub.close()
+        hub = _status_hubs[venue] = StatusHub(manager)
+    return hub
+
+
+@app.websocket("/ws/status/{user_id}")
+async def status_stream(websocket: WebSocket, user_id: str, venue: str = VENUE_QUERY):
+    """Push a status snapshot on connect, then deltas as tables and the waitlist change."""
+    if not await _admit_venue(websocket, venue):
+        return
+    await websocket.accept()
+    session_id = f"{APP_NAME}_{user_id}"
+    hub = _status_hub_for_venue(venue, await acquire_manager_async(venue, session_id))
+    subscription = hub.subscribe()
+
+    async def pump():
+        while True:
+            await websocket.send_text(await subscription.get())
+
+    async def wait_for_close():
+        # Clients never send on this channel; receiving only surfaces the disconnect.
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+    tasks = [asyncio.create_task(pump()), asyncio.create_task(wait_for_close())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        hub.unsubscribe(subscription)
+        if not hub.subscriber_count and _status_hubs.get(venue) is hub:
+            del _status_hubs[venue]
+            hub.close()
+        release_manager(venue, session_id)
 
 
 @app.post("/api/checkout")
-async def checkout(payload: dict, user_id: str = "ui"):
+async def checkout(payload: dict, user_id: str = "ui", venue: str = VENUE_QUERY):
+    table_ids = payload.get("table_ids")
+    if table_ids:
+        # Shift change: every table in one atomic batch (one save, one status push).
+        return await batch({"operations": [{"op": "checkout", "table_id": t} for t in table_ids]}, user_id, venue)
     table_id = payload.get("table_id")
     if not table_id:
         return {"success": False, "message": "table_id is required"}
-    manager = _manager_for_user(user_id)
-    return manager.checkout_and_fill_waitlist(table_id)
+    await _manager_for_user(user_id, venue)
+    return await run_transaction_async(lambda manager: manager.checkout_and_fill_waitlist(table_id), venue)
+
+
+@app.post("/api/batch")
+async def batch(payload: dict, user_id: str = "ui", venue: str = VENUE_QUERY):
+    """
+    Apply ``operations`` (see ``HotelManager.apply_batch``) as one transaction. All or
+    nothing unless ``"atomic": false``, which keeps the items that succeeded.
+    """
+    operations = payload.get("operations")
+    if not isinstance(operations, list) or not all(isinstance(item, dict) for item in operations):
+        return {"success": False, "message": "operations must be a list of objects"}
+    atomic = bool(payload.get("atomic", True))
+    await _manager_for_user(user_id, venue)
+    return await run_transaction_async(lambda manager: manager.apply_batch(operations, atomic), venue)
@@ -0,0 +1,198 @@
+"""
+Per-connection outbound queue for ``/ws/{user_id}``.
+
+``agent_to_client_messaging`` enqueues and moves on to the next live event; a
+dedicated writer task drains the queue into the websocket. An interrupt goes
+out ahead of queued media (and flushes queued PCM), while a normal
+turn_complete follows its turn's audio and transcripts. When the client lags,
+queued PCM is dropped according to the configured policy instead of stalling
+the model stream.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Deque, Optional, Union
+
+from opentelemetry import metrics
+
+# What to do with a new chunk when the queue is full:
+#   "drop_oldest" - discard the oldest queued PCM chunk (default; keeps playback current)
+#   "drop_newest" - discard the incoming PCM chunk
+#   "block"       - wait for the writer, which back-pressures the live event stream
+AUDIO_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+Payload = Union[str, bytes]
+
+_meter = metrics.get_meter(__name__)
+_drop_counter = _meter.create_counter(
+    name="ws_outbound_dropped_total",
+    unit="1",
+    description="Outbound websocket messages dropped before sending",
+)
+_sent_counter = _meter.create_counter(
+    name="ws_outbound_sent_total",
+    unit="1",
+    description="Outbound websocket messages written",
+)
+_live_queues: "weakref.WeakSet[OutboundQueue]" = weakref.WeakSet()
+
+
+def _observe_depth(options):
+    depth = sum(queue.depth for queue in list(_live_queues))
+    yield metrics.Observation(depth, {"queue": "ws_outbound"})
+
+
+_meter.create_observable_gauge(
+    name="ws_outbound_queue_depth",
+    callbacks=[_observe_depth],
+    unit="1",
+    description="Messages waiting in outbound websocket queues",
+)
+
+
+@dataclass
+class _Item:
+    payload: Payload
+    is_audio: bool
+    enqueued_at: float
+
+
+class OutboundQueue:
+    """Bounded send queue with a priority lane for interrupts."""
+
+    def __init__(
+        self,
+        websocket,
+        max_items: int = 64,
+        audio_policy: str = "drop_oldest",
+        stale_audio_ms: float = 0,
+        flush_audio_on_interrupt: bool = True,
+    ) -> None:
+        if audio_policy not in AUDIO_POLICIES:
+            raise ValueError(f"Unknown audio policy {audio_policy!r}; expected one of {AUDIO_POLICIES}")
+        self.websocket = websocket
+        self.max_items = max_items
+        self.audio_policy = audio_policy
+        self.stale_audio_s = stale_audio_ms / 1000
+        self.flush_audio_on_interrupt = flush_audio_on_interrupt
+        self._control: Deque[_Item] = collections.deque()
+        self._media: Deque[_Item] = collections.deque()
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._closed = False
+        self.sent = 0
+        self.dropped = collections.Counter()
+        _live_queues.add(self)
+
+    @property
+    def depth(self) -> int:
+        return len(self._control) + len(self._media)
+
+    def stats(self) -> dict:
+        return {"depth": self.depth, "sent": self.sent, "dropped": dict(self.dropped)}
+
+    # --- Producers ----------------------------------------------------------------
+    async def send_audio(self, payload: Payload) -> None:
+        await self._put_media(_Item(payload, True, time.monotonic()))
+
+    async def send_text(self, payload: str) -> None:
+        """Queue a JSON text message in order with audio (never dropped)."""
+        await self._put_media(_Item(payload, False, time.monotonic()))
+
+    def send_control(self, payload: str, interrupted: bool = False) -> None:
+        """
+        Queue a control frame. An interrupt jumps ahead of pending media and flushes
+        queued PCM; anything else (a normal turn_complete) goes in order behind the
+        turn's media, so the client does not stop before the last sentence plays.
+        """
+        item = _Item(payload, False, time.monotonic())
+        if interrupted:
+            if self.flush_audio_on_interrupt:
+                self.flush_audio("interrupted")
+            self._control.append(item)
+        else:
+            self._media.append(item)  # never dropped; may briefly exceed max_items
+        self._ready.set()
+
+    def flush_audio(self, reason: str) -> int:
+        kept = collections.deque(item for item in self._media if not item.is_audio)
+        flushed = len(self._media) - len(kept)
+        self._media = kept
+        self._record_drop(reason, flushed)
+        self._update_space()
+        return flushed
+
+    def close(self) -> None:
+        self._closed = True
+        self._ready.set()
+        self._space.set()
+
+    async def _put_media(self, item: _Item) -> None:
+        while len(self._media) >= self.max_items and not self._closed:
+            if item.is_audio and self.audio_policy == "drop_newest":
+                self._record_drop("overflow", 1)
+                return
+            if self.audio_policy == "drop_oldest" and self._drop_oldest_audio():
+                break
+            # Block policy, or nothing droppable is queued: wait for the writer.
+            self._space.clear()
+            await self._space.wait()
+        if self._closed:
+            return
+        self._media.append(item)
+        self._update_space()
+        self._ready.set()
+
+    def _drop_oldest_audio(self) -> bool:
+        for idx, queued in enumerate(self._media):
+            if queued.is_audio:
+                del self._media[idx]
+                self._record_drop("overflow", 1)
+                return True
+        return False
+
+    # --- Writer -------------------------------------------------------------------
+    async def run(self) -> None:
+        """Writer task: drain interrupts first, then media, until closed."""
+        while True:
+            item = self._next_item()
+            if item is None:
+                if self._closed:
+                    return
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            if isinstance(item.payload, bytes):
+                await self.websocket.send_bytes(item.payload)
+            else:
+                await self.websocket.send_text(item.payload)
+            self.sent += 1
+            _sent_counter.add(1, {"kind": "audio" if item.is_audio else "control"})
+
+    def _next_item(self) -> Optional[_Item]:
+        if self._control:
+            return self._control.popleft()
+        now = time.monotonic()
+        while self._media:
+            item = self._media.popleft()
+            self._update_space()
+            if item.is_audio and self.stale_audio_s and now - item.enqueued_at > self.stale_audio_s:
+                self._record_drop("stale", 1)
+                continue
+            return item
+        return None
+
+    def _update_space(self) -> None:
+        if len(self._media) < self.max_items:
+            self._space.set()
+
+    def _record_drop(self, reason: str, count: int) -> None:
+        if count:
+            self.dropped[reason] += count
+            _drop_counter.add(count, {"reason": reason})
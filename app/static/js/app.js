@@ -2,6 +2,9 @@ import { startAudioPlayerWorklet } from "./audio-player.js";
 import { startAudioRecorderWorklet, stopMicrophone } from "./audio-recorder.js";
 
 const sessionId = Math.random().toString(36).slice(2, 10);
+// Kiosks at the same door share one floor plan: open the page with ?venue=<id>.
+const venueParam = new URLSearchParams(window.location.search).get("venue");
+const venueQuery = venueParam ? `&venue=${encodeURIComponent(venueParam)}` : "";
 const wsUrlBase = `${window.location.protocol === "https:" ? "wss" : "ws"}://${window.location.host}/ws/`;
 let websocket = null;
 let isAudio = false;
@@ -20,6 +23,17 @@ const videos = {
   speaking: document.getElementById("vid-speaking"),
 };
 
+// Binary audio frames: 4-byte header (kind u8, codec u8, sequence u16 LE) + payload.
+const FRAME_HEADER_BYTES = 4;
+const FRAME_KIND_AUDIO = 1;
+const CODEC_PCM16 = 0;
+const CODEC_MULAW = 1;
+// Open the page with ?codec=mulaw to halve audio bandwidth both ways.
+const audioCodec =
+  new URLSearchParams(window.location.search).get("codec") === "mulaw" ? "mulaw" : "pcm16";
+const audioCodecId = audioCodec === "mulaw" ? CODEC_MULAW : CODEC_PCM16;
+let audioSequence = 0;
+
 let audioPlayerNode;
 let audioRecorderNode;
 let micStream;
@@ -75,6 +89,7 @@ const renderTables = (tables = []) => {
         <div><strong>${t.id}</strong></div>
         <div>${t.seats} seats</div>
         <div>${t.guest_name || "Free"}</div>
+        ${t.combo ? `<div>Joined: ${t.combo}</div>` : ""}
       </div>`
     )
     .join("");
@@ -100,23 +115,64 @@ const renderWaitlist = (waitlist = []) => {
     .join("");
 };
 
+let statusEtag = null;
+
 const fetchStatus = () => {
-  fetch(`/api/status?user_id=${sessionId}`)
-    .then((res) => res.json())
+  // Revalidate by hand so a 304 skips re-rendering.
+  const headers = statusEtag ? { "If-None-Match": statusEtag } : {};
+  fetch(`/api/status?user_id=${sessionId}${venueQuery}`, { headers, cache: "no-store" })
+    .then((res) => {
+      if (res.status === 304) return null;
+      statusEtag = res.headers.get("ETag");
+      return res.json();
+    })
     .then((data) => {
+      if (!data) return;
       renderTables(data.tables || []);
       renderWaitlist(data.waitlist || []);
-      if (data.last_event) {
-        handleServerEvent(data.last_event);
-      }
     })
     .catch((err) => console.error("Status fetch failed", err));
 };
 
+// Push channel: a snapshot on connect, then deltas as tables and the waitlist change.
+const statusWsUrl = `${wsUrlBase}status/${sessionId}${venueQuery.replace("&", "?")}`;
+let statusSocket = null;
+let currentTables = [];
+let currentWaitlist = [];
+
+const applyStatusMessage = (message) => {
+  if (message.type === "snapshot") {
+    currentTables = message.tables || [];
+    currentWaitlist = message.waitlist || [];
+  } else if (message.type === "delta") {
+    const changed = new Map((message.tables || []).map((t) => [t.id, t]));
+    currentTables = currentTables.map((t) => changed.get(t.id) || t);
+    if (message.waitlist) currentWaitlist = message.waitlist;
+    // Events here are venue-wide; this session's own arrive on its /ws channel.
+  } else {
+    return;
+  }
+  renderTables(currentTables);
+  renderWaitlist(currentWaitlist);
+};
+
+function connectStatusStream() {
+  statusSocket = new WebSocket(statusWsUrl);
+  statusSocket.onmessage = (event) => applyStatusMessage(JSON.parse(event.data));
+  statusSocket.onclose = () => {
+    // Fall back to one conditional poll, then try the stream again.
+    fetchStatus();
+    setTimeout(connectStatusStream, 2000);
+  };
+  statusSocket.onerror = (e) => {
+    console.warn("Status stream error", e);
+  };
+}
+
 const checkoutTable = async (tableId) => {
   if (!tableId) return;
   try {
-    const res = await fetch(`/api/checkout?user_id=${sessionId}`, {
+    const res = await fetch(`/api/checkout?user_id=${sessionId}${venueQuery}`, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ table_id: tableId }),
@@ -126,7 +182,9 @@ const checkoutTable = async (tableId) => {
       alert(data.message || "Unable to clear table.");
       return;
     }
-    fetchStatus();
+    if (!statusSocket || statusSocket.readyState !== WebSocket.OPEN) {
+      fetchStatus();
+    }
   } catch (err) {
     console.error("Checkout failed", err);
   }
@@ -140,8 +198,9 @@ function connectWebsocket() {
       websocket.close();
     } catch (e) {}
   }
-  const ws_url = `${wsUrlBase}${sessionId}?is_audio=${isAudio}`;
+  const ws_url = `${wsUrlBase}${sessionId}?is_audio=${isAudio}&proto=binary&codec=${audioCodec}${venueQuery}`;
   websocket = new WebSocket(ws_url);
+  websocket.binaryType = "arraybuffer";
 
   websocket.onopen = () => {
     setConnStatus("Connected", true);
@@ -149,9 +208,18 @@ function connectWebsocket() {
   };
 
   websocket.onmessage = (event) => {
+    if (event.data instanceof ArrayBuffer) {
+      handleAudioFrame(event.data);
+      return;
+    }
     const message_from_server = JSON.parse(event.data);
     console.log("[AGENT TO CLIENT]", message_from_server);
 
+    if (message_from_server.event) {
+      handleServerEvent(message_from_server.event);
+      return;
+    }
+
     if (message_from_server.mime_type === "text/plain") {
       markAgentActivity();
       handleTranscript(message_from_server.data || "");
@@ -171,12 +239,7 @@ function connectWebsocket() {
     }
 
     if (message_from_server.mime_type === "audio/pcm" && audioPlayerNode) {
-      markAgentActivity();
-      lastAudioAt = Date.now();
-      if (isAudio) setAvatar("speaking");
-      audioPlayerNode.port.postMessage(
-        base64ToArray(message_from_server.data)
-      );
+      playAgentAudio(base64ToArray(message_from_server.data));
     }
 
     if (
@@ -215,6 +278,39 @@ function sendMessage(message) {
   }
 }
 
+function sendAudioFrame(audioBuffer) {
+  if (!websocket || websocket.readyState !== WebSocket.OPEN) return;
+  const frame = new Uint8Array(FRAME_HEADER_BYTES + audioBuffer.byteLength);
+  const header = new DataView(frame.buffer);
+  header.setUint8(0, FRAME_KIND_AUDIO);
+  header.setUint8(1, audioCodecId);
+  header.setUint16(2, audioSequence++ & 0xffff, true);
+  frame.set(new Uint8Array(audioBuffer), FRAME_HEADER_BYTES);
+  websocket.send(frame.buffer);
+}
+
+function handleAudioFrame(buffer) {
+  const header = new DataView(buffer, 0, FRAME_HEADER_BYTES);
+  const codec = header.getUint8(1);
+  if (header.getUint8(0) !== FRAME_KIND_AUDIO || (codec !== CODEC_PCM16 && codec !== CODEC_MULAW)) {
+    console.warn("Unsupported audio frame", header.getUint8(0), codec);
+    return;
+  }
+  if (!audioPlayerNode) return;
+  playAgentAudio(buffer.slice(FRAME_HEADER_BYTES), codec);
+}
+
+function playAgentAudio(audioBuffer, codec = CODEC_PCM16) {
+  markAgentActivity();
+  lastAudioAt = Date.now();
+  if (isAudio) setAvatar("speaking");
+  if (codec === CODEC_MULAW) {
+    audioPlayerNode.port.postMessage({ codec: "mulaw", data: audioBuffer }, [audioBuffer]);
+  } else {
+    audioPlayerNode.port.postMessage(audioBuffer, [audioBuffer]);
+  }
+}
+
 function requestStopAfterTurn(reason) {
   endAfterTurn = true;
   if (!endReason) {
@@ -259,7 +355,7 @@ function startAudio() {
       }
     };
   });
-  startAudioRecorderWorklet(audioRecorderHandler).then(
+  startAudioRecorderWorklet(audioRecorderHandler, audioCodec).then(
     ([node, ctx, stream]) => {
       audioRecorderNode = node;
       audioRecorderContext = ctx;
@@ -307,22 +403,13 @@ interactBtn.addEventListener("click", () => {
   connectWebsocket(); // reconnect with audio flag
 });
 
-function audioRecorderHandler(pcmData) {
-  monitorMicActivity(pcmData);
-  sendMessage({
-    mime_type: "audio/pcm",
-    data: arrayBufferToBase64(pcmData),
-  });
-}
-
-function arrayBufferToBase64(buffer) {
-  let binary = "";
-  const bytes = new Uint8Array(buffer);
-  const len = bytes.byteLength;
-  for (let i = 0; i < len; i++) {
-    binary += String.fromCharCode(bytes[i]);
+function audioRecorderHandler(audioData, peak) {
+  if (peak !== undefined) {
+    notePeak(peak);
+  } else {
+    monitorMicActivity(audioData);
   }
-  return window.btoa(binary);
+  sendAudioFrame(audioData);
 }
 
 function monitorMicActivity(pcmBuffer) {
@@ -333,7 +420,11 @@ function monitorMicActivity(pcmBuffer) {
     const magnitude = Math.abs(pcm[i]);
     if (magnitude > peak) peak = magnitude;
   }
-  if (peak > SILENCE_THRESHOLD) {
+  notePeak(peak);
+}
+
+function notePeak(peak) {
+  if (sessionActive && peak > SILENCE_THRESHOLD) {
     lastUserSpeechAt = Date.now();
   }
 }
@@ -355,7 +446,7 @@ function startInactivityWatch() {
 
 function handleServerEvent(event) {
   if (!event || !event.type) return;
-  if (event.type === "table_assigned") {
+  if (event.type === "table_assigned" || event.type === "reservation_booked") {
     requestStopAfterTurn("reservation_complete");
     if (isAudio) {
       // Wait for the agent to finish speaking; fall back to a gentle timeout.
@@ -410,6 +501,5 @@ function scheduleStopAfterTurn(reason) {
   }, 10000);
 }
 
-// Initial dashboard and periodic refresh
-fetchStatus();
-setInterval(fetchStatus, 4000);
+// Dashboard updates are pushed over the status stream
+connectStatusStream();
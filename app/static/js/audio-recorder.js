@@ -4,7 +4,7 @@
 
 let micStream;
 
-export async function startAudioRecorderWorklet(audioRecorderHandler) {
+export async function startAudioRecorderWorklet(audioRecorderHandler, codec = "pcm16") {
   // Create an AudioContext
   const audioRecorderContext = new AudioContext({ sampleRate: 16000 });
   console.log("AudioContext sample rate:", audioRecorderContext.sampleRate);
@@ -22,7 +22,8 @@ export async function startAudioRecorderWorklet(audioRecorderHandler) {
   // Create an AudioWorkletNode that uses the PCMProcessor
   const audioRecorderNode = new AudioWorkletNode(
     audioRecorderContext,
-    "pcm-recorder-processor"
+    "pcm-recorder-processor",
+    { processorOptions: { codec } }
   );
 
   // Connect the worklet to a silent destination so the processor gets scheduled
@@ -33,6 +34,12 @@ export async function startAudioRecorderWorklet(audioRecorderHandler) {
   // Connect the microphone source to the worklet.
   source.connect(audioRecorderNode);
   audioRecorderNode.port.onmessage = (event) => {
+    // mu-law is encoded inside the worklet; pass it through with its peak level.
+    if (event.data.encoded) {
+      audioRecorderHandler(event.data.encoded, event.data.peak);
+      return;
+    }
+
     // Convert to 16-bit PCM
     const pcmData = convertFloat32ToPCM(event.data);
 
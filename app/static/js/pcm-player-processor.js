@@ -1,3 +1,15 @@
+// G.711 mu-law byte -> float sample in [-1, 1].
+const MULAW_TO_FLOAT = (() => {
+  const table = new Float32Array(256);
+  for (let i = 0; i < 256; i++) {
+    const code = ~i & 0xff;
+    const exponent = (code >> 4) & 0x07;
+    const magnitude = ((((code & 0x0f) << 3) + 0x84) << exponent) - 0x84;
+    table[i] = ((code & 0x80) ? -magnitude : magnitude) / 32768;
+  }
+  return table;
+})();
+
 /**
  * An audio worklet processor that stores the PCM audio data sent from the main thread
  * to a buffer and plays it.
@@ -22,6 +34,13 @@ class PCMPlayerProcessor extends AudioWorkletProcessor {
         return;
       }
 
+      // mu-law frames arrive as { codec: "mulaw", data: ArrayBuffer }.
+      if (event.data.codec === 'mulaw') {
+        this._enqueueMuLaw(new Uint8Array(event.data.data));
+        this.notifiedEmpty = false;
+        return;
+      }
+
       // Decode the base64 data to int16 array.
       const int16Samples = new Int16Array(event.data);
 
@@ -31,6 +50,20 @@ class PCMPlayerProcessor extends AudioWorkletProcessor {
     };
   }
 
+  _enqueueMuLaw(codes) {
+    for (let i = 0; i < codes.length; i++) {
+      this._write(MULAW_TO_FLOAT[codes[i]]);
+    }
+  }
+
+  _write(floatVal) {
+    this.buffer[this.writeIndex] = floatVal;
+    this.writeIndex = (this.writeIndex + 1) % this.bufferSize;
+    if (this.writeIndex === this.readIndex) {
+      this.readIndex = (this.readIndex + 1) % this.bufferSize;
+    }
+  }
+
   // Push incoming Int16 data into our ring buffer.
   _enqueue(int16Samples) {
     for (let i = 0; i < int16Samples.length; i++) {
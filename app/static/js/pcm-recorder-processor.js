@@ -1,12 +1,39 @@
+// Float sample in [-1, 1] -> G.711 mu-law byte (same arithmetic as the server's codec).
+function floatToMuLaw(sample) {
+  let pcm = Math.max(-32768, Math.min(32767, Math.trunc(sample * 0x7fff))) >> 2;
+  let mask = 0xff;
+  if (pcm < 0) {
+    pcm = -pcm;
+    mask = 0x7f;
+  }
+  pcm = Math.min(pcm, 8158) + 0x21;
+  let exponent = 0;
+  for (let v = pcm >> 6; v && exponent < 7; v >>= 1) exponent++;
+  const mantissa = (pcm >> (exponent + 1)) & 0x0f;
+  return ((exponent << 4) | mantissa) ^ mask;
+}
+
 class PCMProcessor extends AudioWorkletProcessor {
-  constructor() {
+  constructor(options) {
     super();
+    this.codec = options?.processorOptions?.codec || "pcm16";
   }
 
   process(inputs, outputs, parameters) {
     if (inputs.length > 0 && inputs[0].length > 0) {
       // Use the first channel
       const inputChannel = inputs[0][0];
+      if (this.codec === "mulaw") {
+        // Encode here, off the main thread; also report the peak for activity monitoring.
+        const encoded = new Uint8Array(inputChannel.length);
+        let peak = 0;
+        for (let i = 0; i < inputChannel.length; i++) {
+          encoded[i] = floatToMuLaw(inputChannel[i]);
+          peak = Math.max(peak, Math.abs(inputChannel[i]));
+        }
+        this.port.postMessage({ encoded: encoded.buffer, peak: peak * 0x7fff }, [encoded.buffer]);
+        return true;
+      }
       // Copy the buffer to avoid issues with recycled memory
       const inputCopy = new Float32Array(inputChannel);
       this.port.postMessage(inputCopy);
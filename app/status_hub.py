@@ -0,0 +1,145 @@
+"""Push channel for dashboard status: one serialization per change, fanned out to every subscriber."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import logging
+from typing import Any, Dict, Optional, Set
+
+from services.hotel import HotelManager
+
+
+class Subscription:
+    """Bounded per-subscriber queue of serialized messages."""
+
+    def __init__(self, hub: "StatusHub", maxsize: int) -> None:
+        self._hub = hub
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=maxsize)
+
+    def offer(self, payload: str) -> None:
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # A lagging dashboard gets the current snapshot instead of a backlog of deltas.
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(self._hub.snapshot_payload())
+
+    async def get(self) -> str:
+        return await self._queue.get()
+
+
+class StatusHub:
+    """
+    Fans out HotelManager changes to status-stream subscribers.
+
+    Mutations (possibly from tool threads) are coalesced onto the event loop;
+    each flush serializes one ``delta`` message shared by all subscribers. A
+    full ``snapshot`` is sent on subscribe, on lag, and whenever a projected
+    ETA rolls over to the next minute.
+    """
+
+    def __init__(self, manager: HotelManager, queue_size: int = 32) -> None:
+        self.manager = manager
+        self.queue_size = queue_size
+        self._loop = asyncio.get_running_loop()
+        self._subscribers: Set[Subscription] = set()
+        self._pending_tables: Set[str] = set()
+        self._pending_waitlist = False
+        self._pending_events: list[Dict[str, Any]] = []
+        self._flush_scheduled = False
+        self._snapshot_payload: Optional[str] = None
+        self._snapshot_generation = -1
+        self._tick: Optional[asyncio.TimerHandle] = None
+        manager.add_listener(self._on_change)
+
+    def close(self) -> None:
+        self.manager.remove_listener(self._on_change)
+        if self._tick:
+            self._tick.cancel()
+        self._subscribers.clear()
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self, self.queue_size)
+        self._subscribers.add(subscription)
+        subscription.offer(self.snapshot_payload())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def snapshot_payload(self) -> str:
+        if self._snapshot_payload is None or self._snapshot_generation != self.manager.generation:
+            status, expires_at = self.manager.peek_status()
+            self._snapshot_payload = json.dumps(
+                {
+                    "type": "snapshot",
+                    "generation": self.manager.generation,
+                    "tables": status["tables"],
+                    "waitlist": status["waitlist"],
+                }
+            )
+            self._snapshot_generation = self.manager.generation
+            self._schedule_tick(expires_at)
+        return self._snapshot_payload
+
+    # --- Change handling ----------------------------------------------------------
+    def _on_change(self, change: Dict[str, Any]) -> None:
+        self._loop.call_soon_threadsafe(self._merge, change)
+
+    def _merge(self, change: Dict[str, Any]) -> None:
+        self._pending_tables.update(change["tables"])
+        self._pending_waitlist = self._pending_waitlist or change["waitlist"]
+        self._pending_events.extend(change["events"])
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._loop.call_soon(self._flush)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        tables = [self.manager.table_status(table_id) for table_id in sorted(self._pending_tables)]
+        message: Dict[str, Any] = {
+            "type": "delta",
+            "generation": self.manager.generation,
+            "tables": [t for t in tables if t is not None],
+            "events": self._pending_events,
+        }
+        # Any seating change can move projected ETAs, so the waitlist rides along with table changes.
+        if self._pending_waitlist or self._pending_tables:
+            message["waitlist"] = self.manager.waitlist_status()
+        self._pending_tables = set()
+        self._pending_waitlist = False
+        self._pending_events = []
+        self._broadcast(json.dumps(message))
+        if self._tick is None and self._subscribers:
+            # The next snapshot rebuild reschedules on the exact ETA rollover.
+            self._tick = self._loop.call_later(60.0, self._on_tick)
+
+    def _broadcast(self, payload: str) -> None:
+        for subscription in list(self._subscribers):
+            subscription.offer(payload)
+
+    def _schedule_tick(self, expires_at: Optional[datetime.datetime]) -> None:
+        if self._tick:
+            self._tick.cancel()
+            self._tick = None
+        if expires_at is None:
+            return
+        delay = max(1.0, (expires_at - self.manager.clock()).total_seconds())
+        self._tick = self._loop.call_later(delay, self._on_tick)
+
+    def _on_tick(self) -> None:
+        self._tick = None
+        if not self._subscribers:
+            return
+        self._snapshot_payload = None
+        try:
+            self._broadcast(self.snapshot_payload())
+        except Exception:
+            logging.exception("Status tick failed")
@@ -0,0 +1,204 @@
+"""
+Per-connection conversational turn latency for ``/ws/{user_id}``.
+
+What a guest feels is the gap between finishing a sentence and hearing the
+reply. A ``TurnTracker`` follows one connection. ``client_to_agent_messaging``
+reports voiced microphone frames and text messages, and
+``agent_to_client_messaging`` reports the first outbound audio and
+transcript, tool calls and their responses, and ``turn_complete`` /
+``interrupted``. Latencies run from the end of the user's speech (the last
+voiced frame before the reply started, or the moment a text message was sent).
+The model's own end-of-speech wait is therefore included, as the guest hears it.
+
+Exported per turn:
+
+- ``turn_latency_ms{stage, outcome}``: stage is ``first_audio``,
+  ``first_transcript`` or ``turn_complete``; outcome is ``complete`` or
+  ``interrupted``. Backends derive p50 / p95 / p99 from the buckets.
+- ``turn_tool_time_ms{outcome}``: time spent in tool calls inside the turn.
+- A ``turn`` span per turn, from the first voiced frame to the turn's end,
+  with events ``end_of_speech``, ``first_audio``, ``first_transcript``,
+  ``tool_call``, ``tool_result`` and ``barge_in``.
+
+Replies the model starts without a user turn (e.g. a greeting) get a span but
+no latency samples. ``stats()`` gives the session's own percentiles for the
+disconnect log line.
+"""
+
+from __future__ import annotations
+
+import collections
+import math
+import time
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from opentelemetry import metrics, trace
+
+STAGES = ("first_audio", "first_transcript", "turn_complete")
+
+_tracer = trace.get_tracer(__name__)
+_meter = metrics.get_meter(__name__)
+_latency_hist = _meter.create_histogram(
+    name="turn_latency_ms",
+    unit="ms",
+    description="End of user speech to the reply's first audio / first transcript / turn_complete",
+)
+_tool_time_hist = _meter.create_histogram(
+    name="turn_tool_time_ms",
+    unit="ms",
+    description="Time spent in tool calls within a conversational turn",
+)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+class _Turn:
+    __slots__ = ("span", "speech_end", "speech_end_ns", "outputs", "latencies", "tool_ms", "tools", "pending")
+
+    def __init__(self, span: trace.Span, speech_end: Optional[float], speech_end_ns: Optional[int]) -> None:
+        self.span = span
+        self.speech_end = speech_end  # perf_counter of the last voiced frame (None: model spoke first)
+        self.speech_end_ns = speech_end_ns
+        self.outputs: Set[str] = set()  # first_audio / first_transcript seen so far
+        self.latencies: Dict[str, float] = {}
+        self.tool_ms = 0.0
+        self.tools = 0
+        self.pending: Dict[str, Deque[float]] = collections.defaultdict(collections.deque)  # tool -> call times
+
+
+class TurnTracker:
+    """Correlates one connection's user activity with the agent's replies, turn by turn."""
+
+    def __init__(
+        self,
+        session_id: str,
+        venue_id: str = "",
+        clock: Callable[[], float] = time.perf_counter,
+        history: int = 1000,
+    ) -> None:
+        self.session_id = session_id
+        self.venue_id = venue_id
+        self._clock = clock
+        self._turn: Optional[_Turn] = None
+        # Speech heard over the current reply: (first frame ns, last frame perf_counter, last frame ns)
+        self._barge_in: Optional[Tuple[int, float, int]] = None
+        self.turns = 0
+        self.interrupted = 0
+        self._samples: Dict[str, Deque[float]] = {stage: collections.deque(maxlen=history) for stage in STAGES}
+
+    # --- User side ------------------------------------------------------------------
+    def user_speech(self) -> None:
+        """A voiced microphone frame went to the model."""
+        now, now_ns = self._clock(), time.time_ns()
+        turn = self._turn
+        if turn is None:
+            self._turn = self._open(now_ns, now, now_ns)
+        elif not turn.outputs:
+            turn.speech_end, turn.speech_end_ns = now, now_ns
+        elif self._barge_in is None:
+            # Talking over the reply: if the model yields, this speech is the next turn.
+            self._barge_in = (now_ns, now, now_ns)
+            turn.span.add_event("barge_in")
+        else:
+            self._barge_in = (self._barge_in[0], now, now_ns)
+
+    def user_text(self) -> None:
+        """A typed message went to the model; it counts as speech that ended just now."""
+        self.user_speech()
+
+    # --- Agent side -----------------------------------------------------------------
+    def agent_audio(self) -> None:
+        self._output("first_audio")
+
+    def agent_transcript(self) -> None:
+        self._output("first_transcript")
+
+    def tool_call(self, name: str) -> None:
+        turn = self._ensure_turn()
+        turn.pending[name].append(self._clock())
+        turn.tools += 1
+        turn.span.add_event("tool_call", {"tool": name})
+
+    def tool_result(self, name: str) -> None:
+        turn = self._turn
+        if turn is None or not turn.pending.get(name):
+            return
+        elapsed = (self._clock() - turn.pending[name].popleft()) * 1000
+        turn.tool_ms += elapsed
+        turn.span.add_event("tool_result", {"tool": name, "ms": round(elapsed, 1)})
+
+    def turn_end(self, interrupted: bool = False) -> None:
+        """``turn_complete`` or ``interrupted`` from the model."""
+        turn = self._turn
+        if turn is None:
+            return
+        outcome = "interrupted" if interrupted else "complete"
+        attributes = {"outcome": outcome}
+        if turn.speech_end is not None and not interrupted:
+            self._sample(turn, "turn_complete")
+        if turn.speech_end is not None:
+            for stage, latency in turn.latencies.items():
+                _latency_hist.record(latency, attributes={"stage": stage, **attributes})
+        if turn.tools:
+            _tool_time_hist.record(turn.tool_ms, attributes=attributes)
+        turn.span.set_attributes({
+            "turn.outcome": outcome,
+            "turn.tool_calls": turn.tools,
+            "turn.tool_time_ms": round(turn.tool_ms, 1),
+            **{f"turn.{stage}_ms": round(ms, 1) for stage, ms in turn.latencies.items()},
+        })
+        turn.span.end()
+        self.turns += 1
+        self.interrupted += interrupted
+        self._turn = None
+        if self._barge_in is not None:
+            # The user was already talking when this reply ended; that speech opens the next turn.
+            self._turn = self._open(*self._barge_in)
+            self._barge_in = None
+
+    def close(self) -> None:
+        """End an open turn's span without recording it (the connection went away mid-turn)."""
+        if self._turn is not None:
+            self._turn.span.set_attribute("turn.outcome", "abandoned")
+            self._turn.span.end()
+            self._turn = None
+
+    def stats(self) -> dict:
+        out: dict = {"turns": self.turns, "interrupted": self.interrupted}
+        for stage, samples in self._samples.items():
+            if samples:
+                values = list(samples)
+                out[stage] = {f"p{q}": round(_percentile(values, q), 1) for q in (50, 95, 99)}
+        return out
+
+    # --- Internals ------------------------------------------------------------------
+    def _open(self, start_ns: Optional[int], speech_end: Optional[float], speech_end_ns: Optional[int]) -> _Turn:
+        attributes = {"session.id": self.session_id, "venue.id": self.venue_id}
+        span = _tracer.start_span("turn", attributes=attributes, start_time=start_ns)
+        return _Turn(span, speech_end, speech_end_ns)
+
+    def _ensure_turn(self) -> _Turn:
+        if self._turn is None:
+            self._turn = self._open(None, None, None)
+        return self._turn
+
+    def _output(self, stage: str) -> None:
+        turn = self._ensure_turn()
+        if stage in turn.outputs:
+            return
+        if not turn.outputs and turn.speech_end_ns is not None:
+            turn.span.add_event("end_of_speech", timestamp=turn.speech_end_ns)
+        turn.outputs.add(stage)
+        turn.span.add_event(stage)
+        if turn.speech_end is not None:
+            self._sample(turn, stage)
+
+    def _sample(self, turn: _Turn, stage: str) -> None:
+        latency = (self._clock() - turn.speech_end) * 1000
+        turn.latencies[stage] = latency
+        self._samples[stage].append(latency)
@@ -0,0 +1,122 @@
+"""
+Server-side voice-activity gate for inbound microphone PCM.
+
+Frames are classified by RMS energy against an absolute floor and an adaptive
+noise estimate. Voiced frames are forwarded; after speech ends a hangover keeps
+forwarding silence long enough for the model's own end-of-speech detection, and
+a short pre-roll of the preceding silent frames is replayed when speech starts
+so onsets are not clipped. Everything else is dropped (or thinned to every Nth
+frame when ``thin_every`` is set).
+"""
+
+from __future__ import annotations
+
+import collections
+import math
+from typing import Deque, List, Union
+
+import numpy as np
+
+PcmChunk = Union[bytes, memoryview]
+
+
+class VoiceGate:
+    """Per-connection energy/VAD gate for 16-bit mono PCM."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        threshold_dbfs: float = -50.0,
+        snr_db: float = 10.0,
+        hangover_ms: float = 800.0,
+        preroll_ms: float = 300.0,
+        thin_every: int = 0,
+        noise_alpha: float = 0.05,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.threshold_dbfs = threshold_dbfs
+        self.snr_db = snr_db
+        self.hangover_samples = int(sample_rate * hangover_ms / 1000)
+        self.preroll_samples = int(sample_rate * preroll_ms / 1000)
+        self.thin_every = thin_every
+        self.noise_alpha = noise_alpha
+        self.noise_dbfs = threshold_dbfs
+        self._hangover_left = 0
+        self._preroll: Deque[PcmChunk] = collections.deque()
+        self._preroll_len = 0
+        self._silent_run = 0
+        self.frames_in = 0
+        self.frames_forwarded = 0
+        self.speaking = False
+        self.last_voiced = False  # the latest frame itself was speech (not hangover / silence)
+
+    @staticmethod
+    def level_dbfs(pcm: PcmChunk) -> float:
+        samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)  # ignores a trailing odd byte
+        if not samples.size:
+            return -math.inf
+        rms = math.sqrt(float(np.dot(samples, samples.astype(np.float64))) / samples.size)
+        return 20 * math.log10(rms / 32768) if rms else -math.inf
+
+    def is_voiced(self, level: float) -> bool:
+        return level >= max(self.threshold_dbfs, self.noise_dbfs + self.snr_db)
+
+    def process(self, pcm: PcmChunk) -> List[PcmChunk]:
+        """Return the chunks to forward (possibly none, possibly pre-roll + this one)."""
+        self.frames_in += 1
+        samples = len(pcm) // 2
+        level = self.level_dbfs(pcm)
+
+        self.last_voiced = self.is_voiced(level)
+        if self.last_voiced:
+            out = list(self._preroll) if not self.speaking else []
+            out.append(pcm)
+            self._clear_preroll()
+            self.speaking = True
+            self._hangover_left = self.hangover_samples
+            self._silent_run = 0
+            self.frames_forwarded += len(out)
+            return out
+
+        # Only silence feeds the noise estimate, so speech does not raise the floor.
+        if level > -math.inf:
+            self.noise_dbfs += self.noise_alpha * (level - self.noise_dbfs)
+
+        if self._hangover_left > 0:
+            self._hangover_left -= samples
+            self.frames_forwarded += 1
+            return [pcm]
+
+        self.speaking = False
+        self._silent_run += 1
+        if self.thin_every and self._silent_run % self.thin_every == 0:
+            self.frames_forwarded += 1
+            return [pcm]
+        self._remember(pcm)
+        return []
+
+    @property
+    def suppressed_pct(self) -> float:
+        if not self.frames_in:
+            return 0.0
+        return 100.0 * (1 - self.frames_forwarded / self.frames_in)
+
+    def stats(self) -> dict:
+        return {
+            "frames_in": self.frames_in,
+            "frames_forwarded": self.frames_forwarded,
+            "suppressed_pct": round(self.suppressed_pct, 1),
+            "noise_dbfs": round(self.noise_dbfs, 1),
+        }
+
+    def _remember(self, pcm: PcmChunk) -> None:
+        if not self.preroll_samples:
+            return
+        self._preroll.append(pcm)
+        self._preroll_len += len(pcm) // 2
+        while self._preroll and self._preroll_len - len(self._preroll[0]) // 2 >= self.preroll_samples:
+            self._preroll_len -= len(self._preroll.popleft()) // 2
+
+    def _clear_preroll(self) -> None:
+        self._preroll.clear()
+        self._preroll_len = 0
@@ -0,0 +1,40 @@
+"""
+Binary frame format for audio on ``/ws/{user_id}?proto=binary``.
+
+Each binary websocket message is a 4-byte little-endian header followed by the
+payload: ``kind`` (u8), ``codec`` (u8) and a wrapping ``sequence`` (u16).
+Control messages (text, transcripts, turn_complete/interrupted) stay JSON text
+frames, so a client can mix both on one socket.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import NamedTuple
+
+HEADER = struct.Struct("<BBH")
+
+KIND_AUDIO = 1
+
+CODEC_PCM16 = 0  # 16-bit little-endian mono PCM (16 kHz up, 24 kHz down)
+CODEC_MULAW = 1  # 8-bit G.711 mu-law at the same sample rates (see audio_codec.py)
+
+
+class Frame(NamedTuple):
+    kind: int
+    codec: int
+    sequence: int
+    payload: memoryview
+
+
+def unpack_frame(data: bytes) -> Frame:
+    """Split a binary message into header fields and a zero-copy payload view."""
+    if len(data) < HEADER.size:
+        raise ValueError(f"Binary frame too short: {len(data)} bytes")
+    view = memoryview(data)
+    kind, codec, sequence = HEADER.unpack_from(view)
+    return Frame(kind, codec, sequence, view[HEADER.size:])
+
+
+def pack_frame(payload: bytes, sequence: int, kind: int = KIND_AUDIO, codec: int = CODEC_PCM16) -> bytes:
+    return HEADER.pack(kind, codec, sequence & 0xFFFF) + payload
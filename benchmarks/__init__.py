@@ -0,0 +1,2 @@
+# Offline benchmarks for the concierge services. Run from the repo root, e.g.
+# `python -m benchmarks.bench_table_index`.
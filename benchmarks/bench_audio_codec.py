@@ -0,0 +1,73 @@
+"""
+CPU cost of the websocket audio codecs per stream, for host sizing.
+
+One stream is 16 kHz mic audio decoded on the way in plus 24 kHz agent audio
+encoded on the way out, in 20 ms frames.
+
+Usage: python -m benchmarks.bench_audio_codec [--seconds 30]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.append(str(APP_DIR))
+
+from audio_codec import mulaw_decode, mulaw_encode  # noqa: E402
+
+FRAME_MS = 20
+
+
+def speech_like(seconds: float, rate: int, seed: int = 3) -> bytes:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)
+    signal = envelope * (0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(t.size))
+    return (signal * 32767).astype("<i2").tobytes()
+
+
+def frames(pcm: bytes, rate: int, bytes_per_sample: int):
+    step = rate * FRAME_MS // 1000 * bytes_per_sample
+    return [pcm[i:i + step] for i in range(0, len(pcm), step)]
+
+
+def cost_per_audio_second(fn, chunks, seconds: float) -> float:
+    start = time.perf_counter()
+    for chunk in chunks:
+        fn(chunk)
+    return (time.perf_counter() - start) / seconds
+
+
+def run(seconds: float) -> None:
+    uplink = frames(mulaw_encode(speech_like(seconds, 16000)), 16000, 1)
+    downlink = frames(speech_like(seconds, 24000), 24000, 2)
+
+    decode_s = cost_per_audio_second(mulaw_decode, uplink, seconds)
+    encode_s = cost_per_audio_second(mulaw_encode, downlink, seconds)
+    per_stream = decode_s + encode_s
+
+    pcm_kbps = (16000 + 24000) * 16 / 1000
+    mulaw_kbps = (16000 + 24000) * 8 / 1000
+    print(f"frames: {FRAME_MS} ms, audio: {seconds:.0f} s per direction")
+    print(f"uplink decode (16 kHz):   {decode_s * 1e6:8.1f} us CPU per audio second")
+    print(f"downlink encode (24 kHz): {encode_s * 1e6:8.1f} us CPU per audio second")
+    print(f"per stream:               {per_stream * 100:8.3f} % of one core")
+    print(f"streams per core:         {1 / per_stream:8.0f}")
+    print(f"payload: pcm16 {pcm_kbps:.0f} kbit/s -> mulaw {mulaw_kbps:.0f} kbit/s per stream (both directions)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=30)
+    args = parser.parse_args()
+    run(args.seconds)
+
+
+if __name__ == "__main__":
+    main()
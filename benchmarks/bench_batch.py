@@ -0,0 +1,90 @@
+"""
+Per-item transactions vs. one batch for shift-change sized groups of mutations.
+
+A tour group of ``--size`` parties is seated (the overflow waitlisted) and
+then every table is checked out, which seats the waitlist. Each step runs
+either as its own ``SessionRegistry.transaction`` (one save and one change
+notification per item, as separate tool calls or ``/api/checkout`` requests
+do) or as one ``apply_batch`` per phase. A listener stands in for the status
+hub: for each notification it serializes the changed tables and, if the
+waitlist changed, the waitlist with fresh ETAs.
+
+Usage: python -m benchmarks.bench_batch [--sizes 10 50 200] [--backend memory|sqlite] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from services.hotel import HotelManager, Table
+from services.state_backend import InProcessBackend, SqliteBackend
+from services.state_registry import SessionRegistry
+
+
+def floor(tables: int) -> List[Table]:
+    return [Table(f"T{i}", (2, 4, 6)[i % 3], "standard") for i in range(tables)]
+
+
+def run_once(size: int, batched: bool, backend: str, directory: Path) -> Tuple[float, int, int]:
+    store = SqliteBackend(directory / f"{size}-{batched}.db") if backend == "sqlite" else InProcessBackend()
+    registry = SessionRegistry(backend=store, ttl_seconds=0, max_entries=0)
+    venue = "bench"
+    registry.transaction(venue, lambda manager: None)
+    manager = registry.peek(venue)
+    manager.load_state(HotelManager(tables=floor(max(4, size // 2))).to_state())
+    notifications = 0
+
+    def hub(change: Dict[str, Any]) -> None:
+        nonlocal notifications
+        notifications += 1
+        for table_id in change["tables"]:
+            manager.table_status(table_id)
+        if change["waitlist"]:
+            manager.waitlist_status()
+
+    manager.add_listener(hub)
+    phases = [
+        [{"op": "add_guest", "name": f"Guest{i}", "party_size": 2 + i % 4} for i in range(size)],
+        [{"op": "checkout", "table_id": t.table_id} for t in list(manager.tables)],
+    ]
+    saves = 0
+    start = time.perf_counter()
+    for items in phases:
+        if batched:
+            registry.transaction(venue, lambda manager: manager.apply_batch(items))
+            saves += 1
+        else:
+            for item in items:
+                registry.transaction(venue, lambda manager: manager.apply_batch([item]))
+                saves += 1
+    elapsed = time.perf_counter() - start
+    if backend == "sqlite":
+        store.close()
+    return elapsed, notifications, saves
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--backend", choices=("memory", "sqlite"), default="memory")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(f"{args.backend} backend, best of {args.repeat}")
+    print(f"{'parties':>8} {'mode':<9} {'ms':>8} {'notifications':>14} {'saves':>6} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            timings = {}
+            for batched in (False, True):
+                runs = [run_once(size, batched, args.backend, Path(directory)) for _ in range(args.repeat)]
+                elapsed, notifications, saves = min(runs)
+                timings[batched] = elapsed
+                speedup = f"{timings[False] / elapsed:>7.1f}x" if batched else ""
+                mode = "batch" if batched else "per-item"
+                print(f"{size:>8} {mode:<9} {elapsed * 1e3:>8.1f} {notifications:>14} {saves:>6} {speedup:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compare the shared ETA engine against the old per-call waitlist simulation.
+
+Before timing, checks on the default floor (every table taken) that a party
+only joined tables can seat gets an ETA, and that ``estimate_wait_time`` leaves
+the waitlist ETAs as they were.
+
+Usage: python -m benchmarks.bench_eta [--tables 16 256 2048] [--waitlist 10 100 500]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import random
+import time
+from typing import List, Optional
+
+from services.hotel import HotelManager, Table, WaitlistEntry
+
+
+def build(table_count: int, waitlist_len: int, seed: int = 11) -> HotelManager:
+    rng = random.Random(seed)
+    tables = [Table(f"T{i}", rng.choice((1, 2, 2, 4, 4, 6)), "standard") for i in range(table_count)]
+    manager = HotelManager(tables=tables)
+    for table in tables:
+        manager.assign_table(table, guest_name="bench")
+        table.assigned_time -= datetime.timedelta(minutes=rng.randint(0, 49))
+    manager.reindex()
+    for i in range(waitlist_len):
+        manager.add_to_waitlist(f"guest-{i}", rng.choice((1, 2, 3, 4, 5, 6)))
+    return manager
+
+
+def legacy_waitlist_etas(manager: HotelManager) -> List[Optional[int]]:
+    """The pre-engine algorithm: rebuild and sort table dicts, then scan per entry."""
+    current_time = datetime.datetime.now()
+    duration = datetime.timedelta(minutes=manager.default_dining_duration_minutes)
+    simulated = []
+    for t in manager.tables:
+        sim = t.to_dict()
+        sim["estimated_free_time"] = current_time
+        if t.status == "occupied" and t.assigned_time:
+            sim["estimated_free_time"] = t.assigned_time + duration
+        simulated.append(sim)
+    simulated.sort(key=lambda x: x["estimated_free_time"])
+    etas: List[Optional[int]] = []
+    for entry in manager.waitlist:
+        eta = None
+        for sim in simulated:
+            if sim["seats"] >= entry.party_size:
+                eta = max(0, int((sim["estimated_free_time"] - current_time).total_seconds() / 60))
+                sim["estimated_free_time"] += duration
+                break
+        etas.append(eta)
+    return etas
+
+
+def check() -> None:
+    manager = HotelManager()
+    for table in manager.tables:
+        manager.assign_table(table, guest_name="check", party_size=table.seats)
+    manager.add_to_waitlist("big", 8)
+    manager.add_to_waitlist("pair", 2)
+    etas = manager.waitlist_status()
+    assert etas[0]["eta_minutes"] is not None, "no waitlist ETA for a party seated on joined tables"
+    for party_size in (2, 4, 8, 10):
+        assert manager.estimate_wait_time(party_size) is not None, f"no ETA for a party of {party_size}"
+    assert manager.waitlist_status() == etas, "estimate_wait_time changed the waitlist projection"
+
+
+def time_call(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def run(table_counts: List[int], waitlist_lens: List[int], repeat: int) -> None:
+    print(f"{'tables':>7} {'waitlist':>8} {'legacy ms':>10} {'cold ms':>8} {'warm ms':>8} {'append ms':>9}")
+    for tables in table_counts:
+        for waitlist in waitlist_lens:
+            manager = build(tables, waitlist)
+            legacy = time_call(lambda: legacy_waitlist_etas(manager), repeat)
+
+            def cold() -> None:
+                manager._eta().invalidate()
+                manager.estimate_wait_time(4)
+
+            cold_ms = time_call(cold, repeat)
+            manager.estimate_wait_time(4)
+            warm_ms = time_call(lambda: manager.estimate_wait_time(4), repeat)
+
+            def append() -> None:
+                manager.waitlist.append(WaitlistEntry(name="late", party_size=2))
+                manager.estimate_wait_time(4)
+
+            append_ms = time_call(append, repeat)
+            print(
+                f"{tables:>7} {waitlist:>8} {legacy:>10.3f} {cold_ms:>8.3f} "
+                f"{warm_ms:>8.3f} {append_ms:>9.3f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tables", type=int, nargs="+", default=[16, 256, 2048])
+    parser.add_argument("--waitlist", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    check()
+    run(args.tables, args.waitlist, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
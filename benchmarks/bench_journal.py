@@ -0,0 +1,107 @@
+"""
+Journal overhead on mutations and recovery time vs. journal size.
+
+Part 1 times a seat/checkout cycle with and without a journal attached (the
+encoding and fsync happen on the journal's writer thread, so the caller should
+only see the cost of queueing one record). Part 2 writes N records, then times a
+cold recovery from the full journal (no snapshots) and from the newest
+snapshot plus its tail.
+
+Usage: python -m benchmarks.bench_journal [--ops 20000] [--sizes 1250 12500 62500] [--snapshot-every 1000]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from services.hotel import HotelManager
+from services.journal import Journal
+
+
+def churn(manager: HotelManager, ops: int, seed: int = 5) -> List[float]:
+    """Seat, waitlist and check out parties; return per-mutation latencies in microseconds."""
+    rng = random.Random(seed)
+    latencies = []
+    for i in range(ops):
+        start = time.perf_counter()
+        if rng.random() < 0.55:
+            table = manager.check_availability(rng.choice((1, 2, 4)))
+            if table:
+                manager.assign_table(table, f"guest-{i}")
+            else:
+                manager.add_to_waitlist(f"guest-{i}", rng.choice((1, 2, 4)))
+        else:
+            occupied = [t for t in manager.tables if t.status == "occupied"]
+            if occupied:
+                manager.checkout_and_fill_waitlist(rng.choice(occupied).table_id)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def journaled_manager(directory: Path, snapshot_every: int, start: datetime.datetime) -> HotelManager:
+    clock = [start]
+
+    def tick() -> datetime.datetime:
+        clock[0] += datetime.timedelta(seconds=30)
+        return clock[0]
+
+    manager = HotelManager(clock=tick)
+    journal = Journal(directory, snapshot_every=snapshot_every)
+    journal.recover(manager)
+    manager.attach_journal(journal)
+    return manager
+
+
+def latency(ops: int, snapshot_every: int) -> None:
+    print(f"mutation latency over {ops} ops (us)")
+    print(f"{'journal':>10} {'p50':>7} {'p99':>7} {'mean':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, directory in (("off", None), ("on", Path(tmp))):
+            if directory is None:
+                manager = HotelManager(clock=lambda: datetime.datetime(2026, 1, 1))
+            else:
+                manager = journaled_manager(directory, snapshot_every, datetime.datetime(2026, 1, 1))
+            samples = churn(manager, ops)
+            if manager.journal:
+                manager.journal.close()
+            samples.sort()
+            p99 = samples[int(len(samples) * 0.99)]
+            print(f"{label:>10} {statistics.median(samples):>7.1f} {p99:>7.1f} {statistics.fmean(samples):>7.1f}")
+
+
+def recovery(sizes: List[int], snapshot_every: int) -> None:
+    print(f"\nrecovery time vs journal size (snapshot every {snapshot_every} records)")
+    print(f"{'records':>9} {'full replay ms':>15} {'snapshot+tail ms':>17} {'tail records':>13}")
+    for size in sizes:
+        timings: List[Optional[float]] = []
+        tail = 0
+        for every in (0, snapshot_every):
+            with tempfile.TemporaryDirectory() as tmp:
+                manager = journaled_manager(Path(tmp), every, datetime.datetime(2026, 1, 1))
+                while manager.journal.seq < size:
+                    churn(manager, size - manager.journal.seq, seed=size)
+                manager.journal.close()
+                stats = Journal(tmp).recover(HotelManager())
+                timings.append(stats.seconds * 1e3)
+                tail = stats.replayed if every else tail
+        print(f"{size:>9} {timings[0]:>15.1f} {timings[1]:>17.1f} {tail:>13}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1250, 12500, 62500])
+    parser.add_argument("--snapshot-every", type=int, default=1000)
+    args = parser.parse_args()
+    latency(args.ops, args.snapshot_every)
+    recovery(args.sizes, args.snapshot_every)
+
+
+if __name__ == "__main__":
+    main()
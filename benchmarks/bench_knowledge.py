@@ -0,0 +1,72 @@
+"""
+Knowledge lookup cost: BM25 section retrieval vs. returning the whole file per call.
+
+Builds a synthetic multi-venue knowledge directory (copies of mg_cafe.md with
+venue-specific facts) and times queries as the number of venues grows.
+
+Usage: python -m benchmarks.bench_knowledge [--venues 1 50 500]
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from services.knowledge_index import KnowledgeIndex
+
+SOURCE = Path(__file__).resolve().parents[1] / "app" / "knowledge" / "mg_cafe.md"
+QUERIES = ["is there parking", "vegan options", "happy hour", "can I bring my dog", "dessert"]
+
+
+def build_corpus(directory: Path, venues: int) -> None:
+    template = SOURCE.read_text(encoding="utf-8")
+    for i in range(venues):
+        extra = f"\n### Venue Notes\n- Venue {i} room code: v{i}-lounge. Corkage fee ${i % 30}.\n"
+        (directory / f"venue_{i:04d}.md").write_text(template + extra, encoding="utf-8")
+
+
+def run(venue_counts: List[int], repeat: int) -> None:
+    print(f"{'venues':>7} {'sections':>9} {'build ms':>9} {'query us':>9} {'full-file us':>13} {'chars out':>10} {'file chars':>11}")
+    for venues in venue_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            build_corpus(directory, venues)
+            index = KnowledgeIndex(directory, check_interval=3600)
+
+            start = time.perf_counter()
+            index.refresh(force=True)
+            build_ms = (time.perf_counter() - start) * 1e3
+            sections = len(index._sections)
+
+            target = "venue_0000"
+            start = time.perf_counter()
+            chars = 0
+            for _ in range(repeat):
+                for query in QUERIES:
+                    chars += sum(len(s.text) for s, _ in index.search(query, top_k=3, source=target))
+            query_us = (time.perf_counter() - start) / (repeat * len(QUERIES)) * 1e6
+
+            path = directory / f"{target}.md"
+            start = time.perf_counter()
+            for _ in range(repeat * len(QUERIES)):
+                full = path.read_text(encoding="utf-8")
+            full_us = (time.perf_counter() - start) / (repeat * len(QUERIES)) * 1e6
+
+            print(
+                f"{venues:>7} {sections:>9} {build_ms:>9.1f} {query_us:>9.1f} {full_us:>13.1f} "
+                f"{chars // (repeat * len(QUERIES)):>10} {len(full):>11}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--venues", type=int, nargs="+", default=[1, 50, 500])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    run(args.venues, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Event-loop lag from logging on the agent audio path, before and after async logging.
+
+Simulates ``--sessions`` concurrent sessions. Each one receives 24 kHz agent audio
+in real time as 40 ms chunks, plus a transcript fragment every 5 chunks and a
+turn end every 4 s, and logs them the way ``agent_to_client_messaging`` does:
+
+- before: a ``print`` per chunk and per transcript fragment, written to the
+  console on the event loop (the old code);
+- sync:   ``async_logging.ChunkLog`` summaries (one per session per
+  ``--interval``), handler still writing on the event loop;
+- async:  the same summaries through the queue handler and listener thread.
+
+Output goes to ``--sink``:
+
+- ``slow-pipe``: a pipe whose reader drains only ``--drain-kbps`` KB/s, like a
+  terminal or container log driver that cannot keep up;
+- ``file``: a temporary file;
+- ``devnull``: ``/dev/null``.
+
+A probe task sleeping 10 ms at a time reports the loop's scheduling lag
+(p50 / p99 / max). The report also gives how late chunks were handled against
+their real-time schedule, bytes that reached the sink (for async, including
+what the listener flushes after the run) and records the async handler dropped.
+
+Usage: python -m benchmarks.bench_logging [--sessions 100] [--seconds 10] [--sink slow-pipe|file|devnull]
+       [--drain-kbps 64] [--interval 1] [--modes before,sync,async]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import logging
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.append(str(APP_DIR))
+
+from async_logging import ChunkLog, DroppingQueueHandler, configure_logging  # noqa: E402
+
+CHUNK_MS = 40
+CHUNK = bytes(24000 * CHUNK_MS // 1000 * 2)  # 24 kHz PCM16
+TRANSCRIPT_EVERY = 5
+TURN_EVERY = 100
+PROBE_S = 0.010
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+class Sink:
+    """A line-buffered text stream (like an unbuffered container stdout) and a byte count."""
+
+    def __init__(self, kind: str, drain_kbps: float) -> None:
+        self.kind = kind
+        self.bytes = 0
+        self._reader = None
+        self._path = None
+        if kind == "slow-pipe":
+            read_fd, write_fd = os.pipe()
+            self.stream = open(write_fd, "w", buffering=1)
+            self._reader = threading.Thread(target=self._drain, args=(read_fd, drain_kbps * 1024), daemon=True)
+            self._reader.start()
+        elif kind == "file":
+            fd, self._path = tempfile.mkstemp(suffix=".log")
+            self.stream = open(fd, "w", buffering=1)
+        elif kind == "devnull":
+            self.stream = open(os.devnull, "w", buffering=1)
+        else:
+            raise ValueError(f"Unknown sink {kind!r}")
+
+    def _drain(self, fd: int, bytes_per_s: float) -> None:
+        block = 4096
+        with open(fd, "rb", buffering=0) as pipe:
+            while True:
+                data = pipe.read(block)
+                if not data:
+                    return
+                self.bytes += len(data)
+                time.sleep(len(data) / bytes_per_s)
+
+    def close(self) -> str:
+        self.stream.close()
+        if self._reader is not None:
+            self._reader.join()
+            return f"{self.bytes / 1024:.0f} KB"
+        if self._path is not None:
+            size = os.path.getsize(self._path)
+            os.unlink(self._path)
+            return f"{size / 1024:.0f} KB"
+        return "-"
+
+
+async def session(index: int, mode: str, seconds: float, interval: float, stream, lateness: List[float]) -> None:
+    session_id = f"session-{index}"
+    chunk_log = ChunkLog(session_id, interval=interval) if mode != "before" else None
+    start = time.perf_counter() + (index % 25) * CHUNK_MS / 1000 / 25  # spread sessions over a chunk
+    chunks = int(seconds * 1000 / CHUNK_MS)
+    for n in range(chunks):
+        due = start + n * CHUNK_MS / 1000
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        lateness.append(max(0.0, time.perf_counter() - due) * 1000)
+        base64.b64encode(CHUNK)  # the JSON path's own per-chunk work
+        if n % TRANSCRIPT_EVERY == 0:
+            text = f"word{n} "
+            if chunk_log is None:
+                print(f"[AGENT TO CLIENT]: audio transcript: {text}", file=stream)
+            else:
+                chunk_log.chunk("transcript", text=text)
+        if chunk_log is None:
+            print(f"[AGENT TO CLIENT]: audio/pcm: {len(CHUNK)} bytes.", file=stream)
+        else:
+            chunk_log.chunk("audio/pcm", len(CHUNK))
+        if n % TURN_EVERY == TURN_EVERY - 1:
+            message = {"turn_complete": True, "interrupted": None}
+            if chunk_log is None:
+                print(f"[AGENT TO CLIENT]: {message}", file=stream)
+            else:
+                chunk_log.flush()
+                logging.info("[AGENT TO CLIENT] %s: %s", session_id, message, extra={"session": session_id})
+    if chunk_log is not None:
+        chunk_log.flush()
+
+
+async def probe(stop: asyncio.Event, lags: List[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_S)
+        lags.append((time.perf_counter() - start - PROBE_S) * 1000)
+
+
+async def run_mode(mode: str, sessions: int, seconds: float, interval: float, stream) -> Tuple[List[float], List[float]]:
+    lags: List[float] = []
+    lateness: List[float] = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(stop, lags))
+    await asyncio.gather(*(session(i, mode, seconds, interval, stream, lateness) for i in range(sessions)))
+    stop.set()
+    await probe_task
+    return lags, lateness
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--sink", choices=("slow-pipe", "file", "devnull"), default="slow-pipe")
+    parser.add_argument("--drain-kbps", type=float, default=64, help="slow-pipe reader throughput, KB/s")
+    parser.add_argument("--interval", type=float, default=1.0, help="ChunkLog summary interval, seconds")
+    parser.add_argument("--modes", default="before,sync,async")
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sessions x {args.seconds:.0f} s of {CHUNK_MS} ms agent audio chunks, sink: {args.sink}"
+          + (f" ({args.drain_kbps:.0f} KB/s)" if args.sink == "slow-pipe" else ""))
+    print(f"{'mode':<8} {'lag p50':>9} {'lag p99':>9} {'lag max':>9} {'late p99':>9} {'written':>9} {'dropped':>8}")
+    for mode in args.modes.split(","):
+        sink = Sink(args.sink, args.drain_kbps)
+        listener = configure_logging("async" if mode == "async" else "sync", stream=sink.stream)
+        lags, lateness = asyncio.run(run_mode(mode, args.sessions, args.seconds, args.interval, sink.stream))
+        dropped = sum(h.dropped for h in logging.getLogger().handlers if isinstance(h, DroppingQueueHandler))
+        if listener is not None:
+            listener.stop()
+        configure_logging("sync")  # detach from the sink before closing it
+        written = sink.close()
+        print(
+            f"{mode:<8} {percentile(lags, 50):7.2f}ms {percentile(lags, 99):7.2f}ms {max(lags):7.1f}ms"
+            f" {percentile(lateness, 99):7.2f}ms {written:>9} {dropped if mode == 'async' else '-':>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Reservation index cost and its effect on a simulated service.
+
+Index: a venue with ``--tables`` tables is booked over many days until it
+holds each ``--bookings`` count; conflict checks and "next free slot" queries
+on the per-table sorted-interval index are timed against a scan over every
+booking, as a flat list of reservations would need.
+
+Service: ``services.simulation`` with a share of the parties booking their
+arrival time ahead, once with walk-ins kept off tables reserved before they
+would finish (the manager's rule) and once seating walk-ins anywhere free.
+Reported: booked parties who arrived to find their table taken, walk-in wait
+and ETA quote error.
+
+Usage: python -m benchmarks.bench_reservations [--bookings 1000 10000 50000] [--tables 40] [--share 0.3]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import timeit
+from typing import List, Optional, Tuple
+
+from services.hotel import HotelManager
+from services.reservations import Reservation, ReservationBook
+from services.seating import Availability
+from services.simulation import SimulationConfig, simulate
+
+SLOT = 15 * 60.0
+
+
+class IgnoreBookings(HotelManager):
+    """Seats walk-ins at any free table, as if reservations were kept in a paper book."""
+
+    def _walk_in_rule(self) -> Availability:
+        return None
+
+
+def build(tables: int, bookings: int, seed: int = 0) -> Tuple[ReservationBook, List[Reservation]]:
+    """Non-overlapping 60-120 minute bookings with gaps, on quarter-hour starts, spread over days."""
+    rng = random.Random(seed)
+    book = ReservationBook()
+    flat: List[Reservation] = []
+    cursor = {f"T{i}": 0.0 for i in range(tables)}
+    for n in range(bookings):
+        table_id = f"T{n % tables}"
+        start = cursor[table_id] + rng.randrange(0, 8) * SLOT
+        end = start + rng.choice((60, 90, 120)) * 60
+        cursor[table_id] = end
+        reservation = Reservation(book.new_id(), f"guest{n}", 2, (table_id,), start, end)
+        book.add(reservation)
+        flat.append(reservation)
+    return book, flat
+
+
+def scan_conflict(flat: List[Reservation], table_id: str, start: float, end: float) -> Optional[Reservation]:
+    for reservation in flat:
+        if table_id in reservation.table_ids and reservation.start < end and reservation.end > start:
+            return reservation
+    return None
+
+
+def scan_next_gap(flat: List[Reservation], table_id: str, after: float, length: float) -> float:
+    busy = sorted((r.start, r.end) for r in flat if table_id in r.table_ids and r.end > after)
+    for start, end in busy:
+        if start >= after + length:
+            break
+        after = max(after, end)
+    return after
+
+
+def run_index(sizes: List[int], tables: int, repeat: int) -> None:
+    print(f"{tables} tables")
+    print(f"{'bookings':>9} {'query':<10} {'scan us':>10} {'index us':>9} {'speedup':>8}")
+    for size in sizes:
+        book, flat = build(tables, size)
+        horizon = max(r.end for r in flat)
+        rng = random.Random(size)
+        probes = [(f"T{rng.randrange(tables)}", rng.uniform(0, horizon)) for _ in range(64)]
+        for table_id, at in probes:  # both sides must agree before timing them
+            assert (book.conflict(table_id, at, at + 3600) is None) == (scan_conflict(flat, table_id, at, at + 3600) is None)
+            assert book.next_gap(table_id, at, 3600) == scan_next_gap(flat, table_id, at, 3600)
+        cases = (
+            (
+                "conflict",
+                lambda: [scan_conflict(flat, t, at, at + 3600) for t, at in probes],
+                lambda: [book.conflict(t, at, at + 3600) for t, at in probes],
+            ),
+            (
+                "next_slot",
+                lambda: [scan_next_gap(flat, t, at, 3600) for t, at in probes],
+                lambda: [book.next_gap(t, at, 3600) for t, at in probes],
+            ),
+        )
+        for name, scan, indexed in cases:
+            number = max(1, repeat // max(1, size // 1000))
+            scan_us = min(timeit.repeat(scan, number=number, repeat=3)) / number / len(probes) * 1e6
+            index_us = min(timeit.repeat(indexed, number=repeat, repeat=3)) / repeat / len(probes) * 1e6
+            print(f"{size:>9} {name:<10} {scan_us:>10.2f} {index_us:>9.2f} {scan_us / index_us:>7.0f}x")
+    print()
+
+
+def run_service(share: float, rate: float, seeds: int) -> None:
+    print(f"{share:.0%} of parties booked ahead, {rate:g} parties/h, mean of {seeds} seeds")
+    print(f"{'walk-ins':<18} {'booked':>7} {'table taken':>12} {'wait min':>9} {'ETA MAE':>8}")
+    for name, manager_class in (("kept off holds", HotelManager), ("seated anywhere", IgnoreBookings)):
+        runs = [
+            simulate(
+                SimulationConfig(arrivals_per_hour=rate, patience_minutes=None, booked_share=share, seed=seed),
+                manager_class(),
+            )
+            for seed in range(seeds)
+        ]
+        print(
+            f"{name:<18} {statistics.fmean(r.reservations for r in runs):>7.1f} "
+            f"{statistics.fmean(r.reservations_delayed for r in runs):>12.1f} "
+            f"{statistics.fmean(r.wait_mean for r in runs):>9.1f} "
+            f"{statistics.fmean(r.eta_mae or 0.0 for r in runs):>8.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bookings", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--tables", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--share", type=float, default=0.3, help="share of simulated parties that book ahead")
+    parser.add_argument("--rate", type=float, default=14, help="simulated party arrivals per hour")
+    parser.add_argument("--seeds", type=int, default=5)
+    args = parser.parse_args()
+    run_index(args.bookings, args.tables, args.repeat)
+    run_service(args.share, args.rate, args.seeds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Service simulation comparing seating policies on the default floor.
+
+Runs ``services.simulation`` at a flat arrival rate with its default party mix
+(including parties larger than any single table); every policy sees the same
+guests. Policies:
+
+- first-fit: the old rule, first free table in floor order and never joined
+- best-fit: smallest table that fits
+- best-fit+join: also joins adjacent tables for parties no single table seats
+- join+lookahead: additionally weighs the next ``--lookahead`` waiting parties
+
+The default floor lists tables smallest first, where first-fit already behaves
+like best-fit; the run is repeated with the floor order shuffled per seed.
+
+Reported per policy: covers (guests seated) per hour, seat utilization (seat-
+minutes used by guests / seat-minutes available), wasted seat share (seat-
+minutes held by a party but empty), parties that gave up, and mean wait.
+
+Usage: python -m benchmarks.bench_seating [--rates 20 30 40] [--hours 6] [--seeds 5]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+from typing import List, Optional, Sequence
+
+from services.hotel import HotelManager, TableIndex
+from services.seating import Adjacency, Availability, SeatingOptimizer, SeatingPlan
+from services.simulation import SimulationConfig, SimulationReport, simulate
+from services.waitlist import Waitlist
+
+
+class FirstFit(SeatingOptimizer):
+    """The seating rule before the optimizer: first free table in floor order, never joined."""
+
+    def plan(self, index: TableIndex, adjacency: Adjacency, party_size: int,
+             upcoming: Sequence[int] = (), combine: bool = True, available: Availability = None) -> Optional[SeatingPlan]:
+        for table in index:
+            if index.is_free(table) and table.seats >= party_size and (available is None or available(table, party_size)):
+                return SeatingPlan((table,), party_size)
+        return None
+
+    def fill(self, index: TableIndex, adjacency: Adjacency, freed, waitlist: Waitlist, available: Availability = None):
+        entry = waitlist.first_fitting(freed[0].seats)
+        return None if entry is None else (entry, SeatingPlan((freed[0],), entry.party_size))
+
+
+POLICIES = {
+    "first-fit": lambda lookahead: FirstFit(),
+    "best-fit": lambda lookahead: SeatingOptimizer(max_tables=1),
+    "best-fit+join": lambda lookahead: SeatingOptimizer(),
+    "join+lookahead": lambda lookahead: SeatingOptimizer(lookahead=lookahead),
+}
+
+
+def simulate_policy(optimizer: SeatingOptimizer, rate: float, hours: float, patience: float, seed: int,
+                    shuffle: bool) -> SimulationReport:
+    floor = HotelManager()
+    tables = list(floor.tables)
+    if shuffle:
+        random.Random(-seed).shuffle(tables)
+    manager = HotelManager(tables=tables, adjacency=floor.adjacency, seating=optimizer)
+    config = SimulationConfig(hours=hours, arrivals_per_hour=rate, patience_minutes=patience, seed=seed)
+    return simulate(config, manager)
+
+
+def run(rates: List[float], hours: float, seeds: int, patience: float, lookahead: int) -> None:
+    for shuffle in (False, True):
+        order = "shuffled floor order" if shuffle else "default floor order"
+        print(f"{order}, {hours:g} h service, patience {patience:g} min, mean of {seeds} seeds")
+        print(f"{'parties/h':>9} {'policy':<15} {'covers/h':>9} {'util':>6} {'wasted':>7} {'gave up':>8} {'wait min':>9}")
+        for rate in rates:
+            for name, make in POLICIES.items():
+                runs = [simulate_policy(make(lookahead), rate, hours, patience, seed, shuffle) for seed in range(seeds)]
+                print(
+                    f"{rate:>9g} {name:<15} {statistics.fmean(r.covers for r in runs) / hours:>9.1f} "
+                    f"{statistics.fmean(r.seat_utilization for r in runs):>6.1%} "
+                    f"{statistics.fmean(r.wasted_seat_share for r in runs):>7.1%} "
+                    f"{statistics.fmean(r.walked_away for r in runs):>8.1f} "
+                    f"{statistics.fmean(r.wait_mean for r in runs):>9.1f}"
+                )
+        print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rates", type=float, nargs="+", default=[20, 30, 40], help="mean party arrivals per hour")
+    parser.add_argument("--hours", type=float, default=6)
+    parser.add_argument("--seeds", type=int, default=5)
+    parser.add_argument("--patience", type=float, default=45, help="minutes a party waits before leaving")
+    parser.add_argument("--lookahead", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rates, args.hours, args.seeds, args.patience, args.lookahead)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Run the discrete-event service simulation and report how fast it runs.
+
+Simulates ``--seeds`` Friday-night services (or a flat ``--rate``) on the default
+floor, prints the capacity report of the first one, and the simulated time per
+wall-clock second across all of them.
+
+Usage: python -m benchmarks.bench_simulation [--hours 5] [--rate 30] [--seeds 20] [--lookahead 0]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+
+from services.hotel import HotelManager
+from services.seating import SeatingOptimizer
+from services.simulation import FRIDAY_PROFILE, SimulationConfig, simulate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hours", type=float, default=5.0)
+    parser.add_argument("--rate", type=float, default=None, help="flat parties/hour instead of the Friday profile")
+    parser.add_argument("--seeds", type=int, default=20)
+    parser.add_argument("--patience", type=float, default=45.0)
+    parser.add_argument("--lookahead", type=int, default=0)
+    args = parser.parse_args()
+
+    reports = []
+    for seed in range(args.seeds):
+        config = SimulationConfig(
+            hours=args.hours,
+            arrivals_per_hour=FRIDAY_PROFILE if args.rate is None else args.rate,
+            patience_minutes=args.patience,
+            seed=seed,
+        )
+        reports.append(simulate(config, HotelManager(seating=SeatingOptimizer(lookahead=args.lookahead))))
+
+    print("seed 0:")
+    for line in reports[0].summary():
+        print(f"  {line}")
+    speedups = sorted(r.speedup for r in reports)
+    wall_ms = statistics.fmean(r.wall_seconds for r in reports) * 1e3
+    print(f"\n{args.seeds} services: {wall_ms:.0f} ms each on average, "
+          f"median {statistics.median(speedups):,.0f}x real time (min {speedups[0]:,.0f}x)")
+    print(f"mean p90 wait {statistics.fmean(r.wait_p90 for r in reports):.1f} min, "
+          f"mean ETA MAE {statistics.fmean(r.eta_mae for r in reports if r.eta_mae is not None):.1f} min, "
+          f"mean table utilization {statistics.fmean(r.table_utilization for r in reports):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Aggregate session throughput vs. worker processes sharing venue state.
+
+Each worker process runs several simulated concierge sessions. A session turn
+does per-frame audio work (RMS gate + mu-law style companding on 20 ms frames,
+the CPU that pins a single event loop today) and then one venue mutation
+(seat/waitlist a party or check a table out) through ``SessionRegistry.transaction``
+on a shared ``SqliteBackend``. After the run the books are checked: every party
+added is seated, waitlisted or checked out exactly once, so a lost update under
+concurrency shows up as a mismatch.
+
+Scaling is bounded by the number of CPU cores.
+
+Usage: python -m benchmarks.bench_state_backend [--workers 1 2 4] [--sessions 8] [--turns 40]
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from services.state_backend import InProcessBackend, SqliteBackend
+from services.state_registry import SessionRegistry
+
+FRAME_SAMPLES = 320  # 20 ms at 16 kHz
+
+
+def audio_work(rng: np.random.Generator, frames: int) -> float:
+    level = 0.0
+    for _ in range(frames):
+        pcm = rng.integers(-3000, 3000, FRAME_SAMPLES, dtype=np.int16)
+        samples = pcm.astype(np.float64)
+        level += float(np.sqrt(np.dot(samples, samples) / FRAME_SAMPLES))
+        magnitude = np.log1p(255 * np.abs(samples) / 32768) / np.log1p(255)
+        level += float(np.sign(samples).dot(magnitude))
+    return level
+
+
+def worker(args: Tuple[int, str, int, int, int, int]) -> Dict[str, float]:
+    index, db_path, sessions, turns, venues, frames = args
+    backend = SqliteBackend(db_path) if db_path else InProcessBackend()
+    registry = SessionRegistry(backend=backend, ttl_seconds=0, max_entries=0)
+    rng = random.Random(index)
+    np_rng = np.random.default_rng(index)
+    counts = {"added": 0, "cleared": 0}
+
+    def seat(name: str, size: int):
+        def fn(manager):
+            table = manager.check_availability(size)
+            if table:
+                manager.assign_table(table, name)
+            else:
+                manager.add_to_waitlist(name, size)
+        return fn
+
+    def checkout(pick: float):
+        def fn(manager):
+            occupied = [t.table_id for t in manager.tables if t.status == "occupied"]
+            if not occupied:
+                return False
+            manager.checkout_and_fill_waitlist(occupied[int(pick * len(occupied))])
+            return True
+        return fn
+
+    started = time.time()
+    for turn in range(turns):
+        for session in range(sessions):
+            audio_work(np_rng, frames)
+            venue = f"venue-{(index + session) % venues}"
+            if rng.random() < 0.55:
+                registry.transaction(venue, seat(f"w{index}-s{session}-t{turn}", rng.choice((1, 2, 2, 4))))
+                counts["added"] += 1
+            elif registry.transaction(venue, checkout(rng.random())):
+                counts["cleared"] += 1
+    finished = time.time()
+    backend.close()
+    return {
+        "turns": turns * sessions,
+        "started": started,
+        "finished": finished,
+        "conflicts": registry.conflicts,
+        **counts,
+    }
+
+
+def audit(db_path: str, venues: int, added: int, cleared: int) -> str:
+    registry = SessionRegistry(backend=SqliteBackend(db_path), ttl_seconds=0, max_entries=0)
+    names: List[str] = []
+    for v in range(venues):
+        manager = registry.get(f"venue-{v}")
+        names += [t.guest_name for t in manager.tables if t.status == "occupied"]
+        names += [e.name for e in manager.waitlist]
+    ok = len(names) == len(set(names)) == added - cleared
+    return "ok" if ok else f"MISMATCH (resident {len(names)}, unique {len(set(names))}, expected {added - cleared})"
+
+
+def run(worker_counts: List[int], sessions: int, turns: int, venues: int, frames: int) -> None:
+    print(f"cores: {os.cpu_count()}  sessions/worker: {sessions}  turns/session: {turns}  venues: {venues}")
+    print(f"{'backend':>8} {'workers':>8} {'turns/s':>9} {'speedup':>8} {'conflicts':>10} {'books':>6}")
+    base = None
+    for backend in ("memory", "sqlite"):
+        for workers in worker_counts if backend == "sqlite" else [1]:
+            with tempfile.TemporaryDirectory() as tmp:
+                db_path = str(Path(tmp) / "state.db") if backend == "sqlite" else ""
+                if db_path:
+                    SqliteBackend(db_path).close()  # create schema + WAL before workers race
+                jobs = [(i, db_path, sessions, turns, venues, frames) for i in range(workers)]
+                if workers == 1:
+                    results = [worker(jobs[0])]
+                else:
+                    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+                        results = pool.map(worker, jobs)
+                # Measure the span in which workers were running turns, not process startup.
+                wall = max(r["finished"] for r in results) - min(r["started"] for r in results)
+                total = sum(r["turns"] for r in results)
+                throughput = total / wall
+                base = base or throughput
+                books = "-"
+                if db_path:
+                    books = audit(db_path, venues, sum(r["added"] for r in results), sum(r["cleared"] for r in results))
+                print(
+                    f"{backend:>8} {workers:>8} {throughput:>9.0f} {throughput / base:>7.2f}x "
+                    f"{sum(r['conflicts'] for r in results):>10} {books:>6}"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--venues", type=int, default=2)
+    parser.add_argument("--frames", type=int, default=50, help="20 ms audio frames processed per turn")
+    args = parser.parse_args()
+    run(args.workers, args.sessions, args.turns, args.venues, args.frames)
+
+
+if __name__ == "__main__":
+    main()
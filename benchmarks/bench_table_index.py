@@ -0,0 +1,74 @@
+"""
+Compare the indexed table lookups in HotelManager against the old linear scans.
+
+Usage: python -m benchmarks.bench_table_index [--sizes 16 256 4096] [--repeat 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+from typing import List, Optional
+
+from services.hotel import HotelManager, Table
+
+
+def build_floor(table_count: int, occupancy: float, seed: int = 7) -> HotelManager:
+    rng = random.Random(seed)
+    seat_mix = (1, 2, 2, 4, 4, 6, 8, 10)
+    tables = [
+        Table(f"T{i}", rng.choice(seat_mix), "standard") for i in range(table_count)
+    ]
+    manager = HotelManager(tables=tables)
+    for table in tables:
+        if rng.random() < occupancy:
+            manager.assign_table(table, guest_name="bench")
+    return manager
+
+
+def linear_find(tables: List[Table], table_id: str) -> Optional[Table]:
+    return next((t for t in tables if t.table_id == table_id), None)
+
+
+def linear_first_fit(tables: List[Table], party_size: int) -> Optional[Table]:
+    return next((t for t in tables if t.status == "free" and t.seats >= party_size), None)
+
+
+def run(sizes: List[int], repeat: int, occupancy: float) -> None:
+    print(f"{'tables':>8} {'op':<20} {'linear us':>10} {'indexed us':>11} {'speedup':>8}")
+    for size in sizes:
+        manager = build_floor(size, occupancy)
+        last_id = manager.tables[-1].table_id
+        party = 10  # largest seat size, so the linear scan walks most of the floor
+        cases = (
+            (
+                "find_table",
+                lambda: linear_find(manager.tables, last_id),
+                lambda: manager._find_table(last_id),
+            ),
+            (
+                "check_availability",
+                lambda: linear_first_fit(manager.tables, party),
+                lambda: manager.check_availability(party),
+            ),
+        )
+        for name, linear, indexed in cases:
+            linear_us = min(timeit.repeat(linear, number=repeat, repeat=3)) / repeat * 1e6
+            indexed_us = min(timeit.repeat(indexed, number=repeat, repeat=3)) / repeat * 1e6
+            print(
+                f"{size:>8} {name:<20} {linear_us:>10.2f} {indexed_us:>11.2f} "
+                f"{linear_us / indexed_us:>7.1f}x"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 256, 1024, 4096])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--occupancy", type=float, default=0.9)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.occupancy)
+
+
+if __name__ == "__main__":
+    main()
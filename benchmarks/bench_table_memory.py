@@ -0,0 +1,159 @@
+"""
+Memory and allocation cost of the table/waitlist representation.
+
+Compares the slotted ``Table``/``WaitlistEntry`` (integer status codes, epoch
+timestamps, cached ISO strings) with the previous dict-backed dataclasses
+(string status, ``datetime`` timestamps), for
+
+- resident bytes per table and per waitlist entry (tracemalloc), and
+- the table part of a status build: time and peak allocation per call. The
+  legacy path replays the old ``get_status``, which serialized every table
+  twice (once for the waitlist simulation, once for the payload).
+
+Usage: python -m benchmarks.bench_table_memory [--tables 100 1000 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from services.hotel import HotelManager, Table, WaitlistEntry
+
+DINING_MINUTES = 50
+
+
+@dataclass
+class LegacyTable:
+    table_id: str
+    seats: int
+    table_type: str
+    status: str = "free"
+    guest_name: Optional[str] = None
+    assigned_time: Optional[datetime.datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.table_id,
+            "seats": self.seats,
+            "type": self.table_type,
+            "status": self.status,
+            "guest_name": self.guest_name,
+            "assigned_time": self.assigned_time.isoformat() if self.assigned_time else None,
+        }
+
+
+@dataclass
+class LegacyWaitlistEntry:
+    name: str
+    party_size: int
+
+
+def legacy_eta(table: LegacyTable, now: datetime.datetime) -> int:
+    elapsed = (now - table.assigned_time).total_seconds() / 60
+    return max(0, DINING_MINUTES - int(elapsed))
+
+
+def legacy_tables_payload(tables: List[LegacyTable]) -> List[Dict[str, Any]]:
+    now = datetime.datetime.now()
+    simulated = []
+    for t in tables:
+        sim = t.to_dict()
+        sim["estimated_free_time"] = now
+        if t.status == "occupied" and t.assigned_time:
+            legacy_eta(t, now)
+            sim["estimated_free_time"] = t.assigned_time + datetime.timedelta(minutes=DINING_MINUTES)
+        simulated.append(sim)
+    simulated.sort(key=lambda x: x["estimated_free_time"])
+    payload = []
+    for t in tables:
+        table_dict = t.to_dict()
+        if t.status == "occupied":
+            table_dict["eta_minutes"] = legacy_eta(t, now)
+        payload.append(table_dict)
+    return payload
+
+
+def resident_bytes(build: Callable[[], list]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return after - before
+
+
+def per_call(fn: Callable[[], object], repeat: int) -> tuple:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed_us = (time.perf_counter() - start) / repeat * 1e6
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed_us, peak
+
+
+def legacy_floor(count: int) -> List[LegacyTable]:
+    seated = datetime.datetime.now() - datetime.timedelta(minutes=20)
+    return [
+        LegacyTable(f"T{i}", 4, "standard", "occupied", f"guest-{i}", seated - datetime.timedelta(seconds=i))
+        for i in range(count)
+    ]
+
+
+def slotted_floor(count: int) -> List[Table]:
+    seated = datetime.datetime.now() - datetime.timedelta(minutes=20)
+    tables = []
+    for i in range(count):
+        table = Table(f"T{i}", 4, "standard", guest_name=f"guest-{i}")
+        table.status = "occupied"
+        table.assigned_time = seated - datetime.timedelta(seconds=i)
+        tables.append(table)
+    return tables
+
+
+def run(counts: List[int]) -> None:
+    print("resident bytes per object")
+    print(f"{'objects':>8} {'legacy table':>13} {'slotted table':>14} {'legacy entry':>13} {'slotted entry':>14}")
+    for count in counts:
+        row = [
+            resident_bytes(lambda: legacy_floor(count)) / count,
+            resident_bytes(lambda: slotted_floor(count)) / count,
+            resident_bytes(lambda: [LegacyWaitlistEntry(f"guest-{i}", 2) for i in range(count)]) / count,
+            resident_bytes(lambda: [WaitlistEntry(f"guest-{i}", 2) for i in range(count)]) / count,
+        ]
+        print(f"{count:>8} " + " ".join(f"{value:>13.0f}" for value in row))
+
+    print("\ntable payload per status build (all tables occupied)")
+    print(f"{'tables':>8} {'legacy us':>10} {'slotted us':>11} {'legacy peak KB':>15} {'slotted peak KB':>16}")
+    for count in counts:
+        legacy = legacy_floor(count)
+        manager = HotelManager(tables=slotted_floor(count))
+        repeat = max(3, 20000 // count)
+        legacy_us, legacy_peak = per_call(lambda: legacy_tables_payload(legacy), repeat)
+        slotted_us, slotted_peak = per_call(lambda: manager.peek_status(), repeat)
+        print(
+            f"{count:>8} {legacy_us:>10.0f} {slotted_us:>11.0f} "
+            f"{legacy_peak / 1024:>15.1f} {slotted_peak / 1024:>16.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tables", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+    run(args.tables)
+
+
+if __name__ == "__main__":
+    main()
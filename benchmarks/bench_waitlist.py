@@ -0,0 +1,77 @@
+"""
+Compare the indexed Waitlist against the old list scans, by waitlist length.
+
+The queue is mostly large parties with small ones behind them, so filling a
+freed two-top has to skip most of the line, and name lookups target the last
+party. Each fill re-appends the seated party to keep the length constant.
+
+Usage: python -m benchmarks.bench_waitlist [--sizes 100 1000 10000] [--repeat 500]
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import List, Optional
+
+from services.waitlist import Waitlist, WaitlistEntry
+
+
+def build(size: int) -> List[WaitlistEntry]:
+    return [WaitlistEntry(f"Guest{i}", 2 if i % 50 == 49 else 6) for i in range(size)]
+
+
+def legacy_fill(waitlist: List[WaitlistEntry], seats: int) -> Optional[WaitlistEntry]:
+    for idx, entry in enumerate(list(waitlist)):
+        if entry.party_size <= seats:
+            return waitlist.pop(idx)
+    return None
+
+
+def legacy_find(waitlist: List[WaitlistEntry], name: str) -> Optional[WaitlistEntry]:
+    for entry in waitlist:
+        if entry.name.lower() == name.lower():
+            return entry
+    return None
+
+
+def indexed_fill(waitlist: Waitlist, seats: int) -> Optional[WaitlistEntry]:
+    entry = waitlist.first_fitting(seats)
+    if entry is not None:
+        waitlist.discard(entry)
+    return entry
+
+
+def run(sizes: List[int], repeat: int) -> None:
+    print(f"{'waiting':>8} {'op':<12} {'list us':>9} {'indexed us':>11} {'speedup':>8}")
+    for size in sizes:
+        plain = build(size)
+        indexed = Waitlist(build(size))
+        last = f"GUEST{size - 1}"
+
+        def fill_plain() -> None:
+            plain.append(legacy_fill(plain, 2))
+
+        def fill_indexed() -> None:
+            indexed.append(indexed_fill(indexed, 2))
+
+        cases = (
+            ("fill_table", fill_plain, fill_indexed),
+            ("find_name", lambda: legacy_find(plain, last), lambda: indexed.find(last)),
+        )
+        for name, linear, fast in cases:
+            linear_us = min(timeit.repeat(linear, number=repeat, repeat=3)) / repeat * 1e6
+            fast_us = min(timeit.repeat(fast, number=repeat, repeat=3)) / repeat * 1e6
+            print(f"{size:>8} {name:<12} {linear_us:>9.2f} {fast_us:>11.2f} {linear_us / fast_us:>7.1f}x")
+        assert [e.name for e in plain] == [e.name for e in indexed], "fill order diverged"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Offline performance-regression suite: HotelManager operations and websocket-path CPU.
+
+Service cases time ``get_status``, ``estimate_wait_time`` (cold projection),
+``check_availability`` and a ``checkout_and_fill_waitlist`` cycle (checkout,
+then restore the seat and the waitlist length) over a grid of table counts
+and waitlist lengths, on a ``VirtualClock`` so runs are deterministic.
+The transaction case runs the same checkout cycle through ``run_transaction``
+on a venue of hundreds of tables and thousands of reservations, with the
+process registry on a temporary ``SqliteBackend``, so each call pays the
+version check, ``to_state`` and save that a mutation pays in production.
+Websocket cases time the per-frame work of ``/ws``: a 20 ms inbound frame
+through unpack, codec and the voice gate (binary and JSON protocols), and an
+outbound 20 ms agent frame through the codec and framing. Nothing touches the
+network or the model.
+
+Each case reports the best per-call time over ``--repeat`` timed runs. The
+whole suite runs ``--rounds`` times, each case set up afresh, because on a
+shared host a case can run fast or slow for a whole round. ``--save`` records
+each case's median round; ``--check`` compares its best round, so only a case
+that is slow in every round fails. A fixed pure-Python calibration loop is
+sampled after every case, and ``--check`` scales the stored baselines by how
+much faster or slower this machine ran it (median over all samples) before
+comparing, so a baseline taken on another host is still meaningful. A case
+regresses when it is more than ``--threshold`` times its scaled baseline, or
+``--io-threshold`` for cases that wait on disk (the SQLite transaction);
+``--check`` then exits with status 1.
+
+Usage:
+  python -m benchmarks.suite                      # run and print
+  python -m benchmarks.suite --check              # compare with benchmarks/baselines.json
+  python -m benchmarks.suite --save               # record new baselines
+  python -m benchmarks.suite --only get_status --tables 256 --waitlist 100
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import datetime
+import gc
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from services.hotel import FREE, HotelManager, Table
+from services.simulation import VirtualClock
+from services.state_backend import SqliteBackend
+from services.state_registry import registry, run_transaction
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.append(str(APP_DIR))
+
+from audio_codec import CODEC_MULAW, CODEC_PCM16, from_pcm16, to_pcm16  # noqa: E402
+from vad import VoiceGate  # noqa: E402
+from wire_protocol import pack_frame, unpack_frame  # noqa: E402
+
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+START = datetime.datetime(2026, 1, 2, 19, 0)
+TRANSACTION_VENUES = ((256, 4000),)  # (tables, reservations)
+# Cases whose time includes file I/O; fsync and page-cache timing vary far more than CPU work.
+IO_CASES = ("registry.",)
+
+# name -> zero-argument setup returning the callable to time
+Case = Tuple[str, Callable[[], Callable[[], object]]]
+
+
+def build_manager(
+    table_count: int, waitlist_len: int, seed: int = 7, start: datetime.datetime = START
+) -> HotelManager:
+    """A busy floor: seven tables in eight occupied at staggered times, plus a waitlist."""
+    rng = random.Random(seed)
+    clock = VirtualClock(start)
+    tables = [Table(f"T{i}", rng.choice((1, 2, 2, 4, 4, 6)), "standard") for i in range(table_count)]
+    manager = HotelManager(tables=tables, clock=clock)
+    for i, table in enumerate(tables):
+        if i % 8:
+            clock.now = start - datetime.timedelta(minutes=rng.randint(0, 49))
+            manager.assign_table(table, f"diner-{i}", table.seats)
+    clock.now = start
+    for i in range(waitlist_len):
+        manager.add_to_waitlist(f"guest-{i}", rng.choice((1, 2, 3, 4, 5, 6)))
+    return manager
+
+
+def service_cases(table_counts: List[int], waitlist_lens: List[int]) -> Iterator[Case]:
+    for tables, waiting in itertools.product(table_counts, waitlist_lens):
+        suffix = f"[tables={tables},waitlist={waiting}]"
+
+        def get_status(tables=tables, waiting=waiting):
+            manager = build_manager(tables, waiting)
+            return manager.get_status
+
+        def estimate_cold(tables=tables, waiting=waiting):
+            manager = build_manager(tables, waiting)
+
+            def run():
+                manager._eta().invalidate()
+                return manager.estimate_wait_time(4)
+
+            return run
+
+        def check_availability(tables=tables, waiting=waiting):
+            manager = build_manager(tables, waiting)
+            return lambda: manager.check_availability(3)
+
+        def checkout_cycle(tables=tables, waiting=waiting):
+            manager = build_manager(tables, waiting)
+            occupied = itertools.cycle([t for t in manager.tables if t.status_code != FREE])
+            return lambda: _checkout_and_restore(manager, next(occupied))
+
+        yield f"hotel.get_status{suffix}", get_status
+        yield f"hotel.estimate_wait_time{suffix}", estimate_cold
+        yield f"hotel.check_availability{suffix}", check_availability
+        yield f"hotel.checkout_and_fill_waitlist{suffix}", checkout_cycle
+
+
+def _checkout_and_restore(manager: HotelManager, table: Table) -> dict:
+    """Check a table out, then restore the seat and the waitlist length."""
+    result = manager.checkout_and_fill_waitlist(table.table_id)
+    seated = result["assigned_guest"]
+    if seated:
+        manager.add_to_waitlist(seated["name"], seated["party_size"])
+    if result["assigned_table"] is None:
+        manager.assign_tables([table.table_id], "regular", table.seats)
+    return result
+
+
+_state_dir: Optional[tempfile.TemporaryDirectory] = None
+
+
+def build_venue(table_count: int, reservation_count: int, seed: int = 7) -> HotelManager:
+    """``build_manager`` on the wall clock plus back-to-back reservations over the coming days."""
+    now = datetime.datetime.now().replace(second=0, microsecond=0)
+    manager = build_manager(table_count, 100, seed, start=now)
+    for i in range(reservation_count):
+        table = manager.tables[i % table_count]
+        slot = now + datetime.timedelta(hours=2 + 2 * (i // table_count))
+        booked = manager.add_reservation(f"booking-{i}", table.seats, slot.isoformat(), 90, [table.table_id])
+        if not booked["success"]:
+            raise RuntimeError(f"could not book {table.table_id} at {slot}: {booked['message']}")
+    return manager
+
+
+def transaction_cases() -> Iterator[Case]:
+    for tables, reservations in TRANSACTION_VENUES:
+
+        def checkout_cycle(tables=tables, reservations=reservations):
+            global _state_dir
+            if _state_dir is None:
+                # run_transaction goes through the process registry; give it a throwaway database.
+                _state_dir = tempfile.TemporaryDirectory(prefix="suite-state-")
+                registry.configure(
+                    backend=SqliteBackend(Path(_state_dir.name) / "state.db"), ttl_seconds=0, max_entries=0
+                )
+            venue_id = f"suite-{tables}x{reservations}"
+            state = build_venue(tables, reservations).to_state()
+            run_transaction(lambda manager: manager.load_state(state), venue_id)
+            occupied = itertools.cycle(
+                [Table.from_dict(data) for data in state["tables"] if data["status"] != "free"]
+            )
+            return lambda: run_transaction(
+                lambda manager, table=next(occupied): _checkout_and_restore(manager, table), venue_id
+            )
+
+        yield f"registry.run_transaction[backend=sqlite,tables={tables},reservations={reservations}]", checkout_cycle
+
+
+def _speech_frame(rate: int, seed: int = 3) -> bytes:
+    rng = np.random.default_rng(seed)
+    t = np.arange(rate // 50) / rate  # 20 ms
+    signal = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(t.size)
+    return (signal * 32767).astype("<i2").tobytes()
+
+
+def websocket_cases() -> Iterator[Case]:
+    mic = _speech_frame(16000)
+    agent = _speech_frame(24000)
+    for name, codec in (("pcm16", CODEC_PCM16), ("mulaw", CODEC_MULAW)):
+
+        def inbound_binary(codec=codec):
+            gate = VoiceGate()
+            message = pack_frame(from_pcm16(mic, codec), 1, codec=codec)
+
+            def run():
+                frame = unpack_frame(message)
+                return gate.process(to_pcm16(frame.payload, frame.codec))
+
+            return run
+
+        def outbound_binary(codec=codec):
+            sequence = itertools.count()
+            return lambda: pack_frame(from_pcm16(agent, codec), next(sequence), codec=codec)
+
+        yield f"ws.inbound_frame[proto=binary,codec={name}]", inbound_binary
+        yield f"ws.outbound_frame[proto=binary,codec={name}]", outbound_binary
+
+    def inbound_json():
+        gate = VoiceGate()
+        text = json.dumps({"mime_type": "audio/pcm", "data": base64.b64encode(mic).decode("ascii")})
+
+        def run():
+            message = json.loads(text)
+            return gate.process(base64.b64decode(message["data"]))
+
+        return run
+
+    yield "ws.inbound_frame[proto=json,codec=pcm16]", inbound_json
+
+
+def calibration() -> Callable[[], object]:
+    """Fixed interpreter-bound work standing in for "how fast is this machine"."""
+    words = [f"w{(i * 7919) % 1000}" for i in range(2000)]
+
+    def run():
+        counts: Dict[str, int] = {}
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:10]
+
+    return run
+
+
+def measure(fn: Callable[[], object], min_time: float, repeat: int) -> float:
+    """Best microseconds per call over ``repeat`` runs of at least ``min_time`` seconds each."""
+    gc.collect()
+    enabled = gc.isenabled()
+    gc.disable()  # as timeit does: collections land on whichever case happens to trigger them
+    try:
+        return _measure(fn, min_time, repeat)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _measure(fn: Callable[[], object], min_time: float, repeat: int) -> float:
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1e6
+
+
+def run_suite(cases: List[Case], min_time: float, repeat: int) -> Dict[str, object]:
+    results: Dict[str, float] = {}
+    calibrate = calibration()
+    speed: List[float] = []
+    for name, setup in cases:
+        results[name] = round(measure(setup(), min_time, repeat), 3)
+        print(f"  {name:<72} {results[name]:>11.2f} us", flush=True)
+        # One short sample after every case: the median tracks the machine's speed over the
+        # whole round, where a single measurement can land on a lucky or a loaded moment.
+        speed.append(measure(calibrate, min_time, 1))
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "calibration_us": round(statistics.median(speed), 3),
+        "results": results,
+    }
+
+
+def run_rounds(cases: List[Case], min_time: float, repeat: int, rounds: int) -> Dict[str, object]:
+    """
+    ``run_suite`` ``rounds`` times. ``results`` keeps each case's best round and
+    ``typical`` its median round; the calibration is the median over all rounds.
+    """
+    runs: List[Dict[str, object]] = []
+    for round_no in range(1, rounds + 1):
+        if rounds > 1:
+            print(f"round {round_no}/{rounds}", flush=True)
+        runs.append(run_suite(cases, min_time, repeat))
+    names = runs[0]["results"]
+    return {
+        **runs[0],
+        "calibration_us": round(statistics.median(run["calibration_us"] for run in runs), 3),
+        "results": {name: min(run["results"][name] for run in runs) for name in names},
+        "typical": {name: round(statistics.median(run["results"][name] for run in runs), 3) for name in names},
+    }
+
+
+def compare(
+    current: Dict[str, object], baseline: Dict[str, object], threshold: float, io_threshold: float
+) -> List[str]:
+    """Print current vs. scaled baseline per case; return the names that regressed."""
+    scale = current["calibration_us"] / baseline["calibration_us"]
+    print(f"\nmachine speed vs. baseline: {1 / scale:.2f}x (calibration {current['calibration_us']:.1f} us "
+          f"vs {baseline['calibration_us']:.1f} us); threshold {threshold:.2f}x, I/O cases {io_threshold:.2f}x")
+    print(f"{'case':<72} {'baseline us':>12} {'now us':>10} {'ratio':>7}")
+    regressed = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<72} {'-':>12} {now:>10.2f} {'new':>7}")
+            continue
+        ratio = now / (before * scale)
+        flag = ""
+        if ratio > (io_threshold if name.startswith(IO_CASES) else threshold):
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<72} {before * scale:>12.2f} {now:>10.2f} {ratio:>6.2f}x{flag}")
+    return regressed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, nargs="+", default=[16, 256, 2048])
+    parser.add_argument("--waitlist", type=int, nargs="+", default=[0, 100, 1000])
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timed run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=5, help="passes over the suite, each case set up afresh")
+    parser.add_argument("--baseline", type=Path, default=BASELINES)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="fail if a case regressed against the baseline")
+    parser.add_argument("--threshold", type=float, default=1.5, help="allowed slowdown factor before failing")
+    parser.add_argument("--io-threshold", type=float, default=3.0, help="allowed slowdown for cases that do file I/O")
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    args = parser.parse_args(argv)
+
+    cases = [*service_cases(args.tables, args.waitlist), *transaction_cases(), *websocket_cases()]
+    if args.only:
+        cases = [case for case in cases if args.only in case[0]]
+    print(f"{len(cases)} cases, best of {args.rounds} round(s) of {args.repeat} x >= {args.min_time * 1e3:g} ms")
+    current = run_rounds(cases, args.min_time, args.repeat, args.rounds)
+    if args.json:
+        args.json.write_text(json.dumps(current, indent=2) + "\n")
+    if args.save:
+        # The baseline is what a round typically takes; --check holds the best round against
+        # it, so only a case that is slow in every round fails.
+        baseline = {**current, "results": current["typical"]}
+        del baseline["typical"]
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+    if args.check:
+        if not args.baseline.exists():
+            print(f"no baseline at {args.baseline}; run with --save first")
+            return 1
+        baseline = json.loads(args.baseline.read_text())
+        regressed = compare(current, baseline, args.threshold, args.io_threshold)
+        if regressed:
+            print(f"\n{len(regressed)} regression(s)")
+            return 1
+        print("\nno regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Websocket load generator: N concurrent ``/ws/{user_id}`` sessions streaming synthetic PCM.
+
+Each session connects (staggered over ``--ramp`` seconds), then sends 16 kHz
+mic audio in real-time 20 ms frames for ``--seconds``: bursts of a voiced
+tone for ``--speech`` of the time and low-level noise otherwise, so the voice
+gate sees both. Frames go out as binary frames (``--proto binary``, with
+``--codec``) or as base64 JSON. Everything the server sends back is counted.
+
+Reported: connect latency, how late the client's own send loop ran (if the
+generator itself is saturated its numbers are not the server's), frames sent,
+time to the first server message, messages and bytes received, and errors.
+
+``--serve`` starts ``app/main.py`` in-process on a free local port instead of
+targeting ``--url``. Sessions talk to whatever model ``DEMO_AGENT_MODEL``
+names; ``DEMO_AGENT_MODEL=scripted`` (app/concierge/scripted_model.py) runs
+the whole path offline, real tools included.
+
+Usage: python -m benchmarks.ws_load [--url ws://127.0.0.1:8000 | --serve] [--sessions 20] [--seconds 30]
+       [--proto binary] [--codec mulaw] [--speech 0.4] [--venue load]
+       DEMO_AGENT_MODEL=scripted python -m benchmarks.ws_load --serve --sessions 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import math
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import websockets
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.append(str(APP_DIR))
+
+from audio_codec import CODECS, from_pcm16  # noqa: E402
+from wire_protocol import pack_frame  # noqa: E402
+
+RATE = 16000
+FRAME_SECONDS = 0.02
+FRAME_SAMPLES = int(RATE * FRAME_SECONDS)
+
+
+@dataclass
+class SessionStats:
+    connect_ms: Optional[float] = None
+    frames_sent: int = 0
+    send_lag_ms: List[float] = field(default_factory=list)
+    first_message_ms: Optional[float] = None
+    messages: int = 0
+    bytes_received: int = 0
+    error: Optional[str] = None
+
+
+def synthetic_mic(seconds: float, speech: float, seed: int) -> List[bytes]:
+    """20 ms PCM16 frames: voiced bursts (a quarter to one second) for ``speech`` of the time, else quiet noise."""
+    rng = np.random.default_rng(seed)
+    frames: List[bytes] = []
+    total = int(seconds / FRAME_SECONDS)
+    t = np.arange(FRAME_SAMPLES) / RATE
+    while len(frames) < total:
+        voiced = rng.random() < speech
+        for _ in range(int(rng.integers(12, 50))):
+            if voiced:
+                tone = 0.3 * np.sin(2 * np.pi * rng.uniform(120, 260) * (t + len(frames) * FRAME_SECONDS))
+                signal = tone + 0.03 * rng.standard_normal(FRAME_SAMPLES)
+            else:
+                signal = 0.002 * rng.standard_normal(FRAME_SAMPLES)
+            frames.append((signal * 32767).astype("<i2").tobytes())
+    return frames[:total]
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+async def run_session(index: int, args: argparse.Namespace, stats: SessionStats) -> None:
+    await asyncio.sleep(args.ramp * index / max(1, args.sessions))
+    url = (
+        f"{args.url.rstrip('/')}/ws/{args.prefix}-{index}?is_audio=true"
+        f"&proto={args.proto}&codec={args.codec}&venue={args.venue}"
+    )
+    frames = synthetic_mic(args.seconds, args.speech, seed=index)
+    codec = CODECS[args.codec]
+    started = time.perf_counter()
+    try:
+        async with websockets.connect(url, max_size=None, open_timeout=args.timeout) as ws:
+            stats.connect_ms = (time.perf_counter() - started) * 1e3
+            first_send = time.perf_counter()
+
+            async def receive() -> None:
+                async for message in ws:
+                    if stats.first_message_ms is None:
+                        stats.first_message_ms = (time.perf_counter() - first_send) * 1e3
+                    stats.messages += 1
+                    stats.bytes_received += len(message)
+
+            receiver = asyncio.create_task(receive())
+            try:
+                for sequence, pcm in enumerate(frames):
+                    due = first_send + sequence * FRAME_SECONDS
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    stats.send_lag_ms.append(max(0.0, time.perf_counter() - due) * 1e3)
+                    if args.proto == "binary":
+                        await ws.send(pack_frame(from_pcm16(pcm, codec), sequence, codec=codec))
+                    else:
+                        await ws.send(json.dumps({"mime_type": "audio/pcm", "data": base64.b64encode(pcm).decode()}))
+                    stats.frames_sent += 1
+                # Let replies to the last utterance arrive before hanging up.
+                await asyncio.sleep(args.linger)
+            finally:
+                receiver.cancel()
+                await asyncio.gather(receiver, return_exceptions=True)
+    except Exception as exc:  # counted per type in the report
+        stats.error = type(exc).__name__
+
+
+def report(all_stats: List[SessionStats], args: argparse.Namespace, wall: float) -> None:
+    connected = [s for s in all_stats if s.connect_ms is not None]
+    lags = [lag for s in all_stats for lag in s.send_lag_ms]
+    firsts = [s.first_message_ms for s in all_stats if s.first_message_ms is not None]
+    frames = sum(s.frames_sent for s in all_stats)
+    errors = Counter(s.error for s in all_stats if s.error)
+    print(f"{args.sessions} sessions, {args.seconds:g} s of audio each, proto={args.proto} codec={args.codec}, "
+          f"speech {args.speech:.0%}")
+    print(f"connected {len(connected)}/{len(all_stats)}; connect ms p50 {_percentile([s.connect_ms for s in connected], 50):.1f} "
+          f"p95 {_percentile([s.connect_ms for s in connected], 95):.1f}")
+    print(f"frames sent {frames} ({frames / wall:.0f}/s); client send lag ms p50 {_percentile(lags, 50):.2f} "
+          f"p99 {_percentile(lags, 99):.2f} max {max(lags, default=math.nan):.2f}")
+    print(f"server messages {sum(s.messages for s in all_stats)} ({sum(s.bytes_received for s in all_stats) / 1e6:.2f} MB); "
+          f"sessions with a reply {len(firsts)}, first reply ms p50 {_percentile(firsts, 50):.0f}"
+          + (f" mean {statistics.fmean(firsts):.0f}" if firsts else ""))
+    if errors:
+        print("errors: " + ", ".join(f"{name} x{count}" for name, count in errors.most_common()))
+
+
+def serve_in_process() -> str:
+    """Start app/main.py with uvicorn on a free port in a daemon thread; return its ws:// URL."""
+    import uvicorn
+
+    os.chdir(APP_DIR)  # main.py serves static files relative to the working directory
+    import main
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"ws://127.0.0.1:{port}"
+
+
+async def run(args: argparse.Namespace) -> None:
+    all_stats = [SessionStats() for _ in range(args.sessions)]
+    started = time.perf_counter()
+    await asyncio.gather(*(run_session(i, args, stats) for i, stats in enumerate(all_stats)))
+    report(all_stats, args, time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="ws://127.0.0.1:8000")
+    parser.add_argument("--serve", action="store_true", help="start the app in-process instead of using --url")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which sessions connect")
+    parser.add_argument("--linger", type=float, default=2.0, help="seconds to keep reading after the last frame")
+    parser.add_argument("--proto", choices=("json", "binary"), default="binary")
+    parser.add_argument("--codec", choices=sorted(CODECS), default="pcm16")
+    parser.add_argument("--speech", type=float, default=0.4, help="share of frames that are voiced")
+    parser.add_argument("--venue", default="load")
+    parser.add_argument("--prefix", default="load", help="user id prefix; session i is <prefix>-<i>")
+    parser.add_argument("--timeout", type=float, default=10.0, help="connect timeout in seconds")
+    args = parser.parse_args()
+    if args.serve:
+        args.url = serve_in_process()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
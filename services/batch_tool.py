@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from google.adk.tools.function_tool import FunctionTool
+
+from services.state_registry import run_transaction_async
+
+
+async def _apply_batch(operations: List[Dict[str, Any]], all_or_nothing: bool = True) -> dict:
+    """
+    Apply several seating, checkout, waitlist or booking changes at once (e.g. a tour group).
+
+    operations: list of {"op": ..., plus that op's fields}:
+      - {"op": "add_guest", "name", "party_size", "action"?: "auto" | "check_in" | "waitlist", "table_id"?}
+      - {"op": "checkout", "table_id"}
+      - {"op": "update_table", "table_id", "guest_name"}
+      - {"op": "update_waitlist", "name", "party_size"}
+      - {"op": "remove_waitlist", "name"}
+      - {"op": "book", "name", "party_size", "start" (ISO time), "minutes"?}
+      - {"op": "cancel_reservation" | "seat_reservation", "reservation_id"}
+    all_or_nothing: undo every change if any operation fails (default); false keeps the ones that succeeded.
+
+    Returns one result per operation, in order.
+    """
+    return await run_transaction_async(lambda manager: manager.apply_batch(operations, all_or_nothing))
+
+
+batch_tool = FunctionTool(_apply_batch)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import datetime
+from typing import Optional
+
+from google.adk.tools.function_tool import FunctionTool
+
+from services.state_registry import run_transaction_async
+
+
+async def _book_table(
+    action: str,
+    name: str = "",
+    party_size: int = 0,
+    time: str = "",
+    duration_minutes: Optional[int] = None,
+    reservation_id: str = "",
+) -> dict:
+    """
+    Manage future table reservations.
+
+    action: "find_slot" (earliest bookable time at or after `time`), "book",
+            "cancel", "seat" (the booked party has arrived) or "list"
+    name: guest name (for "book")
+    party_size: number of guests (for "find_slot" and "book")
+    time: "HH:MM" today (tomorrow if already past) or an ISO date-time
+    duration_minutes: optional booking length; defaults to the expected dining time
+    reservation_id: required for "cancel" and "seat"
+    """
+    return await run_transaction_async(
+        lambda manager: _apply_booking(manager, action, name, party_size, time, duration_minutes, reservation_id)
+    )
+
+
+def _parse_time(value: str, now: datetime.datetime) -> datetime.datetime:
+    if not value:
+        return now
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        clock = datetime.datetime.strptime(value.strip(), "%H:%M").time()
+        at = datetime.datetime.combine(now.date(), clock)
+        return at if at >= now else at + datetime.timedelta(days=1)
+
+
+def _apply_booking(
+    manager,
+    action: str,
+    name: str,
+    party_size: int,
+    time: str,
+    duration_minutes: Optional[int],
+    reservation_id: str,
+) -> dict:
+    if action == "list":
+        return {"success": True, "reservations": manager.upcoming_reservations()}
+    if action in ("cancel", "seat"):
+        if not reservation_id:
+            return {"success": False, "message": "reservation_id is required."}
+        if action == "cancel":
+            return manager.cancel_reservation(reservation_id)
+        return manager.seat_reservation(reservation_id)
+
+    if party_size <= 0:
+        return {"success": False, "message": "party_size is required."}
+    try:
+        at = _parse_time(time, manager.clock())
+    except ValueError:
+        return {"success": False, "message": "Use HH:MM or an ISO date-time for time."}
+
+    if action == "find_slot":
+        slot = manager.find_reservation_slot(party_size, at, duration_minutes)
+        if slot is None:
+            return {"success": False, "message": f"No table seats a party of {party_size}."}
+        start, table = slot
+        return {"success": True, "start": start.isoformat(timespec="minutes"), "table": table.table_id}
+    if action == "book":
+        if not name:
+            return {"success": False, "message": "name is required to book."}
+        return manager.add_reservation(name, party_size, at.isoformat(), duration_minutes)
+
+    return {"success": False, "message": "Invalid action. Use find_slot, book, cancel, seat or list."}
+
+
+book_table_tool = FunctionTool(_book_table)
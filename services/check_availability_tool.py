@@ -2,22 +2,23 @@ from __future__ import annotations
 
 from google.adk.tools.function_tool import FunctionTool
 
-from services.state_registry import get_current_manager
+from services.state_registry import get_current_manager_async
 
 
-def _check_availability(party_size: int) -> dict:
+async def _check_availability(party_size: int) -> dict:
     """
     Check for a free table that can seat the given party size.
 
-    Returns table metadata if available, otherwise a message indicating no table is free.
+    Returns table metadata if available (a "combined" entry listing the tables
+    when adjacent tables would be joined), otherwise a message indicating no table is free.
     """
-    manager = get_current_manager()
-    table = manager.check_availability(party_size=party_size)
-    if table:
+    manager = await get_current_manager_async()
+    plan = manager.find_seating(party_size=party_size)
+    if plan:
         return {
             "available": True,
-            "table": table.to_dict(),
-            "note": "Table is free and can be assigned.",
+            "table": plan.to_dict(),
+            "note": "Tables are free and can be joined for this party." if plan.combined else "Table is free and can be assigned.",
         }
     return {
         "available": False,
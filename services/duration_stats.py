@@ -0,0 +1,173 @@
+"""Constant-memory online statistics of how long parties occupy tables."""
+
+from __future__ import annotations
+
+from bisect import insort
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# (table_type, party_size); party_size None aggregates every party at that table type
+DurationKey = Tuple[str, Optional[int]]
+
+
+class P2Quantile:
+    """
+    Streaming estimate of one quantile with the P-square algorithm (Jain and
+    Chlamtac): five markers whose heights are adjusted by piecewise-parabolic
+    interpolation, so each sample costs O(1) time and memory stays fixed.
+    """
+
+    __slots__ = ("q", "heights", "positions", "desired", "increments")
+
+    def __init__(self, q: float) -> None:
+        self.q = q
+        self.heights: List[float] = []  # the first five samples, sorted, then the marker heights
+        self.positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.desired = [1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0]
+        self.increments = [0.0, q / 2, q, (1 + q) / 2, 1.0]
+
+    @property
+    def count(self) -> int:
+        return len(self.heights) if len(self.heights) < 5 else int(self.positions[4])
+
+    def add(self, x: float) -> None:
+        h = self.heights
+        if len(h) < 5:
+            insort(h, x)
+            return
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if h[i] <= x < h[i + 1])
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = h[i] + step / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not h[i - 1] < candidate < h[i + 1]:
+                    candidate = h[i] + step * (h[i + step] - h[i]) / (n[i + step] - n[i])
+                h[i] = candidate
+                n[i] += step
+
+    def value(self) -> Optional[float]:
+        h = self.heights
+        if not h:
+            return None
+        if len(h) < 5:
+            return h[min(len(h) - 1, int(self.q * len(h)))]
+        return h[2]
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"q": self.q, "heights": list(self.heights), "positions": list(self.positions), "desired": list(self.desired)}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "P2Quantile":
+        sketch = cls(state["q"])
+        sketch.heights = list(state["heights"])
+        sketch.positions = list(state["positions"])
+        sketch.desired = list(state["desired"])
+        return sketch
+
+
+@dataclass(slots=True)
+class _Series:
+    quantile: P2Quantile
+    count: int = 0
+    ewma: float = 0.0
+
+
+@dataclass
+class DurationStats:
+    """
+    Occupancy durations (minutes) keyed by table type and party size.
+
+    Each key keeps an EWMA that follows tonight's pace and a P-square sketch
+    of the ``quantile``-th duration. A sample is clipped to ``clip`` times
+    the current quantile before it enters the EWMA, so a table nobody checked
+    out cannot drag the estimate up. ``expected`` is a dict lookup: rounded
+    estimates are refreshed on ``record``, falling back from (type, size) to
+    the table type and then to the caller's default while a key has fewer
+    than ``min_samples`` samples. ``version`` changes only when some rounded
+    estimate does, so dependent caches (the ETA engine) rebuild rarely.
+    """
+
+    alpha: float = 0.1
+    quantile: float = 0.5
+    min_samples: int = 5
+    clip: float = 2.0
+    min_minutes: float = 1.0  # shorter stays are check-in mistakes, not meals
+    version: int = field(default=0, init=False)
+    _series: Dict[DurationKey, _Series] = field(default_factory=dict, init=False, repr=False)
+    _expected: Dict[DurationKey, int] = field(default_factory=dict, init=False, repr=False)
+
+    def record(self, table_type: str, party_size: int, minutes: float) -> None:
+        if minutes < self.min_minutes:
+            return
+        for key in ((table_type, party_size), (table_type, None)):
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(P2Quantile(self.quantile))
+            typical = series.quantile.value()
+            clipped = minutes if typical is None or series.count < self.min_samples else min(minutes, self.clip * typical)
+            series.ewma = clipped if series.count == 0 else series.ewma + self.alpha * (clipped - series.ewma)
+            series.count += 1
+            series.quantile.add(minutes)
+            self._refresh(key, series)
+
+    def expected(self, table_type: str, party_size: Optional[int], default: int) -> int:
+        """Expected whole minutes a party of ``party_size`` stays at a ``table_type`` table."""
+        minutes = self._expected.get((table_type, party_size))
+        if minutes is None:
+            minutes = self._expected.get((table_type, None), default)
+        return minutes
+
+    def quantile_minutes(self, table_type: str, party_size: Optional[int] = None) -> Optional[float]:
+        series = self._series.get((table_type, party_size))
+        return None if series is None else series.quantile.value()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-key count, EWMA and quantile, e.g. for logs or an admin endpoint."""
+        return {
+            f"{table_type}/{'all' if size is None else size}": {
+                "count": series.count,
+                "ewma": round(series.ewma, 1),
+                f"p{round(self.quantile * 100)}": series.quantile.value(),
+            }
+            for (table_type, size), series in sorted(self._series.items(), key=lambda item: (item[0][0], item[0][1] or 0))
+        }
+
+    def _refresh(self, key: DurationKey, series: _Series) -> None:
+        if series.count < self.min_samples:
+            return
+        minutes = max(1, round(series.ewma))
+        if self._expected.get(key) != minutes:
+            self._expected[key] = minutes
+            self.version += 1
+
+    # --- Persistence (rides along in HotelManager.to_state) ---------------------------
+    def to_state(self) -> List[Dict[str, Any]]:
+        return [
+            {"type": table_type, "size": size, "count": s.count, "ewma": s.ewma, "quantile": s.quantile.to_state()}
+            for (table_type, size), s in self._series.items()
+        ]
+
+    def load_state(self, state: List[Dict[str, Any]]) -> None:
+        self._series = {}
+        self._expected = {}
+        for item in state:
+            key = (item["type"], item["size"])
+            series = self._series[key] = _Series(P2Quantile.from_state(item["quantile"]), item["count"], item["ewma"])
+            self._refresh(key, series)
+        self.version += 1
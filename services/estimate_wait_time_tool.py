@@ -2,11 +2,11 @@ from __future__ import annotations
 
 from google.adk.tools.function_tool import FunctionTool
 
-from services.state_registry import get_current_manager
+from services.state_registry import get_current_manager_async
 
 
-def _estimate_wait_time(party_size: int) -> dict:
-    manager = get_current_manager()
+async def _estimate_wait_time(party_size: int) -> dict:
+    manager = await get_current_manager_async()
     eta = manager.estimate_wait_time(party_size=party_size)
     return {
         "party_size": party_size,
@@ -0,0 +1,234 @@
+"""Incremental ETA engine shared by HotelManager.get_status and estimate_wait_time."""
+
+from __future__ import annotations
+
+import datetime
+import heapq
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+# Free tables sort ahead of every occupied one; their effective free time is "now".
+READY = datetime.datetime.min
+
+# (projected_free_time, ordinal, table_id, stamp). Simulated entries use stamp -1.
+_HeapItem = Tuple[datetime.datetime, int, str, int]
+
+
+@dataclass
+class _Projection:
+    """Result of seating the waitlist in order against the projected free times."""
+
+    version: int
+    as_of: datetime.datetime
+    seat_times: List[Optional[datetime.datetime]] = field(default_factory=list)
+    heaps: Dict[int, List[_HeapItem]] = field(default_factory=dict)  # copy-on-write
+    moved: Dict[str, datetime.datetime] = field(default_factory=dict)  # table id -> projected free time
+    # Tables seated as part of a joined group: a join does not pop their items
+    # off the heaps, so only the one at their ``moved`` time is live.
+    joined: Set[str] = field(default_factory=set)
+
+    def scratch(self) -> "_Projection":
+        """A copy to try one more party against without touching the cached projection."""
+        return _Projection(
+            self.version,
+            self.as_of,
+            heaps={seats: list(heap) for seats, heap in self.heaps.items()},
+            moved=dict(self.moved),
+            joined=set(self.joined),
+        )
+
+
+class EtaEngine:
+    """
+    Per-capacity min-heaps of projected table free times.
+
+    Tables are pushed as they are assigned or freed (stale heap items are
+    skipped lazily), so the base state is updated in O(log n) per mutation.
+    Waitlist ETAs come from a projection that seats each entry at the earliest
+    table that fits; it is cached per version, extended in place when entries
+    are appended, and rebuilt only after removals, edits or table changes.
+
+    ``reserved(table_id, party_size, start)`` returns when a table is next
+    usable if seating the party there at ``start`` would run into a
+    reservation (None if it would not). A table it blocks is pushed back past
+    the reservation in the projection, for that and every later party, which
+    errs towards longer quotes.
+
+    ``combos(party_size)`` lists the groups of table ids that may be joined to
+    seat a party no single table fits (as ``SeatingOptimizer`` would). Such a
+    party is projected onto the group whose tables are all free soonest.
+    """
+
+    def __init__(
+        self,
+        dining_minutes: int,
+        resolution_seconds: float = 1.0,
+        duration: Optional[Callable[[str, int], datetime.timedelta]] = None,
+        reserved: Optional[Callable[[str, int, datetime.datetime], Optional[datetime.datetime]]] = None,
+        combos: Optional[Callable[[int], Sequence[Sequence[str]]]] = None,
+    ) -> None:
+        self.dining_minutes = dining_minutes
+        self.dining = datetime.timedelta(minutes=dining_minutes)
+        # (table_id, party_size) -> how long a projected party holds that table
+        self._duration = duration or (lambda table_id, party_size: self.dining)
+        self._reserved = reserved
+        self._combos = combos
+        self.resolution = datetime.timedelta(seconds=resolution_seconds)
+        self._heaps: Dict[int, List[_HeapItem]] = {}
+        self._capacities: List[int] = []
+        self._stamps: Dict[str, int] = {}
+        self._tables: Dict[str, _HeapItem] = {}  # table id -> its live heap item
+        self._seats: Dict[str, int] = {}
+        self._next_stamp = 0
+        self._version = 0
+        self._projection: Optional[_Projection] = None
+
+    # --- Base state -------------------------------------------------------------
+    def table_free(self, table_id: str, seats: int, ordinal: int) -> None:
+        self._push(table_id, seats, ordinal, READY)
+
+    def table_busy(self, table_id: str, seats: int, ordinal: int, free_at: datetime.datetime) -> None:
+        self._push(table_id, seats, ordinal, free_at)
+
+    def invalidate(self) -> None:
+        """Drop the waitlist projection (entries removed, reordered or edited)."""
+        self._version += 1
+        self._projection = None
+
+    def _push(self, table_id: str, seats: int, ordinal: int, free_at: datetime.datetime) -> None:
+        heap = self._heaps.get(seats)
+        if heap is None:
+            heap = self._heaps[seats] = []
+            self._capacities.insert(bisect_left(self._capacities, seats), seats)
+        stamp = self._next_stamp
+        self._next_stamp += 1
+        self._stamps[table_id] = stamp
+        self._seats[table_id] = seats
+        item = self._tables[table_id] = (free_at, ordinal, table_id, stamp)
+        heapq.heappush(heap, item)
+        if len(heap) > 2 * len(self._stamps) + 16:
+            heap[:] = [item for item in heap if self._is_live(item)]
+            heapq.heapify(heap)
+        self.invalidate()
+
+    def _is_live(self, item: _HeapItem, projection: Optional[_Projection] = None) -> bool:
+        if projection is not None and projection.joined and item[2] in projection.joined:
+            return item[3] < 0 and item[0] == projection.moved[item[2]]
+        return item[3] < 0 or self._stamps.get(item[2]) == item[3]
+
+    # --- Queries ----------------------------------------------------------------
+    def waitlist_etas(self, party_sizes: Sequence[int], now: datetime.datetime) -> List[Optional[int]]:
+        """Minutes until each waitlist entry is seated, in order (None = no table fits)."""
+        projection = self._project(party_sizes, now)
+        return [self._minutes(seat_time, projection.as_of) for seat_time in projection.seat_times]
+
+    def estimate(self, party_sizes: Sequence[int], party_size: int, now: datetime.datetime) -> Optional[int]:
+        """Minutes until a new party joining behind ``party_sizes`` would be seated."""
+        projection = self._project(party_sizes, now)
+        # A scratch copy: reservations push tables back in the projection while choosing.
+        return self._minutes(self._seat(projection.scratch(), party_size, commit=False), projection.as_of)
+
+    @staticmethod
+    def _minutes(seat_time: Optional[datetime.datetime], now: datetime.datetime) -> Optional[int]:
+        if seat_time is None:
+            return None
+        return max(0, int((seat_time - now).total_seconds() / 60))
+
+    def _project(self, party_sizes: Sequence[int], now: datetime.datetime) -> _Projection:
+        projection = self._projection
+        if (
+            projection is None
+            or projection.version != self._version
+            or len(projection.seat_times) > len(party_sizes)
+            or not (datetime.timedelta(0) <= now - projection.as_of < self.resolution)
+        ):
+            projection = self._projection = _Projection(version=self._version, as_of=now)
+        for size in party_sizes[len(projection.seat_times):]:
+            projection.seat_times.append(self._seat(projection, size))
+        return projection
+
+    def _choose(
+        self, projection: _Projection, party_size: int, now: datetime.datetime
+    ) -> Optional[Tuple[int, _HeapItem]]:
+        best: Optional[Tuple[int, _HeapItem]] = None
+        best_key: Optional[Tuple[datetime.datetime, int]] = None
+        for seats in self._capacities[bisect_left(self._capacities, party_size):]:
+            heap = projection.heaps.get(seats, self._heaps[seats])
+            while heap and not self._is_live(heap[0], projection):
+                heapq.heappop(heap)
+            if not heap:
+                continue
+            top = heap[0]
+            if self._reserved is not None:
+                until = self._reserved(top[2], party_size, max(top[0], now))
+                while until is not None:
+                    heap = self._own(projection, seats)
+                    heapq.heapreplace(heap, (until, top[1], top[2], -1))
+                    projection.moved[top[2]] = until
+                    while not self._is_live(heap[0], projection):
+                        heapq.heappop(heap)
+                    top = heap[0]
+                    until = self._reserved(top[2], party_size, max(top[0], now))
+            key = (max(top[0], now), top[1])
+            if best_key is None or key < best_key:
+                best, best_key = (seats, top), key
+        return best
+
+    def _choose_combo(
+        self, projection: _Projection, party_size: int, now: datetime.datetime
+    ) -> Optional[Tuple[datetime.datetime, Tuple[_HeapItem, ...]]]:
+        # The group whose tables are all free (and clear of reservations) soonest;
+        # ties like SeatingOptimizer: fewest wasted seats, then fewest tables.
+        best: Optional[Tuple[datetime.datetime, Tuple[_HeapItem, ...]]] = None
+        best_key = None
+        for group in self._combos(party_size) if self._combos is not None else ():
+            members = tuple(self._projected(projection, table_id) for table_id in group)
+            if any(item is None for item in members):
+                continue
+            start = max(max(item[0] for item in members), now)
+            blocked = self._reserved is not None
+            while blocked:
+                blocked = False
+                for item in members:
+                    until = self._reserved(item[2], party_size, start)
+                    if until is not None and until > start:
+                        start, blocked = until, True
+            key = (start, sum(self._seats[item[2]] for item in members), len(members), sorted(group))
+            if best_key is None or key < best_key:
+                best, best_key = (start, members), key
+        return best
+
+    def _projected(self, projection: _Projection, table_id: str) -> Optional[_HeapItem]:
+        item = self._tables.get(table_id)
+        if item is None or table_id not in projection.moved:
+            return item
+        return (projection.moved[table_id], item[1], table_id, -1)
+
+    def _own(self, projection: _Projection, seats: int) -> List[_HeapItem]:
+        heap = projection.heaps.get(seats)
+        if heap is None:
+            heap = projection.heaps[seats] = list(self._heaps[seats])
+        return heap
+
+    def _seat(self, projection: _Projection, party_size: int, commit: bool = True) -> Optional[datetime.datetime]:
+        choice = self._choose(projection, party_size, projection.as_of)
+        if choice is None:
+            combo = self._choose_combo(projection, party_size, projection.as_of)
+            if combo is None:
+                return None
+            seat_time, members = combo
+            for item in members if commit else ():
+                free_at = seat_time + self._duration(item[2], party_size)
+                projection.moved[item[2]] = free_at
+                projection.joined.add(item[2])
+                heapq.heappush(self._own(projection, self._seats[item[2]]), (free_at, item[1], item[2], -1))
+            return seat_time
+        seats, top = choice
+        seat_time = max(top[0], projection.as_of)
+        if not commit:
+            return seat_time
+        free_at = seat_time + self._duration(top[2], party_size)
+        heapq.heapreplace(self._own(projection, seats), (free_at, top[1], top[2], -1))
+        projection.moved[top[2]] = free_at
+        return seat_time
@@ -2,14 +2,14 @@ from __future__ import annotations
 
 from google.adk.tools.function_tool import FunctionTool
 
-from services.state_registry import get_current_manager
+from services.state_registry import get_current_manager_async
 
 
-def _get_status() -> dict:
+async def _get_status() -> dict:
     """
     Return current table status and waitlist with ETAs.
     """
-    manager = get_current_manager()
+    manager = await get_current_manager_async()
     return manager.get_status()
 
 
@@ -1,46 +1,335 @@
 from __future__ import annotations
 
+from bisect import bisect_left, insort
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Dict, Any, Sequence, Set, Tuple
+from typing import get_args, get_origin, get_type_hints
 import datetime
+import functools
+import hashlib
+import inspect
+import json
+import logging
 
+from services.duration_stats import DurationStats
+from services.eta_engine import EtaEngine
+from services.reservations import Reservation, ReservationBook
+from services.seating import COMBO_SEPARATOR, Adjacency, Availability, SeatingOptimizer, SeatingPlan
+from services.waitlist import Waitlist, WaitlistEntry
 
-@dataclass
+if TYPE_CHECKING:
+    from services.journal import Journal
+
+
+# Table status codes; the API still speaks the names.
+FREE, OCCUPIED = 0, 1
+STATUS_NAMES = ("free", "occupied")
+_STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+
+@functools.lru_cache(maxsize=4096)
+def _isoformat(epoch: float) -> str:
+    # Seating times repeat across every status build until the table turns over.
+    return datetime.datetime.fromtimestamp(epoch).isoformat()
+
+
+@dataclass(slots=True)
 class Table:
     table_id: str
     seats: int
     table_type: str
-    status: str = "free"
+    status_code: int = FREE
     guest_name: Optional[str] = None
-    assigned_time: Optional[datetime.datetime] = None # New attribute
+    assigned_at: Optional[float] = None  # epoch seconds
+    combo: Optional[str] = None  # id of the joined seating ("T4-1+T4-2") this table is part of
+    party_size: Optional[int] = None  # guests seated, when known
+
+    @property
+    def status(self) -> str:
+        return STATUS_NAMES[self.status_code]
+
+    @status.setter
+    def status(self, value: str) -> None:
+        self.status_code = _STATUS_CODES[value]
+
+    @property
+    def assigned_time(self) -> Optional[datetime.datetime]:
+        return None if self.assigned_at is None else datetime.datetime.fromtimestamp(self.assigned_at)
+
+    @assigned_time.setter
+    def assigned_time(self, value: Optional[datetime.datetime]) -> None:
+        self.assigned_at = None if value is None else value.timestamp()
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        data = {
             "id": self.table_id,
             "seats": self.seats,
             "type": self.table_type,
-            "status": self.status,
+            "status": STATUS_NAMES[self.status_code],
             "guest_name": self.guest_name,
-            "assigned_time": self.assigned_time.isoformat() if self.assigned_time else None,
+            "assigned_time": None if self.assigned_at is None else _isoformat(self.assigned_at),
         }
+        if self.combo is not None:
+            data["combo"] = self.combo
+        if self.party_size is not None:
+            data["party_size"] = self.party_size
+        return data
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Table":
+        assigned = data.get("assigned_time")
+        return cls(
+            table_id=data["id"],
+            seats=data["seats"],
+            table_type=data["type"],
+            status_code=_STATUS_CODES[data.get("status", "free")],
+            guest_name=data.get("guest_name"),
+            assigned_at=datetime.datetime.fromisoformat(assigned).timestamp() if assigned else None,
+            combo=data.get("combo"),
+            party_size=data.get("party_size"),
+        )
+
+
+class TableIndex:
+    """
+    Lookup structures over a floor plan.
+
+    Keeps an id -> table map plus the free tables bucketed by seat count, so
+    lookups are O(1) and best-fit availability is O(log n). Within a bucket,
+    free tables are kept in floor-plan order so ties resolve the same way the
+    old first-fit scan did.
+    """
+
+    def __init__(self, tables: Iterable[Table] = ()) -> None:
+        self.rebuild(tables)
+
+    def rebuild(self, tables: Iterable[Table]) -> None:
+        self._tables: List[Table] = list(tables)
+        self._by_id: Dict[str, Table] = {}
+        self._ordinal: Dict[str, int] = {}
+        self._free: Dict[int, List[int]] = {}  # seats -> sorted ordinals of free tables
+        self._free_sizes: List[int] = []  # sorted seat counts with at least one free table
+        for ordinal, table in enumerate(self._tables):
+            self._by_id[table.table_id] = table
+            self._ordinal[table.table_id] = ordinal
+            if table.status_code == FREE:
+                self._add_free(table.seats, ordinal)
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def __iter__(self) -> Iterator[Table]:
+        return iter(self._tables)
+
+    def get(self, table_id: str) -> Optional[Table]:
+        return self._by_id.get(table_id)
+
+    def ordinal(self, table: Table) -> int:
+        return self._ordinal[table.table_id]
+
+    def add(self, table: Table) -> None:
+        if table.table_id in self._by_id:
+            raise ValueError(f"Duplicate table id: {table.table_id}")
+        ordinal = len(self._tables)
+        self._tables.append(table)
+        self._by_id[table.table_id] = table
+        self._ordinal[table.table_id] = ordinal
+        if table.status_code == FREE:
+            self._add_free(table.seats, ordinal)
+
+    def mark_free(self, table: Table) -> None:
+        ordinal = self._ordinal[table.table_id]
+        bucket = self._free.get(table.seats)
+        if bucket:
+            idx = bisect_left(bucket, ordinal)
+            if idx < len(bucket) and bucket[idx] == ordinal:
+                return
+        self._add_free(table.seats, ordinal)
+
+    def mark_occupied(self, table: Table) -> None:
+        ordinal = self._ordinal[table.table_id]
+        bucket = self._free.get(table.seats)
+        if not bucket:
+            return
+        idx = bisect_left(bucket, ordinal)
+        if idx == len(bucket) or bucket[idx] != ordinal:
+            return
+        del bucket[idx]
+        if not bucket:
+            del self._free[table.seats]
+            del self._free_sizes[bisect_left(self._free_sizes, table.seats)]
+
+    def best_fit(self, party_size: int) -> Optional[Table]:
+        """Smallest free table that seats the party, earliest in floor-plan order."""
+        idx = bisect_left(self._free_sizes, party_size)
+        if idx == len(self._free_sizes):
+            return None
+        return self._tables[self._free[self._free_sizes[idx]][0]]
+
+    def iter_free(self, party_size: int) -> Iterator[Table]:
+        """Free tables that seat the party, in best-fit order (smallest first, then floor-plan order)."""
+        for seats in self._free_sizes[bisect_left(self._free_sizes, party_size):]:
+            for ordinal in self._free[seats]:
+                yield self._tables[ordinal]
+
+    def free_by_size(self, party_size: int) -> List[Table]:
+        """The first free table of each seat count that fits the party, smallest first."""
+        return [
+            self._tables[self._free[seats][0]]
+            for seats in self._free_sizes[bisect_left(self._free_sizes, party_size):]
+        ]
+
+    def free_counts(self) -> Dict[int, int]:
+        return {seats: len(self._free[seats]) for seats in self._free_sizes}
+
+    @staticmethod
+    def is_free(table: Table) -> bool:
+        return table.status_code == FREE
+
+    def _add_free(self, seats: int, ordinal: int) -> None:
+        bucket = self._free.get(seats)
+        if bucket is None:
+            self._free[seats] = [ordinal]
+            insort(self._free_sizes, seats)
+        else:
+            insort(bucket, ordinal)
+
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    """Serialized ``get_status`` payload, valid for one generation until ``expires_at``."""
+
+    generation: int
+    etag: str
+    body: bytes
+    expires_at: Optional[datetime.datetime]
+
+
+# Receives {"generation", "tables" (changed ids), "waitlist" (bool), "events"} after each mutation.
+ChangeListener = Callable[[Dict[str, Any]], None]
+
+_JOURNALED_OPS: Set[str] = set()
+
+# apply_batch item "op" -> HotelManager method; the other keys of an item are its keyword arguments.
+BATCH_OPS: Dict[str, str] = {
+    "add_guest": "place_guest",
+    "checkout": "checkout_and_fill_waitlist",
+    "update_table": "update_table_assignment",
+    "update_waitlist": "update_waitlist_entry",
+    "remove_waitlist": "remove_from_waitlist",
+    "book": "add_reservation",
+    "cancel_reservation": "cancel_reservation",
+    "seat_reservation": "seat_reservation",
+}
 
-@dataclass
-class WaitlistEntry:
-    name: str
-    party_size: int
+
+def _journaled(method):
+    """Record calls of a mutating method that changed state in the attached journal."""
+    op = method.__name__
+    signature = inspect.signature(method)
+    _JOURNALED_OPS.add(op)
+
+    @functools.wraps(method)
+    def wrapper(self: "HotelManager", *args, **kwargs):
+        journal = self._journal
+        if journal is None or self._frozen_now is not None:  # not journaling, nested, or replaying
+            return method(self, *args, **kwargs)
+        generation = self.generation
+        # Freeze the clock so replay reproduces the same assigned_time values.
+        self._frozen_now = self.clock()
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            at, self._frozen_now = self._frozen_now, None
+        if self.generation != generation:
+            # Defaults are recorded too, so replay does not depend on later changes to them.
+            call = signature.bind(self, *args, **kwargs)
+            call.apply_defaults()
+            bound = {name: value for name, value in call.arguments.items() if name != "self"}
+            journal.append(
+                op, {name: value.to_dict() if isinstance(value, Table) else value for name, value in bound.items()}, at
+            )
+            if journal.snapshot_due:
+                journal.snapshot(self.to_state())
+        return result
+
+    return wrapper
+
+
+@functools.lru_cache(maxsize=None)
+def _batch_hints(method: str) -> Dict[str, Any]:
+    hints = get_type_hints(getattr(HotelManager, method))
+    hints.pop("return", None)
+    return hints
+
+
+def _fits(value: Any, hint: Any) -> bool:
+    """Whether a JSON value matches a batch op's parameter annotation (str, int, Optional, List)."""
+    if hint is Any:
+        return True
+    origin = get_origin(hint)
+    if origin is None:
+        if hint is int:
+            return isinstance(value, int) and not isinstance(value, bool)
+        return isinstance(value, hint)
+    if origin in (list, List):
+        (item,) = get_args(hint)
+        return isinstance(value, list) and all(_fits(v, item) for v in value)
+    return any(_fits(value, option) for option in get_args(hint))  # Optional / Union
+
+
+def _batch_argument_error(method: str, arguments: Dict[str, Any]) -> Optional[str]:
+    hints = _batch_hints(method)
+    for name, value in arguments.items():
+        if name in hints and not _fits(value, hints[name]):
+            return f"Bad value for {name!r}: {value!r}."
+    return None
 
 
 @dataclass
 class HotelManager:
     tables: List[Table] = field(default_factory=list)
-    waitlist: List[WaitlistEntry] = field(default_factory=list)
+    waitlist: Waitlist = field(default_factory=Waitlist)
     last_event: Optional[Dict[str, Any]] = None
     default_dining_duration_minutes: int = 50 # New configurable attribute
+    clock: Callable[[], datetime.datetime] = field(default=datetime.datetime.now, repr=False, compare=False)
+    adjacency: Adjacency = field(default_factory=dict)  # tables that can be joined for large parties
+    seating: SeatingOptimizer = field(default_factory=SeatingOptimizer, repr=False, compare=False)
+    # Learned occupancy durations; ETAs fall back to default_dining_duration_minutes while history is sparse.
+    durations: DurationStats = field(default_factory=DurationStats, repr=False, compare=False)
+    reservations: ReservationBook = field(default_factory=ReservationBook, repr=False, compare=False)
+    # Kept clear between a party's expected departure and a reservation, and between bookings.
+    reservation_buffer_minutes: int = 10
+    # Names the session behind a mutation; each event records it as ``session_id``.
+    event_source: Optional[Callable[[], Optional[str]]] = field(default=None, repr=False, compare=False)
+    _index: TableIndex = field(init=False, repr=False, compare=False)
+    _eta_engine: Optional[EtaEngine] = field(default=None, init=False, repr=False, compare=False)
+    _eta_durations_version: int = field(default=-1, init=False, repr=False, compare=False)
+    _stays: Dict[Tuple[str, int], datetime.timedelta] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Distinct second-of-minute phases of reservation starts and ends; None until needed.
+    _reservation_phases: Optional[List[float]] = field(default=None, init=False, repr=False, compare=False)
+    # Bumped on every mutation; cached status snapshots are keyed on it.
+    generation: int = field(default=0, init=False, compare=False)
+    _snapshot: Optional[StatusSnapshot] = field(default=None, init=False, repr=False, compare=False)
+    _listeners: List[ChangeListener] = field(default_factory=list, init=False, repr=False, compare=False)
+    _changed_tables: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    _waitlist_changed: bool = field(default=False, init=False, repr=False, compare=False)
+    _pending_events: List[Dict[str, Any]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _loaded_event: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _journal: Optional[Journal] = field(default=None, init=False, repr=False, compare=False)
+    _frozen_now: Optional[datetime.datetime] = field(default=None, init=False, repr=False, compare=False)
+    _batch_depth: int = field(default=0, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        if self.tables:
-            return
+        if not self.tables:
+            self._build_default_floor()
+        self._index = TableIndex(self.tables)
+        if not isinstance(self.waitlist, Waitlist):
+            self.waitlist = Waitlist(self.waitlist)
+
+    def _build_default_floor(self) -> None:
         # Bar seats
         for i in range(5):
             self.tables.append(Table(f"BAR-{i+1}", 1, "bar"))
@@ -48,103 +337,508 @@ class HotelManager:
         for prefix, count, seats in (("T2", 5, 2), ("T4", 5, 4), ("T6", 1, 6)):
             for i in range(count):
                 self.tables.append(Table(f"{prefix}-{i+1}", seats, "standard"))
+        if not self.adjacency:
+            # Each row of two- and four-tops can be pushed together; the six-top sits at the end of the T4 row.
+            for prefix in ("T2", "T4"):
+                for i in range(1, 5):
+                    self._link(f"{prefix}-{i}", f"{prefix}-{i+1}")
+            self._link("T4-5", "T6-1")
 
     # --- Helpers -----------------------------------------------------------------
+    def _now(self) -> datetime.datetime:
+        return self._frozen_now or self.clock()
+
     def _find_table(self, table_id: str) -> Optional[Table]:
-        return next((t for t in self.tables if t.table_id == table_id), None)
+        return self._index.get(table_id)
+
+    def _link(self, a: str, b: str) -> None:
+        for x, y in ((a, b), (b, a)):
+            neighbors = self.adjacency.setdefault(x, [])
+            if y not in neighbors:
+                neighbors.append(y)
+
+    def _combo_tables(self, table: Table) -> List[Table]:
+        """All tables seated together with ``table`` (just ``table`` unless joined)."""
+        if table.combo is None:
+            return [table]
+        joined = (self._find_table(table_id) for table_id in table.combo.split(COMBO_SEPARATOR))
+        return [t for t in joined if t is not None]
+
+    def _upcoming(self) -> List[int]:
+        return [e.party_size for e in islice(self.waitlist, self.seating.lookahead)]
+
+    def _walk_in_rule(self) -> Availability:
+        """Seating filter that keeps parties seated now off tables reserved before they would leave."""
+        if not self.reservations:
+            return None
+        return lambda table, party_size: self.reserved_soon(table, party_size) is None
+
+    def _free_at(self, table: Table, now: float) -> float:
+        """When ``table`` is expected to be free (``now`` if it already is), in epoch seconds."""
+        if table.status_code == OCCUPIED and table.assigned_at is not None:
+            return max(now, table.assigned_at + self._dining_minutes(table) * 60)
+        return now
+
+    def _touch(self, table: Optional[Table] = None, waitlist: bool = False) -> None:
+        self.generation += 1
+        if table is not None:
+            self._changed_tables.add(table.table_id)
+        self._waitlist_changed = self._waitlist_changed or waitlist
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        """Call ``listener`` with a summary of what changed after each mutation."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: ChangeListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @contextmanager
+    def batch(self) -> Iterator["HotelManager"]:
+        """Group mutations so listeners hear about them once, when the outermost batch ends."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._publish()
+
+    def _publish(self) -> None:
+        if self._batch_depth:
+            return
+        if not (self._changed_tables or self._waitlist_changed or self._pending_events):
+            return
+        change = {
+            "generation": self.generation,
+            "tables": sorted(self._changed_tables),
+            "waitlist": self._waitlist_changed,
+            "events": self._pending_events,
+        }
+        self._changed_tables = set()
+        self._waitlist_changed = False
+        self._pending_events = []
+        for listener in list(self._listeners):
+            try:
+                listener(change)
+            except Exception:
+                logging.getLogger(__name__).exception("Status listener failed")
+
+    def _occupy(
+        self,
+        table: Table,
+        guest_name: str,
+        combo: Optional[str] = None,
+        at: Optional[float] = None,
+        party_size: Optional[int] = None,
+    ) -> None:
+        self._touch(table)
+        table.status_code = OCCUPIED
+        table.guest_name = guest_name
+        table.combo = combo
+        table.party_size = party_size
+        table.assigned_at = self._now().timestamp() if at is None else at
+        self._index.mark_occupied(table)
+        self._sync_eta(table)
+
+    def _release(self, table: Table) -> None:
+        self._touch(table)
+        table.status_code = FREE
+        table.guest_name = None
+        table.assigned_at = None
+        table.combo = None
+        table.party_size = None
+        self._index.mark_free(table)
+        self._sync_eta(table)
+
+    def _dining_minutes(self, table: Table, party_size: Optional[int] = None) -> int:
+        """Expected minutes a party stays at ``table`` (learned, or the default while history is sparse)."""
+        return self.durations.expected(
+            table.table_type, party_size or table.party_size or table.seats, self.default_dining_duration_minutes
+        )
+
+    def _projected_stay(self, table_id: str, party_size: int) -> datetime.timedelta:
+        # Called for every projected seating; valid until the engine is rebuilt.
+        stay = self._stays.get((table_id, party_size))
+        if stay is None:
+            minutes = self._dining_minutes(self._index.get(table_id), party_size)
+            stay = self._stays[(table_id, party_size)] = datetime.timedelta(minutes=minutes)
+        return stay
+
+    def _eta(self) -> EtaEngine:
+        """Return the ETA engine, rebuilding it if the default or learned dining durations changed."""
+        engine = self._eta_engine
+        if (
+            engine is None
+            or engine.dining_minutes != self.default_dining_duration_minutes
+            or self._eta_durations_version != self.durations.version
+        ):
+            engine = self._eta_engine = EtaEngine(
+                self.default_dining_duration_minutes,
+                duration=self._projected_stay,
+                reserved=self._reserved_until,
+                combos=self._combinations,
+            )
+            self._eta_durations_version = self.durations.version
+            self._stays.clear()
+            for table in self.tables:
+                self._sync_eta(table)
+        return engine
+
+    def _combinations(self, party_size: int) -> List[Tuple[str, ...]]:
+        # EtaEngine callback: joined tables for a party no single table fits.
+        return self.seating.combinations(self._index, self.adjacency, party_size)
+
+    def _reserved_until(
+        self, table_id: str, party_size: int, start: datetime.datetime
+    ) -> Optional[datetime.datetime]:
+        # EtaEngine callback: a projected seating must end (plus the buffer) before the table's next booking.
+        if not self.reservations:
+            return None
+        begin = start.timestamp()
+        padding = self.reservation_buffer_minutes * 60
+        end = begin + self._projected_stay(table_id, party_size).total_seconds() + padding
+        booking = self.reservations.conflict(table_id, begin, end)
+        return None if booking is None else datetime.datetime.fromtimestamp(booking.end + padding)
+
+    def _sync_eta(self, table: Table) -> None:
+        engine = self._eta_engine
+        if engine is None:
+            return
+        ordinal = self._index.ordinal(table)
+        if table.status_code == OCCUPIED and table.assigned_at is not None:
+            stay = datetime.timedelta(minutes=self._dining_minutes(table))
+            engine.table_busy(table.table_id, table.seats, ordinal, table.assigned_time + stay)
+        else:
+            engine.table_free(table.table_id, table.seats, ordinal)
+
+    @_journaled
+    def add_table(self, table: Table, adjacent: Sequence[str] = ()) -> None:
+        """Add a table to the floor plan and index it; ``adjacent`` tables can be joined with it."""
+        self._index.add(table)
+        self.tables.append(table)
+        for other in adjacent:
+            self._link(table.table_id, other)
+        self._sync_eta(table)
+        self._touch(table)
+        self._publish()
+
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-safe copy of the persistent state (floor, waitlist, last event, dining duration)."""
+        # This process already announced its own last_event; don't replay it on reload.
+        self._loaded_event = self.last_event
+        return {
+            "tables": [t.to_dict() for t in self.tables],
+            "waitlist": [e.to_dict() for e in self.waitlist],
+            "last_event": self.last_event,
+            "dining_minutes": self.default_dining_duration_minutes,
+            "adjacency": {table_id: list(neighbors) for table_id, neighbors in self.adjacency.items()},
+            "durations": self.durations.to_state(),
+            "reservations": self.reservations.to_state(),
+        }
+
+    @_journaled
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Replace the state with a ``to_state`` copy (e.g. written by another worker) and publish the diff."""
+        old_tables = {t.table_id: t.to_dict() for t in self.tables}
+        tables = [Table.from_dict(data) for data in state["tables"]]
+        waitlist = Waitlist(WaitlistEntry(**data) for data in state["waitlist"])
+        for table in tables:
+            if old_tables.pop(table.table_id, None) != table.to_dict():
+                self._changed_tables.add(table.table_id)
+        self._changed_tables.update(old_tables)  # tables that were removed
+        waitlist_changed = waitlist != self.waitlist
+        self.tables = tables
+        self.waitlist = waitlist
+        self.default_dining_duration_minutes = state.get("dining_minutes", self.default_dining_duration_minutes)
+        if "durations" in state:
+            self.durations.load_state(state["durations"])
+        if "adjacency" in state:
+            self.adjacency = {table_id: list(neighbors) for table_id, neighbors in state["adjacency"].items()}
+        if "reservations" in state:
+            self.reservations = ReservationBook.from_state(state["reservations"])
+            self._reservation_phases = None
+        self._index.rebuild(self.tables)
+        self._eta_engine = None
+        # Announce an event once even if this process already consumed its own copy.
+        event = state.get("last_event")
+        if event is not None and event != self._loaded_event:
+            self._record_event(event)
+        self._loaded_event = event
+        self._touch(waitlist=waitlist_changed)
+        self._publish()
+
+    def reindex(self) -> None:
+        """Rebuild lookup structures after editing ``tables`` or ``waitlist`` in place."""
+        self._index.rebuild(self.tables)
+        if isinstance(self.waitlist, Waitlist):
+            self.waitlist.rebuild()
+        else:
+            self.waitlist = Waitlist(self.waitlist)
+        self._eta_engine = None
+        self._changed_tables.update(t.table_id for t in self.tables)
+        self._touch(waitlist=True)
+        if self._journal is not None:
+            # In-place edits can't be replayed as calls; journal the resulting state instead.
+            self._journal.append("load_state", {"state": self.to_state()}, self._now())
+        self._publish()
+
+    @property
+    def journal(self) -> Optional[Journal]:
+        return self._journal
+
+    def attach_journal(self, journal: Optional[Journal]) -> None:
+        """Journal every later mutation (call after ``journal.recover(self)``)."""
+        self._journal = journal
+
+    def replay(self, op: str, args: Dict[str, Any], at: datetime.datetime) -> None:
+        """Re-apply a journaled mutation as it happened at ``at``."""
+        if op not in _JOURNALED_OPS:
+            raise ValueError(f"Unknown journal op {op!r}")
+        if op == "assign_table":
+            args = dict(args, table=self._find_table(args["table"]["id"]))
+        elif op == "add_table":
+            args = dict(args, table=Table.from_dict(args["table"]))
+        self._frozen_now = at
+        try:
+            getattr(self, op)(**args)
+        finally:
+            self._frozen_now = None
 
     def _record_event(self, event: Dict[str, Any]) -> None:
+        if self.event_source is not None:
+            event["session_id"] = self.event_source()
         self.last_event = event
+        self._pending_events.append(event)
+        self._touch()
 
     def consume_event(self) -> Optional[Dict[str, Any]]:
         event, self.last_event = self.last_event, None
+        if event is not None:
+            self._touch()
         return event
     
-    def _calculate_table_eta(self, table: Table) -> int:
-        if table.status != "occupied" or not table.assigned_time:
+    def _calculate_table_eta(self, table: Table, now: Optional[float] = None) -> int:
+        if table.status_code != OCCUPIED or table.assigned_at is None:
             return 0 # Not applicable
-        
-        elapsed_time = (datetime.datetime.now() - table.assigned_time).total_seconds() / 60
-        remaining_time = max(0, self.default_dining_duration_minutes - int(elapsed_time))
+
+        now = self._now().timestamp() if now is None else now
+        elapsed_time = (now - table.assigned_at) / 60
+        remaining_time = max(0, self._dining_minutes(table) - int(elapsed_time))
         return remaining_time
 
     # --- Public API ---------------------------------------------------------------
     def get_status(self) -> Dict[str, Any]:
-        current_time = datetime.datetime.now()
+        status, _ = self._build_status(self._now())
+        return status
 
-        # Create a mutable copy of tables for simulation
-        simulated_tables = []
-        for t in self.tables:
-            sim_table_dict = t.to_dict()
-            sim_table_dict["estimated_free_time"] = current_time # For currently free tables
-            if t.status == "occupied" and t.assigned_time:
-                time_to_free = self._calculate_table_eta(t)
-                sim_table_dict["estimated_free_time"] = t.assigned_time + datetime.timedelta(minutes=self.default_dining_duration_minutes)
-            simulated_tables.append(sim_table_dict)
+    def peek_status(self) -> Tuple[Dict[str, Any], Optional[datetime.datetime]]:
+        """Like ``get_status`` but leaves ``last_event`` in place; also returns when an ETA next changes."""
+        return self._build_status(self._now(), consume_event=False)
 
-        # Sort simulated tables by estimated_free_time
-        simulated_tables.sort(key=lambda x: x["estimated_free_time"])
+    def status_snapshot(self) -> StatusSnapshot:
+        """
+        Return the serialized status, rebuilding it only when state changed or a
+        minute-granular ETA rolled over since the cached copy was built.
+        """
+        current_time = self._now()
+        cached = self._snapshot
+        if (
+            cached is not None
+            and cached.generation == self.generation
+            and (cached.expires_at is None or current_time < cached.expires_at)
+        ):
+            return cached
+        status, expires_at = self._build_status(current_time)
+        body = json.dumps(status, separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        self._snapshot = StatusSnapshot(self.generation, etag, body, expires_at)
+        return self._snapshot
 
+    def _build_status(
+        self, current_time: datetime.datetime, consume_event: bool = True
+    ) -> Tuple[Dict[str, Any], Optional[datetime.datetime]]:
+        """Build the status payload and the time at which any ETA in it next changes."""
+        # Every ETA (tables and projected waitlist) ticks on the minute phase of some
+        # occupied table's assigned_time or, for the waitlist, of a reservation's start
+        # or end (stays and buffers are whole minutes, so holds and the padding after a
+        # booking share those phases); the nearest such tick bounds validity. Table ETAs
+        # change on the phase itself, waitlist ETAs just after it, so a waitlist built
+        # exactly on a phase is only good for that instant.
+        next_tick: Optional[float] = None
+        on_phase = False
+        now = current_time.timestamp()
         tables_data = []
         for t in self.tables:
+            # The JSON shape is produced here, once per table, straight from the slots.
             table_dict = t.to_dict()
-            if t.status == "occupied":
-                table_dict["eta_minutes"] = self._calculate_table_eta(t)
+            if t.status_code == OCCUPIED:
+                table_dict["eta_minutes"] = self._calculate_table_eta(t, now)
+                if t.assigned_at is not None:
+                    tick = 60 - (now - t.assigned_at) % 60
+                    on_phase = on_phase or tick == 60
+                    if next_tick is None or tick < next_tick:
+                        next_tick = tick
             tables_data.append(table_dict)
 
-        waitlist_data = []
-        # Simulate waitlist seating to calculate accurate ETAs
-        for entry in self.waitlist:
-            entry_dict = entry.__dict__
-            found_table = False
-            
-            # Find the earliest available table in the simulation for this party
-            for sim_table in simulated_tables:
-                if sim_table["seats"] >= entry.party_size:
-                    # Calculate wait time based on when this table is next free
-                    wait_until_free = max(0, int((sim_table["estimated_free_time"] - current_time).total_seconds() / 60))
-                    entry_dict["eta_minutes"] = wait_until_free
-                    
-                    # Update the simulated table's free time to account for this party's dining duration
-                    sim_table["estimated_free_time"] += datetime.timedelta(minutes=self.default_dining_duration_minutes)
-                    found_table = True
-                    break
-            
-            if not found_table:
-                entry_dict["eta_minutes"] = None # No suitable table found even in simulation
-            waitlist_data.append(entry_dict)
+        waitlist_data = self._waitlist_data(current_time)
+        if waitlist_data:
+            tick = 0.0 if on_phase else self._reservation_tick(now)
+            if tick is not None and (next_tick is None or tick < next_tick):
+                next_tick = tick
 
-        latest_event = self.consume_event()
+        latest_event = self.consume_event() if consume_event else self.last_event
 
-        return {
+        status = {
             "tables": tables_data,
             "waitlist": waitlist_data,
             "last_event": latest_event,
         }
+        expires_at = None if next_tick is None else current_time + datetime.timedelta(seconds=next_tick)
+        return status, expires_at
+
+    def _reservation_tick(self, now: float) -> Optional[float]:
+        """Seconds from ``now`` to the next minute phase of a reservation boundary (0 when on one)."""
+        if not self.reservations:
+            return None
+        if self._reservation_phases is None:
+            self._reservation_phases = sorted({t % 60 for r in self.reservations for t in (r.start, r.end)})
+        phases = self._reservation_phases
+        offset = now % 60
+        idx = bisect_left(phases, offset)
+        return phases[idx] - offset if idx < len(phases) else phases[0] + 60 - offset
+
+    def table_status(self, table_id: str) -> Optional[Dict[str, Any]]:
+        """Serialized status of one table, shaped like an entry of ``get_status()["tables"]``."""
+        table = self._find_table(table_id)
+        if not table:
+            return None
+        table_dict = table.to_dict()
+        if table.status_code == OCCUPIED:
+            table_dict["eta_minutes"] = self._calculate_table_eta(table)
+        return table_dict
+
+    def waitlist_status(self) -> List[Dict[str, Any]]:
+        """Waitlist entries with projected ETAs, shaped like ``get_status()["waitlist"]``."""
+        return self._waitlist_data(self._now())
+
+    def _waitlist_data(self, current_time: datetime.datetime) -> List[Dict[str, Any]]:
+        # Waitlist ETAs come from the shared engine's projection of the queue
+        etas = self._eta().waitlist_etas([e.party_size for e in self.waitlist], current_time)
+        return [
+            {"name": entry.name, "party_size": entry.party_size, "eta_minutes": eta}
+            for entry, eta in zip(self.waitlist, etas)
+        ]
 
     def check_availability(self, party_size: int) -> Optional[Table]:
-        return next(
-            (t for t in self.tables if t.status == "free" and t.seats >= party_size),
-            None,
+        """Best single free table for the party (see ``SeatingOptimizer``)."""
+        plan = self.seating.plan(
+            self._index, self.adjacency, party_size, self._upcoming(), combine=False, available=self._walk_in_rule()
         )
+        return plan.tables[0] if plan else None
 
-    def assign_table(self, table: Table, guest_name: str) -> str:
-        table.status = "occupied"
-        table.guest_name = guest_name
-        table.assigned_time = datetime.datetime.now() # Set assigned time
+    def find_seating(self, party_size: int) -> Optional[SeatingPlan]:
+        """Best single table for the party, or adjacent free tables joined when none fits."""
+        return self.seating.plan(
+            self._index, self.adjacency, party_size, self._upcoming(), available=self._walk_in_rule()
+        )
+
+    def reserved_soon(self, table: Table, party_size: Optional[int] = None) -> Optional[Reservation]:
+        """
+        The reservation that rules out seating a party at ``table`` now: one
+        starting before the party would be expected to leave, plus
+        ``reservation_buffer_minutes``. None if the table can be given away.
+        """
+        now = self._now().timestamp()
+        stay = (self._dining_minutes(table, party_size) + self.reservation_buffer_minutes) * 60
+        return self.reservations.conflict(table.table_id, now, now + stay)
+
+    def seat(self, plan: SeatingPlan, guest_name: str) -> str:
+        """Seat a party according to ``plan``; returns the (possibly combined) table id."""
+        if not plan.combined:
+            return self.assign_table(plan.tables[0], guest_name, plan.party_size)
+        return self.assign_tables([t.table_id for t in plan.tables], guest_name, plan.party_size)
+
+    def place_guest(
+        self, name: str, party_size: int, action: str = "auto", table_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Seat a party (at ``table_id`` when given and usable, else the best
+        plan) or, if nothing fits or ``action`` is "waitlist", add it to the
+        waitlist.
+        """
+        plan = None
+        if action == "check_in" and table_id:
+            chosen_table = self._find_table(table_id)
+            # A table held for an upcoming reservation is not given to a walk-in.
+            if chosen_table and chosen_table.status_code == FREE and self.reserved_soon(chosen_table, party_size) is None:
+                plan = SeatingPlan((chosen_table,), party_size)
+        if not plan:
+            # Best-fit single table, or adjacent tables joined for a large party.
+            plan = self.find_seating(party_size)
+
+        if plan and action != "waitlist":
+            assigned_table = self.seat(plan, guest_name=name)
+            return {
+                "success": True,
+                "assigned": True,
+                "table": assigned_table,
+                "waitlist_position": None,
+                "message": f"Seated {name} at {assigned_table}.",
+                "status": "seated",
+            }
+
+        position = self.add_to_waitlist(name=name, party_size=party_size)
+        return {
+            "success": True,
+            "assigned": False,
+            "table": None,
+            "waitlist_position": position,
+            "message": f"No table free; added to waitlist at position {position}.",
+            "status": "waitlisted",
+        }
+
+    @_journaled
+    def assign_table(self, table: Table, guest_name: str, party_size: Optional[int] = None) -> str:
+        self._occupy(table, guest_name, party_size=party_size)
         self._record_event(
             {
                 "type": "table_assigned",
                 "table": table.table_id,
                 "name": guest_name,
-                "party_size": table.seats,
+                "party_size": party_size or table.seats,
             }
         )
+        self._publish()
         return table.table_id
 
+    @_journaled
+    def assign_tables(self, table_ids: List[str], guest_name: str, party_size: Optional[int] = None) -> str:
+        """Seat one party at several joined tables; returns the combined id."""
+        tables = [self._find_table(table_id) for table_id in table_ids]
+        if any(t is None or t.status_code != FREE for t in tables):
+            raise ValueError(f"Tables {table_ids} are not all free")
+        combo = COMBO_SEPARATOR.join(table_ids) if len(tables) > 1 else None
+        at = self._now().timestamp()
+        for table in tables:
+            self._occupy(table, guest_name, combo, at, party_size)
+        seated_at = combo or table_ids[0]
+        self._record_event(
+            {
+                "type": "table_assigned",
+                "table": seated_at,
+                "name": guest_name,
+                "party_size": party_size or sum(t.seats for t in tables),
+            }
+        )
+        self._publish()
+        return seated_at
+
+    @_journaled
     def add_to_waitlist(self, name: str, party_size: int) -> int:
         self.waitlist.append(WaitlistEntry(name=name, party_size=party_size))
         position = len(self.waitlist)
+        self._touch(waitlist=True)
         self._record_event(
             {
                 "type": "waitlist",
@@ -153,102 +847,294 @@ class HotelManager:
                 "position": position,
             }
         )
+        self._publish()
         return position
 
     def estimate_wait_time(self, party_size: int) -> Optional[int]:
         """
         Estimate how many minutes until a suitable table frees up for a party.
-        Simulates the current waitlist plus this new party.
+        Projects the current waitlist plus this new party.
         """
-        current_time = datetime.datetime.now()
-
-        simulated_tables = []
-        for t in self.tables:
-            sim_table_dict = t.to_dict()
-            sim_table_dict["estimated_free_time"] = current_time
-            if t.status == "occupied" and t.assigned_time:
-                sim_table_dict["estimated_free_time"] = t.assigned_time + datetime.timedelta(
-                    minutes=self.default_dining_duration_minutes
-                )
-            simulated_tables.append(sim_table_dict)
-
-        simulated_tables.sort(key=lambda x: x["estimated_free_time"])
-
-        queue = list(self.waitlist) + [WaitlistEntry(name="__new__", party_size=party_size)]
-
-        for entry in queue:
-            found_table = False
-            for sim_table in simulated_tables:
-                if sim_table["seats"] >= entry.party_size:
-                    wait_until_free = max(
-                        0,
-                        int((sim_table["estimated_free_time"] - current_time).total_seconds() / 60),
-                    )
-                    sim_table["estimated_free_time"] += datetime.timedelta(
-                        minutes=self.default_dining_duration_minutes
-                    )
-                    found_table = True
-                    if entry.name == "__new__":
-                        return wait_until_free
-                    break
-            if not found_table and entry.name == "__new__":
-                return None
-        return None
+        current_time = self._now()
+        return self._eta().estimate([e.party_size for e in self.waitlist], party_size, current_time)
 
+    @_journaled
     def checkout_and_fill_waitlist(self, table_id: str) -> Dict[str, Any]:
         table = self._find_table(table_id)
         if not table:
             return {"success": False, "message": "Table not found."}
 
         previous_guest = table.guest_name
-        table.status = "free"
-        table.guest_name = None
-        table.assigned_time = None # Reset assigned time on checkout
+        if table.status_code == OCCUPIED and table.assigned_at is not None:
+            stayed = (self._now().timestamp() - table.assigned_at) / 60
+            self.durations.record(table.table_type, table.party_size or table.seats, stayed)
+        freed = self._combo_tables(table)  # a joined seating frees all of its tables
+        for t in freed:
+            self._release(t)
 
         assigned_guest: Optional[WaitlistEntry] = None
-        for idx, entry in enumerate(list(self.waitlist)):
-            if entry.party_size <= table.seats:
-                assigned_guest = self.waitlist.pop(idx)
-                table.status = "occupied"
-                table.guest_name = assigned_guest.name
-                table.assigned_time = datetime.datetime.now() # Set assigned time for new assignment
-                break
+        seated_at = table.table_id
+        choice = self.seating.fill(self._index, self.adjacency, freed, self.waitlist, self._walk_in_rule())
+        if choice:
+            assigned_guest, plan = choice
+            seated_at = plan.table_id
+            self.waitlist.discard(assigned_guest)
+            at = self._now().timestamp()
+            for t in plan.tables:
+                self._occupy(t, assigned_guest.name, seated_at if plan.combined else None, at, assigned_guest.party_size)
+            self._touch(waitlist=True)
+            if self._eta_engine:
+                self._eta_engine.invalidate()
 
         result: Dict[str, Any] = {
             "success": True,
             "table": table.table_id,
             "cleared_guest": previous_guest,
-            "assigned_guest": assigned_guest.__dict__ if assigned_guest else None,
+            "assigned_guest": assigned_guest.to_dict() if assigned_guest else None,
+            "assigned_table": seated_at if assigned_guest else None,
         }
 
         if assigned_guest:
             self._record_event(
                 {
                     "type": "table_assigned",
-                    "table": table.table_id,
+                    "table": seated_at,
                     "name": assigned_guest.name,
                     "party_size": assigned_guest.party_size,
                 }
             )
             result["announcement"] = (
-                f"Party for {assigned_guest.name}, party of {assigned_guest.party_size}, your table {table.table_id} is ready!"
+                f"Party for {assigned_guest.name}, party of {assigned_guest.party_size}, your table {seated_at} is ready!"
             )
 
+        self._publish()
         return result
 
+    @_journaled
     def update_table_assignment(self, table_id: str, guest_name: str) -> Dict[str, Any]:
         table = self._find_table(table_id)
         if not table:
             return {"success": False, "message": "Table not found."}
-        if table.status != "occupied":
+        if table.status_code != OCCUPIED:
             return {"success": False, "message": "Table is not currently occupied."}
-        table.guest_name = guest_name
-        table.assigned_time = datetime.datetime.now()
+        assigned_at = self._now().timestamp()
+        for t in self._combo_tables(table):
+            t.guest_name = guest_name
+            t.assigned_at = assigned_at
+            self._sync_eta(t)
+            self._touch(t)
+        self._publish()
         return {"success": True, "table": table.to_dict(), "message": f"Updated table {table_id} for {guest_name}."}
 
+    @_journaled
     def update_waitlist_entry(self, name: str, party_size: int) -> Dict[str, Any]:
-        for entry in self.waitlist:
-            if entry.name.lower() == name.lower():
-                entry.party_size = party_size
-                return {"success": True, "entry": entry.__dict__, "message": f"Updated waitlist for {name} to party size {party_size}."}
-        return {"success": False, "message": "Waitlist entry not found."}
+        entry = self.waitlist.find(name)
+        if entry is None:
+            return {"success": False, "message": "Waitlist entry not found."}
+        self.waitlist.resize(entry, party_size)
+        self._touch(waitlist=True)
+        if self._eta_engine:
+            self._eta_engine.invalidate()
+        self._publish()
+        return {"success": True, "entry": entry.to_dict(), "message": f"Updated waitlist for {name} to party size {party_size}."}
+
+    @_journaled
+    def remove_from_waitlist(self, name: str) -> Dict[str, Any]:
+        """Drop a waiting party (e.g. it left before a table freed up)."""
+        entry = self.waitlist.find(name)
+        if entry is None:
+            return {"success": False, "message": "Waitlist entry not found."}
+        self.waitlist.discard(entry)
+        self._touch(waitlist=True)
+        if self._eta_engine:
+            self._eta_engine.invalidate()
+        self._publish()
+        return {"success": True, "entry": entry.to_dict(), "message": f"Removed {name} from the waitlist."}
+
+    # --- Reservations -------------------------------------------------------------
+    def upcoming_reservations(self, within_minutes: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Reservations not yet seated, soonest first; ``within_minutes`` limits how far ahead."""
+        horizon = None if within_minutes is None else self._now().timestamp() + within_minutes * 60
+        return [r.to_dict() for r in self.reservations if horizon is None or r.start < horizon]
+
+    def find_reservation_slot(
+        self, party_size: int, after: datetime.datetime, minutes: Optional[int] = None
+    ) -> Optional[Tuple[datetime.datetime, Table]]:
+        """
+        Earliest time at or after ``after`` that a single table can be booked
+        for the party, and that table (smallest, then floor-plan order, on
+        ties). ``minutes`` defaults to the expected stay at each table. Tables
+        in use now count as busy until their party is expected to leave.
+        """
+        now = self._now().timestamp()
+        padding = self.reservation_buffer_minutes * 60
+        best: Optional[Tuple[float, int, int, Table]] = None
+        for table in self._index:
+            if table.seats < party_size:
+                continue
+            length = (minutes or self._dining_minutes(table, party_size)) * 60
+            free_at = self._free_at(table, now)
+            if table.status_code == OCCUPIED:
+                free_at += padding  # turnover after the current party
+            start = self.reservations.next_gap(table.table_id, max(after.timestamp(), free_at), length, padding)
+            key = (start, table.seats, self._index.ordinal(table), table)
+            if best is None or key[:3] < best[:3]:
+                best = key
+        return None if best is None else (datetime.datetime.fromtimestamp(best[0]), best[3])
+
+    def _booking_conflict(self, table: Table, start: float, end: float, now: float) -> Optional[str]:
+        padding = self.reservation_buffer_minutes * 60
+        booking = self.reservations.conflict(table.table_id, start - padding, end + padding)
+        if booking is not None:
+            return f"{table.table_id} is reserved from {_isoformat(booking.start)} to {_isoformat(booking.end)}."
+        if table.status_code == OCCUPIED and self._free_at(table, now) + padding > start:
+            return f"{table.table_id} is in use until about {_isoformat(self._free_at(table, now))}."
+        return None
+
+    @_journaled
+    def add_reservation(
+        self,
+        name: str,
+        party_size: int,
+        start: str,
+        minutes: Optional[int] = None,
+        table_ids: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Book a table (or the given ``table_ids``, joined) from ``start`` (ISO
+        time) for ``minutes`` (default: the expected stay). Without
+        ``table_ids`` the smallest single table that is free for the whole
+        slot is chosen; if none is, the result suggests the next free slot.
+        """
+        now = self._now().timestamp()
+        begin = datetime.datetime.fromisoformat(start).timestamp()
+        if begin < now - 60:
+            return {"success": False, "message": "Reservations must be in the future."}
+        self.reservations.expire(now)
+
+        if table_ids:
+            tables = [self._find_table(table_id) for table_id in table_ids]
+            if any(t is None for t in tables):
+                return {"success": False, "message": "Table not found."}
+            if sum(t.seats for t in tables) < party_size:
+                return {"success": False, "message": f"Tables {table_ids} do not seat {party_size}."}
+            length = (minutes or max(self._dining_minutes(t, party_size) for t in tables)) * 60
+            for table in tables:
+                reason = self._booking_conflict(table, begin, begin + length, now)
+                if reason:
+                    return {"success": False, "message": reason}
+        else:
+            tables = []
+            length = 0
+            for table in sorted(self._index, key=lambda t: (t.seats, self._index.ordinal(t))):
+                if table.seats < party_size:
+                    continue
+                length = (minutes or self._dining_minutes(table, party_size)) * 60
+                if self._booking_conflict(table, begin, begin + length, now) is None:
+                    tables = [table]
+                    break
+            if not tables:
+                slot = self.find_reservation_slot(party_size, datetime.datetime.fromtimestamp(begin), minutes)
+                return {
+                    "success": False,
+                    "message": f"No table is free for {party_size} at {start}.",
+                    "next_slot": None if slot is None else {"start": slot[0].isoformat(), "table": slot[1].table_id},
+                }
+
+        reservation = Reservation(
+            self.reservations.new_id(), name, party_size, tuple(t.table_id for t in tables), begin, begin + length
+        )
+        self.reservations.add(reservation)
+        self._reservations_changed()
+        self._record_event(
+            {
+                "type": "reservation_booked",
+                "reservation": reservation.reservation_id,
+                "table": reservation.table_id,
+                "name": name,
+                "party_size": party_size,
+                "start": _isoformat(begin),
+            }
+        )
+        self._publish()
+        return {"success": True, "reservation": reservation.to_dict()}
+
+    @_journaled
+    def cancel_reservation(self, reservation_id: str) -> Dict[str, Any]:
+        reservation = self.reservations.remove(reservation_id)
+        if reservation is None:
+            return {"success": False, "message": "Reservation not found."}
+        self._reservations_changed()
+        self._publish()
+        return {"success": True, "reservation": reservation.to_dict(), "message": f"Cancelled {reservation_id}."}
+
+    @_journaled
+    def seat_reservation(self, reservation_id: str) -> Dict[str, Any]:
+        """Seat a party that booked ahead at its reserved table(s)."""
+        reservation = self.reservations.get(reservation_id)
+        if reservation is None:
+            return {"success": False, "message": "Reservation not found."}
+        busy = [table_id for table_id in reservation.table_ids if self._find_table(table_id).status_code != FREE]
+        if busy:
+            return {"success": False, "message": f"Table {', '.join(busy)} is still occupied."}
+        self.reservations.remove(reservation_id)
+        self._reservations_changed()
+        seated_at = self.assign_tables(list(reservation.table_ids), reservation.name, reservation.party_size)
+        return {"success": True, "reservation": reservation.to_dict(), "table": seated_at}
+
+    def _reservations_changed(self) -> None:
+        self._reservation_phases = None
+        self._touch()
+        if self._eta_engine:
+            self._eta_engine.invalidate()
+
+    # --- Batches ------------------------------------------------------------------
+    @_journaled
+    def apply_batch(self, items: List[Dict[str, Any]], atomic: bool = True) -> Dict[str, Any]:
+        """
+        Apply many mutations (``{"op": ..., **kwargs}``, see ``BATCH_OPS``) as
+        one change: listeners get a single notification carrying every event,
+        so status and ETAs are rebuilt once. Each item gets its own result.
+        With ``atomic`` (the default) any failure restores the state from
+        before the batch; otherwise the remaining items still apply.
+
+        Item arguments are type-checked before dispatch. An op that raises
+        anyway counts as a failed item rather than escaping half-applied, so
+        the batch is journaled and replays to the same state.
+        """
+        before = self.to_state() if atomic else None
+        last_event, events_mark = self.last_event, len(self._pending_events)
+        results: List[Dict[str, Any]] = []
+        with self.batch():
+            for item in items:
+                op = item.get("op") if isinstance(item, dict) else None
+                method = BATCH_OPS.get(op) if isinstance(op, str) else None
+                if method is None:
+                    results.append({"success": False, "message": f"Unknown op {op!r}."})
+                    continue
+                arguments = {k: v for k, v in item.items() if k != "op"}
+                error = _batch_argument_error(method, arguments)
+                if error is not None:
+                    results.append({"success": False, "message": error})
+                    continue
+                try:
+                    result = getattr(self, method)(**arguments)
+                except (TypeError, ValueError) as exc:  # missing arguments, or tables no longer free
+                    result = {"success": False, "message": str(exc)}
+                except Exception as exc:
+                    logging.getLogger(__name__).exception("Batch op %r failed", op)
+                    result = {"success": False, "message": f"{type(exc).__name__}: {exc}"}
+                results.append(result)
+            failed = sum(not result.get("success", False) for result in results)
+            rolled_back = bool(atomic and failed)
+            if rolled_back:
+                self.load_state(before)
+                self.last_event = last_event
+                del self._pending_events[events_mark:]
+        return {
+            "success": not failed,
+            "applied": 0 if rolled_back else len(results) - failed,
+            "failed": failed,
+            "rolled_back": rolled_back,
+            "results": results,
+        }
@@ -0,0 +1,237 @@
+"""
+Write-ahead journal and snapshots for one venue's HotelManager.
+
+Mutations are appended as JSON lines (``{"seq", "op", "args", "at"}``) to an
+in-memory batch; a background thread writes and fsyncs the batch every
+``fsync_interval`` seconds (group commit), so a tool call only pays for
+queueing a tuple; JSON encoding happens on the writer thread too. Every ``snapshot_every`` records the manager's ``to_state()`` is written
+atomically as a snapshot and a new journal segment is started; older segments
+and snapshots are then deleted. Recovery loads the newest snapshot and replays
+only the records after it.
+
+Layout of a venue directory::
+
+    snapshot-000000001000.json   state as of seq 1000
+    journal-000000001001.jsonl   records from seq 1001 on
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from services.hotel import HotelManager
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT = "snapshot-{:012d}.json"
+_SEGMENT = "journal-{:012d}.jsonl"
+
+
+@dataclass(frozen=True)
+class RecoveryStats:
+    snapshot_seq: int
+    replayed: int
+    seconds: float
+
+
+_Item = Tuple[int, Optional[str], Dict[str, Any], Optional[datetime.datetime]]
+
+
+def _seq_of(path: Path) -> int:
+    return int(path.stem.split("-")[1])
+
+
+class Journal:
+    """Append-only, batched-fsync journal for one venue directory."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        fsync_interval: float = 0.05,
+        snapshot_every: int = 1000,
+        max_batch: int = 512,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.max_batch = max_batch
+        self.seq = 0
+        self.durable_seq = 0
+        self._since_snapshot = 0
+        # (seq, op, args, at) records and (seq, None, state, None) snapshot markers, in order.
+        self._pending: List[_Item] = []
+        self._cond = threading.Condition()
+        self._segment = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._urgent = False
+
+    # --- Recovery -----------------------------------------------------------------
+    def recover(self, manager: "HotelManager") -> RecoveryStats:
+        """Load the newest snapshot into ``manager`` and replay the journal tail after it."""
+        start = time.perf_counter()
+        snapshot_seq = 0
+        for path in sorted(self.directory.glob("snapshot-*.json"), reverse=True):
+            try:
+                state = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                logger.warning("Skipping unreadable snapshot %s", path)
+                continue
+            manager.load_state(state)
+            snapshot_seq = _seq_of(path)
+            break
+
+        seq = snapshot_seq
+        replayed = 0
+        for path in sorted(self.directory.glob("journal-*.jsonl")):
+            with path.open(encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        logger.warning("Torn journal record in %s after seq %d; stopping replay", path, seq)
+                        break
+                    if record["seq"] <= seq:
+                        continue
+                    manager.replay(record["op"], record["args"], datetime.datetime.fromisoformat(record["at"]))
+                    seq = record["seq"]
+                    replayed += 1
+        self.seq = self.durable_seq = seq
+        self._since_snapshot = seq - snapshot_seq
+        manager.consume_event()  # don't re-announce the last event from before the restart
+        return RecoveryStats(snapshot_seq, replayed, time.perf_counter() - start)
+
+    # --- Writing ------------------------------------------------------------------
+    def append(self, op: str, args: Dict[str, Any], at: datetime.datetime) -> int:
+        """
+        Queue a record; it is durable once the writer's next fsync completes.
+        ``args`` must not be mutated afterwards (it is encoded on the writer thread).
+        """
+        with self._cond:
+            self.seq += 1
+            self._since_snapshot += 1
+            self._pending.append((self.seq, op, args, at))
+            if len(self._pending) in (1, self.max_batch):
+                self._cond.notify_all()  # start a batch window / flush a full batch
+            self._ensure_writer()
+            return self.seq
+
+    @property
+    def snapshot_due(self) -> bool:
+        return bool(self.snapshot_every) and self._since_snapshot >= self.snapshot_every
+
+    def snapshot(self, state: Dict[str, Any]) -> None:
+        """Queue a snapshot of ``state`` as of the last appended record."""
+        with self._cond:
+            self._since_snapshot = 0
+            self._pending.append((self.seq, None, state, None))
+            self._cond.notify_all()
+            self._ensure_writer()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything appended so far is fsynced."""
+        with self._cond:
+            target = self.seq
+            self._urgent = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self.durable_seq >= target or self._thread is None, timeout)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def _ensure_writer(self) -> None:
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name=f"journal:{self.directory.name}", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or self._pending)
+                self._cond.wait_for(
+                    lambda: self._closed or self._urgent or len(self._pending) >= self.max_batch, self.fsync_interval
+                )
+                batch, self._pending = self._pending, []
+                target = self.seq
+                closing = self._closed
+                self._urgent = False
+            try:
+                self._write(batch)
+            except OSError:
+                logger.exception("Journal write failed in %s", self.directory)
+            with self._cond:
+                self.durable_seq = target
+                self._cond.notify_all()
+                if closing and not self._pending:
+                    self._thread = None
+                    self._cond.notify_all()
+                    return
+
+    def _write(self, batch: List[_Item]) -> None:
+        lines: List[str] = []
+        first = 0
+        for seq, op, args, at in batch:
+            if op is None:
+                self._write_lines(first, lines)
+                lines = []
+                self._write_snapshot(seq, args)
+                continue
+            first = first if lines else seq
+            lines.append(json.dumps({"seq": seq, "op": op, "args": args, "at": at.isoformat()}, separators=(",", ":")))
+        self._write_lines(first, lines)
+
+    def _write_lines(self, first: int, lines: List[str]) -> None:
+        if not lines:
+            return
+        if self._segment is None:
+            self._segment = (self.directory / _SEGMENT.format(first)).open("a", encoding="utf-8")
+        self._segment.write("\n".join(lines) + "\n")
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+
+    def _write_snapshot(self, seq: int, state: Dict[str, Any]) -> None:
+        path = self.directory / _SNAPSHOT.format(seq)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            json.dump(state, handle, separators=(",", ":"))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, path)
+        self._fsync_dir()
+        # Records after the snapshot go to a fresh segment; everything older is now redundant.
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+        for old in self.directory.glob("journal-*.jsonl"):
+            old.unlink()
+        for old in self.directory.glob("snapshot-*.json"):
+            if _seq_of(old) < seq:
+                old.unlink()
+
+    def _fsync_dir(self) -> None:
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return  # e.g. Windows; the rename is still atomic
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
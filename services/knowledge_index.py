@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*\S)\s*$")
+_DIVIDER = re.compile(r"^-{3,}\s*(.*?)\s*-{3,}\s*$")  # "--- ⭐ BEST SELLERS ---"
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from have how i in is it me my of on or "
+    "our so that the there this to was we what when where which who will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        # Cheap plural folding so "burgers" matches "burger" without a stemmer dependency.
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+@dataclass(frozen=True)
+class Section:
+    source: str  # file stem, e.g. "mg_cafe"
+    title: str  # heading path, e.g. "MG Cafe Knowledge Base > Menu Context > BEST SELLERS"
+    text: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"source": self.source, "title": self.title, "text": self.text}
+
+
+def parse_sections(source: str, markdown: str, max_chars: int = 1200) -> List[Section]:
+    """Split markdown into sections at headings and ``--- name ---`` dividers."""
+    sections: List[Section] = []
+    path: List[Tuple[int, str]] = []  # (level, title) of enclosing headings
+    divider: Optional[str] = None
+    lines: List[str] = []
+
+    def flush() -> None:
+        body = "\n".join(lines).strip()
+        lines.clear()
+        if not body:
+            return
+        title = " > ".join([t for _, t in path] + ([divider] if divider else [])) or source
+        for chunk in _chunks(body, max_chars):
+            sections.append(Section(source, title, chunk))
+
+    for line in markdown.splitlines():
+        heading = _HEADING.match(line)
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            path = [p for p in path if p[0] < level] + [(level, heading.group(2))]
+            divider = None
+            continue
+        rule = _DIVIDER.match(line)
+        if rule and rule.group(1):
+            flush()
+            divider = rule.group(1)
+            continue
+        lines.append(line)
+    flush()
+    return sections
+
+
+def _chunks(body: str, max_chars: int) -> Iterable[str]:
+    """Keep sections whole unless they are long; then split on blank lines."""
+    if len(body) <= max_chars:
+        yield body
+        return
+    current: List[str] = []
+    size = 0
+    for paragraph in re.split(r"\n\s*\n", body):
+        if current and size + len(paragraph) > max_chars:
+            yield "\n\n".join(current)
+            current, size = [], 0
+        current.append(paragraph)
+        size += len(paragraph)
+    if current:
+        yield "\n\n".join(current)
+
+
+class KnowledgeIndex:
+    """
+    In-memory BM25 index over the markdown files in a knowledge directory.
+
+    Files are parsed into sections once and re-parsed only when their mtime or
+    size changes (checked at most every ``check_interval`` seconds). Queries
+    walk the postings of their terms only, so cost tracks the number of
+    matching sections rather than the size of the knowledge base.
+    """
+
+    def __init__(self, directory: Path, pattern: str = "*.md", check_interval: float = 1.0,
+                 k1: float = 1.5, b: float = 0.75) -> None:
+        self.directory = directory
+        self.pattern = pattern
+        self.check_interval = check_interval
+        self.k1 = k1
+        self.b = b
+        self._files: Dict[Path, Tuple[float, int]] = {}
+        self._by_source: Dict[str, List[Section]] = {}
+        self._raw: Dict[str, str] = {}
+        self._sections: List[Section] = []
+        self._lengths: List[int] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}  # term -> [(section idx, tf)]
+        self._source_postings: Dict[str, Dict[str, List[Tuple[int, int]]]] = {}
+        self._source_counts: Dict[str, int] = {}
+        self._avg_length = 0.0
+        self._source_avg_lengths: Dict[str, float] = {}
+        self._checked_at = -math.inf
+
+    def sources(self) -> List[str]:
+        self.refresh()
+        return sorted(self._by_source)
+
+    def text(self, source: str) -> Optional[str]:
+        """Cached full text of one source file, or None if it is not indexed."""
+        self.refresh()
+        return self._raw.get(source)
+
+    def search(self, query: str, top_k: int = 3, source: Optional[str] = None) -> List[Tuple[Section, float]]:
+        self.refresh()
+        # A source-scoped query only walks that source's postings, and is scored
+        # against that source's statistics, so other venues' files change neither
+        # its speed nor its ranking.
+        if source is None:
+            index, n, avg_length = self._postings, len(self._sections), self._avg_length
+        else:
+            index, n = self._source_postings.get(source, {}), self._source_counts.get(source, 0)
+            avg_length = self._source_avg_lengths.get(source, 1.0)
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = index.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for idx, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[idx] / avg_length)
+                scores[idx] += idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self._sections[idx], round(score, 3)) for idx, score in ranked[:top_k]]
+
+    def refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        current: Dict[Path, Tuple[float, int]] = {}
+        for path in sorted(self.directory.glob(self.pattern)):
+            stat = path.stat()
+            current[path] = (stat.st_mtime, stat.st_size)
+        if current == self._files:
+            return
+        for path, signature in current.items():
+            if self._files.get(path) != signature:
+                raw = path.read_text(encoding="utf-8")
+                self._raw[path.stem] = raw
+                self._by_source[path.stem] = parse_sections(path.stem, raw)
+        for path in set(self._files) - set(current):
+            self._raw.pop(path.stem, None)
+            self._by_source.pop(path.stem, None)
+        self._files = current
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        sections = [s for source in sorted(self._by_source) for s in self._by_source[source]]
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        source_postings: Dict[str, Dict[str, List[Tuple[int, int]]]] = {}
+        lengths = []
+        for idx, section in enumerate(sections):
+            terms = tokenize(f"{section.title}\n{section.text}")
+            lengths.append(len(terms))
+            local = source_postings.setdefault(section.source, defaultdict(list))
+            for term, tf in Counter(terms).items():
+                postings[term].append((idx, tf))
+                local[term].append((idx, tf))
+        self._sections = sections
+        self._lengths = lengths
+        self._postings = dict(postings)
+        self._source_postings = {source: dict(local) for source, local in source_postings.items()}
+        self._source_counts = Counter(section.source for section in sections)
+        self._avg_length = (sum(lengths) / len(lengths)) if lengths else 1.0
+        totals: Counter[str] = Counter()
+        for section, length in zip(sections, lengths):
+            totals[section.source] += length
+        self._source_avg_lengths = {
+            source: (totals[source] / count) or 1.0 for source, count in self._source_counts.items()
+        }
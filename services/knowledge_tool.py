@@ -1,22 +1,48 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Optional
 
 from google.adk.tools.function_tool import FunctionTool
 
+from services.knowledge_index import KnowledgeIndex
+
 
 KNOWLEDGE_FILE = (
     Path(__file__).resolve().parents[1] / "app" / "knowledge" / "mg_cafe.md"
 )
 
+# One index over every venue file in the knowledge directory; re-parsed on mtime change.
+knowledge_index = KnowledgeIndex(KNOWLEDGE_FILE.parent)
+
 
-def _get_mg_cafe_knowledge() -> dict:
+def _get_mg_cafe_knowledge(query: Optional[str] = None, top_k: int = 3) -> dict:
     """
-    Return the MG Cafe ground-truth knowledge file as plain text.
+    Return MG Cafe ground-truth knowledge.
+
+    Parameters:
+    - query: the guest's question or its key words (e.g. "parking", "vegan options").
+      When given, only the most relevant sections are returned.
+    - top_k: how many sections to return for a query.
+
+    Without a query, the whole knowledge file is returned as plain text.
     """
-    if not KNOWLEDGE_FILE.exists():
+    source = KNOWLEDGE_FILE.stem
+    # The index stats the directory at most once per check interval; no per-call exists().
+    text = knowledge_index.text(source)
+    if text is None:
         return {"text": "", "error": f"Knowledge file not found: {KNOWLEDGE_FILE}"}
-    return {"text": KNOWLEDGE_FILE.read_text(encoding="utf-8")}
+    if not query:
+        return {"text": text}
+
+    hits = knowledge_index.search(query, top_k=max(1, top_k), source=source)
+    if not hits:
+        # Nothing matched; fall back to the full file so the agent can still answer.
+        return {"text": text, "sections": [], "note": "No section matched the query."}
+    return {
+        "text": "\n\n".join(f"{section.title}\n{section.text}" for section, _ in hits),
+        "sections": [dict(section.to_dict(), score=score) for section, score in hits],
+    }
 
 
 get_mg_cafe_knowledge = FunctionTool(_get_mg_cafe_knowledge)
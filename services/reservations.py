@@ -0,0 +1,172 @@
+"""Future table reservations with a per-table sorted-interval index."""
+
+from __future__ import annotations
+
+import datetime
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from services.seating import COMBO_SEPARATOR
+
+
+@dataclass(slots=True)
+class Reservation:
+    reservation_id: str
+    name: str
+    party_size: int
+    table_ids: Tuple[str, ...]
+    start: float  # epoch seconds
+    end: float
+
+    @property
+    def table_id(self) -> str:
+        return COMBO_SEPARATOR.join(self.table_ids)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.reservation_id,
+            "name": self.name,
+            "party_size": self.party_size,
+            "tables": list(self.table_ids),
+            "start": datetime.datetime.fromtimestamp(self.start).isoformat(),
+            "end": datetime.datetime.fromtimestamp(self.end).isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Reservation":
+        return cls(
+            reservation_id=data["id"],
+            name=data["name"],
+            party_size=data["party_size"],
+            table_ids=tuple(data["tables"]),
+            start=datetime.datetime.fromisoformat(data["start"]).timestamp(),
+            end=datetime.datetime.fromisoformat(data["end"]).timestamp(),
+        )
+
+
+class _TableSchedule:
+    """
+    One table's reservations, sorted by start. They never overlap, so the
+    ends are sorted too and the only booking that can overlap ``[a, b)`` is
+    the last one starting before ``b``: conflict checks are one bisect.
+    """
+
+    __slots__ = ("starts", "ends", "items")
+
+    def __init__(self) -> None:
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+        self.items: List[Reservation] = []
+
+    def conflict(self, start: float, end: float) -> Optional[Reservation]:
+        idx = bisect_left(self.starts, end)
+        if idx and self.ends[idx - 1] > start:
+            return self.items[idx - 1]
+        return None
+
+    def next_gap(self, after: float, length: float, padding: float) -> float:
+        """Earliest ``t >= after`` with ``[t, t + length)`` at least ``padding`` away from every booking."""
+        starts, ends = self.starts, self.ends
+        idx = bisect_right(starts, after)
+        if idx and ends[idx - 1] + padding > after:
+            after = ends[idx - 1] + padding
+        # Walk forward over back-to-back bookings until a gap is long enough.
+        while idx < len(starts) and starts[idx] - padding < after + length:
+            after = max(after, ends[idx] + padding)
+            idx += 1
+        return after
+
+    def insert(self, reservation: Reservation) -> None:
+        idx = bisect_left(self.starts, reservation.start)
+        self.starts.insert(idx, reservation.start)
+        self.ends.insert(idx, reservation.end)
+        self.items.insert(idx, reservation)
+
+    def remove(self, reservation: Reservation) -> None:
+        idx = bisect_left(self.starts, reservation.start)
+        while self.items[idx] is not reservation:
+            idx += 1
+        del self.starts[idx], self.ends[idx], self.items[idx]
+
+    def expire(self, before: float) -> List[Reservation]:
+        idx = bisect_right(self.ends, before)
+        expired = self.items[:idx]
+        del self.starts[:idx], self.ends[:idx], self.items[:idx]
+        return expired
+
+
+class ReservationBook:
+    """
+    Reservations by id and, per table, in a ``_TableSchedule``.
+
+    ``conflict`` is O(log n) in the bookings on the table. ``next_gap`` is a
+    bisect plus a walk over bookings that leave no room in between, so it
+    stays logarithmic unless the table is booked back to back. Overlap is
+    the caller's rule to enforce (``HotelManager`` pads with a turnover buffer).
+    """
+
+    def __init__(self, reservations: Iterable[Reservation] = (), next_id: int = 1) -> None:
+        self._by_id: Dict[str, Reservation] = {}
+        self._tables: Dict[str, _TableSchedule] = {}
+        self.next_id = next_id
+        for reservation in reservations:
+            self.add(reservation)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Reservation]:
+        return iter(sorted(self._by_id.values(), key=lambda r: (r.start, r.reservation_id)))
+
+    def get(self, reservation_id: str) -> Optional[Reservation]:
+        return self._by_id.get(reservation_id)
+
+    def new_id(self) -> str:
+        reservation_id = f"R{self.next_id}"
+        self.next_id += 1
+        return reservation_id
+
+    def add(self, reservation: Reservation) -> None:
+        self._by_id[reservation.reservation_id] = reservation
+        for table_id in reservation.table_ids:
+            schedule = self._tables.get(table_id)
+            if schedule is None:
+                schedule = self._tables[table_id] = _TableSchedule()
+            schedule.insert(reservation)
+
+    def remove(self, reservation_id: str) -> Optional[Reservation]:
+        reservation = self._by_id.pop(reservation_id, None)
+        if reservation is not None:
+            for table_id in reservation.table_ids:
+                self._tables[table_id].remove(reservation)
+        return reservation
+
+    def conflict(self, table_id: str, start: float, end: float) -> Optional[Reservation]:
+        """A reservation on ``table_id`` overlapping ``[start, end)``, if any."""
+        schedule = self._tables.get(table_id)
+        return None if schedule is None else schedule.conflict(start, end)
+
+    def next_gap(self, table_id: str, after: float, length: float, padding: float = 0.0) -> float:
+        schedule = self._tables.get(table_id)
+        return after if schedule is None else schedule.next_gap(after, length, padding)
+
+    def on_table(self, table_id: str) -> List[Reservation]:
+        schedule = self._tables.get(table_id)
+        return [] if schedule is None else list(schedule.items)
+
+    def expire(self, before: float) -> int:
+        """Drop reservations that ended before ``before`` (e.g. no-shows); return how many."""
+        # A joined booking ends at the same time on each of its tables, so it expires from all of them.
+        expired = {r.reservation_id for schedule in self._tables.values() for r in schedule.expire(before)}
+        for reservation_id in expired:
+            del self._by_id[reservation_id]
+        return len(expired)
+
+    # --- Persistence (rides along in HotelManager.to_state) ---------------------------
+    def to_state(self) -> Dict[str, Any]:
+        return {"next_id": self.next_id, "bookings": [r.to_dict() for r in self]}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "ReservationBook":
+        return cls((Reservation.from_dict(data) for data in state["bookings"]), state["next_id"])
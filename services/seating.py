@@ -0,0 +1,271 @@
+"""Seating optimizer: best-fit tables, adjacent-table combinations and waitlist look-ahead."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from services.hotel import Table, TableIndex
+    from services.waitlist import Waitlist, WaitlistEntry
+
+# table id -> ids of tables that can be pushed together with it (kept symmetric)
+Adjacency = Dict[str, List[str]]
+
+COMBO_SEPARATOR = "+"
+
+# (table, party_size) -> whether the party may sit there now (e.g. not reserved soon); None allows every free table
+Availability = Optional[Callable[["Table", int], bool]]
+
+
+@dataclass(frozen=True)
+class SeatingPlan:
+    """One table, or several adjacent tables joined, for a party."""
+
+    tables: Tuple["Table", ...]
+    party_size: int
+
+    @property
+    def table_id(self) -> str:
+        return COMBO_SEPARATOR.join(t.table_id for t in self.tables)
+
+    @property
+    def seats(self) -> int:
+        return sum(t.seats for t in self.tables)
+
+    @property
+    def waste(self) -> int:
+        return self.seats - self.party_size
+
+    @property
+    def combined(self) -> bool:
+        return len(self.tables) > 1
+
+    def to_dict(self) -> dict:
+        if not self.combined:
+            return self.tables[0].to_dict()
+        return {
+            "id": self.table_id,
+            "seats": self.seats,
+            "type": "combined",
+            "status": "free",
+            "tables": [t.table_id for t in self.tables],
+        }
+
+
+@dataclass
+class SeatingOptimizer:
+    """
+    Chooses where a party sits.
+
+    A single table is always preferred when one fits, smallest first (fewest
+    wasted seats), ties in floor-plan order. Otherwise up to ``max_tables``
+    free tables that are connected in the adjacency graph are joined, again
+    minimizing wasted seats and then the number of tables.
+
+    With ``lookahead`` > 0, an arriving party's table is chosen so that as many
+    of the next ``lookahead`` waiting parties as possible still fit the tables
+    left free; when a table frees up, the best fit among the first
+    ``lookahead + 1`` waiting parties that fit is seated (so nobody is skipped
+    by more than ``lookahead`` parties).
+
+    ``available`` further restricts which free tables a given party may take;
+    ``HotelManager`` uses it to keep walk-ins off tables reserved before they
+    would finish.
+    """
+
+    lookahead: int = 0
+    max_tables: int = 3
+
+    def plan(
+        self,
+        index: "TableIndex",
+        adjacency: Adjacency,
+        party_size: int,
+        upcoming: Sequence[int] = (),
+        combine: bool = True,
+        available: Availability = None,
+    ) -> Optional[SeatingPlan]:
+        """Best seating among the free tables for a new party; ``upcoming`` are waiting party sizes."""
+        upcoming = upcoming[: self.lookahead]
+        if not upcoming:
+            if available is None:
+                table = index.best_fit(party_size)
+            else:
+                table = next((t for t in index.iter_free(party_size) if available(t, party_size)), None)
+            if table is not None:
+                return SeatingPlan((table,), party_size)
+        else:
+            candidates = _first_by_size(index, party_size, available)
+            if candidates:
+                counts = index.free_counts()
+
+                def score(table: "Table") -> Tuple[int, int, int]:
+                    left = dict(counts)
+                    left[table.seats] -= 1
+                    return (-_seatable(left, upcoming), table.seats, index.ordinal(table))
+
+                return SeatingPlan((min(candidates, key=score),), party_size)
+        if not combine or self.max_tables < 2:
+            return None
+        starts = [t for t in (index.get(table_id) for table_id in adjacency) if t is not None and index.is_free(t)]
+        usable = _usable(index, party_size, available)
+        return self._best(self._groups(index, adjacency, starts, party_size, usable), party_size)
+
+    def fill(
+        self,
+        index: "TableIndex",
+        adjacency: Adjacency,
+        freed: Sequence["Table"],
+        waitlist: "Waitlist",
+        available: Availability = None,
+    ) -> Optional[Tuple["WaitlistEntry", SeatingPlan]]:
+        """Pick the waiting party (and tables, including a freed one) to seat after a checkout."""
+        groups = list(self._groups(index, adjacency, freed))
+        if not groups or not waitlist:
+            return None
+        capacity = max(sum(t.seats for t in group) for group in groups)
+        if available is not None:
+            return self._fill_restricted(index, adjacency, freed, waitlist, capacity, available)
+        if self.lookahead:
+            entries = list(islice((e for e in waitlist if e.party_size <= capacity), self.lookahead + 1))
+        else:
+            entry = waitlist.first_fitting(capacity)
+            entries = [entry] if entry is not None else []
+        best: Optional[Tuple["WaitlistEntry", SeatingPlan]] = None
+        for entry in entries:
+            plan = self._best(groups, entry.party_size)
+            if plan is not None and (best is None or _key(plan) < _key(best[1])):
+                best = (entry, plan)
+        return best
+
+    def combinations(self, index: "TableIndex", adjacency: Adjacency, party_size: int) -> List[Tuple[str, ...]]:
+        """Ids of every group of adjacent tables, free or not, that ``plan`` could join for the party."""
+        if self.max_tables < 2:
+            return []
+        starts = [t for t in (index.get(table_id) for table_id in adjacency) if t is not None]
+        return [
+            tuple(t.table_id for t in group)
+            for group in self._groups(index, adjacency, starts, party_size, lambda table: True)
+            if len(group) > 1 and sum(t.seats for t in group) >= party_size
+        ]
+
+    def _fill_restricted(
+        self,
+        index: "TableIndex",
+        adjacency: Adjacency,
+        freed: Sequence["Table"],
+        waitlist: "Waitlist",
+        capacity: int,
+        available: Callable[["Table", int], bool],
+    ) -> Optional[Tuple["WaitlistEntry", SeatingPlan]]:
+        # Which tables a party may take depends on its size, so plans are built
+        # per distinct size (there are few) while walking the line in order.
+        plans: Dict[int, Optional[SeatingPlan]] = {}
+        best: Optional[Tuple["WaitlistEntry", SeatingPlan]] = None
+        considered = 0
+        for entry in waitlist:
+            size = entry.party_size
+            if size > capacity:
+                continue
+            if size not in plans:
+                usable = _usable(index, size, available)
+                plans[size] = self._best(self._groups(index, adjacency, freed, size, usable), size)
+            plan = plans[size]
+            if plan is None:
+                continue
+            if best is None or _key(plan) < _key(best[1]):
+                best = (entry, plan)
+            considered += 1
+            if considered > self.lookahead:
+                break
+        return best
+
+    def _best(self, groups: Iterable[Tuple["Table", ...]], party_size: int) -> Optional[SeatingPlan]:
+        best: Optional[SeatingPlan] = None
+        best_key = None
+        for group in groups:
+            if sum(t.seats for t in group) < party_size:
+                continue
+            plan = SeatingPlan(tuple(sorted(group, key=lambda t: t.table_id)), party_size)
+            key = (_key(plan), plan.table_id)
+            if best_key is None or key < best_key:
+                best, best_key = plan, key
+        return best
+
+    def _groups(
+        self,
+        index: "TableIndex",
+        adjacency: Adjacency,
+        starts: Iterable["Table"],
+        party_size: Optional[int] = None,
+        usable: Optional[Callable[["Table"], bool]] = None,
+    ) -> Iterator[Tuple["Table", ...]]:
+        """
+        Connected sets of free tables (up to ``max_tables``) containing one of
+        ``starts``. With ``party_size``, sets that already seat the party are
+        not grown further, since adding tables only adds waste. ``usable``
+        replaces the plain free check.
+        """
+        usable = usable or index.is_free
+        seen: Set[FrozenSet[str]] = set()
+        stack: List[Tuple["Table", ...]] = []
+        for table in starts:
+            if usable(table) and frozenset((table.table_id,)) not in seen:
+                seen.add(frozenset((table.table_id,)))
+                stack.append((table,))
+        while stack:
+            group = stack.pop()
+            yield group
+            if len(group) >= self.max_tables:
+                continue
+            if party_size is not None and sum(t.seats for t in group) >= party_size:
+                continue
+            ids = {t.table_id for t in group}
+            for member in group:
+                for neighbor_id in adjacency.get(member.table_id, ()):
+                    neighbor = index.get(neighbor_id)
+                    if neighbor is None or neighbor_id in ids or not usable(neighbor):
+                        continue
+                    key = frozenset(ids | {neighbor_id})
+                    if key not in seen:
+                        seen.add(key)
+                        stack.append(group + (neighbor,))
+
+
+def _key(plan: SeatingPlan) -> Tuple[bool, int, int]:
+    # Single tables before joined ones, then fewest wasted seats, then fewest tables.
+    return (plan.combined, plan.waste, len(plan.tables))
+
+
+def _usable(
+    index: "TableIndex", party_size: int, available: Availability
+) -> Optional[Callable[["Table"], bool]]:
+    if available is None:
+        return None
+    return lambda table: index.is_free(table) and available(table, party_size)
+
+
+def _first_by_size(index: "TableIndex", party_size: int, available: Availability) -> List["Table"]:
+    """The first free table of each seat count that fits and that the party may take."""
+    if available is None:
+        return index.free_by_size(party_size)
+    firsts: Dict[int, "Table"] = {}
+    for table in index.iter_free(party_size):
+        if table.seats not in firsts and available(table, party_size):
+            firsts[table.seats] = table
+    return list(firsts.values())
+
+
+def _seatable(free: Dict[int, int], parties: Sequence[int]) -> int:
+    """How many of ``parties``, seated in order at the smallest free table that fits, get a table."""
+    sizes = sorted(size for size, count in free.items() if count > 0)
+    seated = 0
+    for party in parties:
+        for size in sizes:
+            if size >= party and free[size] > 0:
+                free[size] -= 1
+                seated += 1
+                break
+    return seated
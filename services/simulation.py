@@ -0,0 +1,289 @@
+"""
+Discrete-event simulation of a service, for capacity planning offline.
+
+A ``HotelManager`` is driven on a ``VirtualClock``: parties arrive as a
+(piecewise) Poisson process, are seated through the manager's own seating
+policy or waitlisted (after being quoted ``estimate_wait_time``), dine for a
+log-normal duration and leave, which frees their tables to the waitlist.
+Parties that wait longer than their patience walk away. A ``booked_share`` of
+the parties reserve their arrival time before service opens and are seated
+at the reserved table when they turn up (as walk-ins if it is still taken).
+Nothing sleeps, so a five-hour service runs in well under a second.
+
+The arrivals, party sizes, dining times and patience are drawn up front from
+``seed``, so two runs with different floors or policies see the same guests.
+"""
+
+from __future__ import annotations
+
+import datetime
+import heapq
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from services.hotel import HotelManager
+from services.seating import COMBO_SEPARATOR
+
+DEFAULT_PARTY_MIX: Dict[int, float] = {1: 15, 2: 35, 3: 10, 4: 20, 5: 5, 6: 7, 8: 5, 10: 3}
+
+# A Friday night: (hours after opening, parties per hour) steps.
+FRIDAY_PROFILE: Tuple[Tuple[float, float], ...] = ((0.0, 18.0), (1.0, 36.0), (2.5, 28.0), (4.0, 10.0))
+
+
+class VirtualClock:
+    """Callable clock for ``HotelManager(clock=...)`` that only moves when told to."""
+
+    def __init__(self, start: datetime.datetime) -> None:
+        self.now = start
+
+    def __call__(self) -> datetime.datetime:
+        return self.now
+
+    def advance(self, to: datetime.datetime) -> None:
+        if to > self.now:
+            self.now = to
+
+
+@dataclass
+class SimulationConfig:
+    hours: float = 5.0
+    # A flat rate, or (hours after opening, rate) steps as in FRIDAY_PROFILE.
+    arrivals_per_hour: Union[float, Sequence[Tuple[float, float]]] = FRIDAY_PROFILE
+    party_sizes: Dict[int, float] = field(default_factory=lambda: dict(DEFAULT_PARTY_MIX))
+    dining_mean_minutes: float = 55.0
+    dining_sd_minutes: float = 12.0
+    dining_mean_by_size: Dict[int, float] = field(default_factory=dict)  # overrides dining_mean_minutes per party size
+    patience_minutes: Optional[float] = 45.0  # None: parties wait until seated
+    booked_share: float = 0.0  # share of parties that reserve ahead (drawn from its own stream)
+    start: datetime.datetime = datetime.datetime(2026, 1, 2, 17, 0)
+    seed: int = 0
+
+    def rate_at(self, hour: float) -> float:
+        if isinstance(self.arrivals_per_hour, (int, float)):
+            return float(self.arrivals_per_hour)
+        rate = 0.0
+        for since, step_rate in self.arrivals_per_hour:
+            if hour >= since:
+                rate = step_rate
+        return rate
+
+
+@dataclass
+class _Party:
+    name: str
+    size: int
+    arrival: float  # minutes after opening
+    dining: float
+    patience: Optional[float]
+    quoted: Optional[int] = None
+    seated: Optional[float] = None
+    booking: Optional[str] = None  # reservation id
+
+
+@dataclass
+class SimulationReport:
+    parties: int
+    covers: int  # guests seated
+    seated: int
+    walked_away: int
+    unserved: int  # still waiting when the simulation ran out of events
+    wait_mean: float  # minutes, over seated parties (0 for those seated on arrival)
+    wait_p50: float
+    wait_p90: float
+    wait_p99: float
+    eta_quotes: int  # waitlisted parties that were quoted an ETA and later seated
+    eta_mae: Optional[float]  # mean |actual - quoted| wait, minutes
+    eta_bias: Optional[float]  # mean (actual - quoted); > 0 means quotes were optimistic
+    eta_within_5: Optional[float]  # share of quotes within 5 minutes
+    table_utilization: float  # share of table-minutes occupied during service
+    seat_utilization: float  # guest-minutes / seat-minutes
+    wasted_seat_share: float  # seat-minutes held by parties but empty / seat-minutes
+    per_table: Dict[str, float]
+    reservations: int  # parties that booked ahead
+    reservations_delayed: int  # arrived to find their table still taken
+    simulated_seconds: float
+    wall_seconds: float
+
+    @property
+    def speedup(self) -> float:
+        """Simulated time per wall-clock time."""
+        return self.simulated_seconds / self.wall_seconds if self.wall_seconds else math.inf
+
+    def summary(self) -> List[str]:
+        lines = [
+            f"parties {self.parties}: seated {self.seated} ({self.covers} covers), "
+            f"walked away {self.walked_away}, unserved {self.unserved}",
+            f"wait minutes: mean {self.wait_mean:.1f}  p50 {self.wait_p50:.1f}  "
+            f"p90 {self.wait_p90:.1f}  p99 {self.wait_p99:.1f}",
+        ]
+        if self.eta_quotes:
+            lines.append(
+                f"ETA quotes ({self.eta_quotes}): MAE {self.eta_mae:.1f} min, bias {self.eta_bias:+.1f} min, "
+                f"{self.eta_within_5:.0%} within 5 min"
+            )
+        if self.reservations:
+            lines.append(f"reservations {self.reservations}: {self.reservations_delayed} found their table taken")
+        lines.append(
+            f"utilization: tables {self.table_utilization:.1%}, seats {self.seat_utilization:.1%}, "
+            f"wasted seats {self.wasted_seat_share:.1%}"
+        )
+        lines.append(f"simulated {self.simulated_seconds / 3600:.1f} h in {self.wall_seconds * 1e3:.0f} ms "
+                     f"({self.speedup:,.0f}x real time)")
+        return lines
+
+
+def _percentile(ordered: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending sequence (0 when empty)."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+def generate_parties(config: SimulationConfig) -> List[_Party]:
+    rng = random.Random(config.seed)
+    horizon = config.hours * 60
+    peak = max([config.rate_at(0.0), *(rate for _, rate in _steps(config))])
+    sizes, weights = zip(*config.party_sizes.items())
+
+    def dining(size: int) -> float:
+        mean = config.dining_mean_by_size.get(size, config.dining_mean_minutes)
+        sigma2 = math.log(1 + (config.dining_sd_minutes / mean) ** 2)
+        return max(10.0, rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2)))
+
+    parties: List[_Party] = []
+    minute = 0.0
+    while peak > 0:
+        minute += rng.expovariate(peak / 60)
+        if minute >= horizon:
+            break
+        if rng.random() * peak > config.rate_at(minute / 60):
+            continue  # thinning: fewer arrivals outside the peak
+        size = rng.choices(sizes, weights)[0]
+        parties.append(
+            _Party(
+                name=f"party-{len(parties) + 1}",
+                size=size,
+                arrival=minute,
+                dining=dining(size),
+                patience=None if config.patience_minutes is None else rng.uniform(0.5, 1.5) * config.patience_minutes,
+            )
+        )
+    return parties
+
+
+def _steps(config: SimulationConfig) -> Sequence[Tuple[float, float]]:
+    return () if isinstance(config.arrivals_per_hour, (int, float)) else config.arrivals_per_hour
+
+
+def simulate(config: SimulationConfig, manager: Optional[HotelManager] = None) -> SimulationReport:
+    """Run one service against ``manager`` (default floor if omitted); its clock is replaced."""
+    wall_start = time.perf_counter()
+    clock = VirtualClock(config.start)
+    manager = manager or HotelManager()
+    manager.clock = clock
+    horizon = config.hours * 60
+
+    parties = {p.name: p for p in generate_parties(config)}
+    events: List[Tuple[float, int, str, str]] = []  # (minute, seq, kind, party name)
+    for seq, party in enumerate(parties.values()):
+        events.append((party.arrival, seq, "arrive", party.name))
+    heapq.heapify(events)
+    seq = len(events)
+    seated_at: Dict[str, List[str]] = {}
+    table_minutes: Dict[str, float] = {t.table_id: 0.0 for t in manager.tables}
+    guest_minutes = held_minutes = 0.0
+    walked_away = 0
+    delayed = 0
+    end_minute = 0.0
+    if config.booked_share:
+        booker = random.Random(config.seed + 1)
+        for party in parties.values():
+            if booker.random() < config.booked_share:
+                at = config.start + datetime.timedelta(minutes=party.arrival)
+                result = manager.add_reservation(party.name, party.size, at.isoformat())
+                if result["success"]:
+                    party.booking = result["reservation"]["id"]
+
+    def schedule(minute: float, kind: str, name: str) -> None:
+        nonlocal seq
+        seq += 1
+        heapq.heappush(events, (minute, seq, kind, name))
+
+    def seat(party: _Party, table_ids: List[str], minute: float) -> None:
+        nonlocal guest_minutes, held_minutes
+        party.seated = minute
+        seated_at[party.name] = table_ids
+        busy = max(0.0, min(minute + party.dining, horizon) - minute)
+        seats = 0
+        for table_id in table_ids:
+            table = manager._find_table(table_id)
+            seats += table.seats
+            table_minutes[table_id] = table_minutes.get(table_id, 0.0) + busy
+        guest_minutes += party.size * busy
+        held_minutes += seats * busy
+        schedule(minute + party.dining, "leave", party.name)
+
+    while events:
+        minute, _, kind, name = heapq.heappop(events)
+        end_minute = minute
+        clock.advance(config.start + datetime.timedelta(minutes=minute))
+        party = parties[name]
+        if kind == "arrive":
+            if party.booking is not None:
+                result = manager.seat_reservation(party.booking)
+                if result["success"]:
+                    seat(party, result["table"].split(COMBO_SEPARATOR), minute)
+                    continue
+                delayed += 1
+                manager.cancel_reservation(party.booking)
+            plan = manager.find_seating(party.size)
+            if plan is not None:
+                manager.seat(plan, party.name)
+                seat(party, [t.table_id for t in plan.tables], minute)
+                continue
+            party.quoted = manager.estimate_wait_time(party.size)
+            manager.add_to_waitlist(party.name, party.size)
+            if party.patience is not None:
+                schedule(minute + party.patience, "give_up", party.name)
+        elif kind == "leave":
+            result = manager.checkout_and_fill_waitlist(seated_at[party.name][0])
+            if result.get("assigned_guest"):
+                seat(
+                    parties[result["assigned_guest"]["name"]],
+                    result["assigned_table"].split(COMBO_SEPARATOR),
+                    minute,
+                )
+        elif kind == "give_up" and party.seated is None:
+            if manager.remove_from_waitlist(party.name)["success"]:
+                walked_away += 1
+
+    seated = [p for p in parties.values() if p.seated is not None]
+    waits = sorted(p.seated - p.arrival for p in seated)
+    errors = [(p.seated - p.arrival) - p.quoted for p in seated if p.quoted is not None]
+    seat_capacity = sum(t.seats for t in manager.tables) * horizon
+    return SimulationReport(
+        parties=len(parties),
+        covers=sum(p.size for p in seated),
+        seated=len(seated),
+        walked_away=walked_away,
+        unserved=len(parties) - len(seated) - walked_away,
+        wait_mean=sum(waits) / len(waits) if waits else 0.0,
+        wait_p50=_percentile(waits, 50),
+        wait_p90=_percentile(waits, 90),
+        wait_p99=_percentile(waits, 99),
+        eta_quotes=len(errors),
+        eta_mae=sum(abs(e) for e in errors) / len(errors) if errors else None,
+        eta_bias=sum(errors) / len(errors) if errors else None,
+        eta_within_5=sum(abs(e) <= 5 for e in errors) / len(errors) if errors else None,
+        table_utilization=sum(table_minutes.values()) / (len(table_minutes) * horizon) if table_minutes else 0.0,
+        seat_utilization=guest_minutes / seat_capacity if seat_capacity else 0.0,
+        wasted_seat_share=(held_minutes - guest_minutes) / seat_capacity if seat_capacity else 0.0,
+        per_table={table_id: minutes / horizon for table_id, minutes in table_minutes.items()},
+        reservations=sum(p.booking is not None for p in parties.values()),
+        reservations_delayed=delayed,
+        simulated_seconds=end_minute * 60,
+        wall_seconds=time.perf_counter() - wall_start,
+    )
@@ -0,0 +1,164 @@
+"""
+Storage behind the venue registry.
+
+``InProcessBackend`` keeps venue state in this process (one uvicorn worker).
+``SqliteBackend`` keeps it in a SQLite file in WAL mode so several worker
+processes on one host can share a venue. Both use optimistic versioning: a
+save names the version it was based on and fails with ``VersionConflict`` if
+another writer got there first; the registry then reloads and retries.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+
+class VersionConflict(Exception):
+    """Raised when a save is based on a version that is no longer current."""
+
+
+@dataclass(frozen=True)
+class VersionedState:
+    version: int
+    state: Dict[str, Any]
+
+
+class StateBackend(ABC):
+    # True when other processes can write the same venues, so readers must check versions.
+    shared: bool = False
+    # True when saved state outlives the process, so a manager can be dropped and reloaded.
+    durable: bool = False
+
+    @abstractmethod
+    def version(self, venue_id: str) -> int:
+        """Current version of a venue, 0 if it has never been saved."""
+
+    def versions(self, venue_ids: Iterable[str]) -> Dict[str, int]:
+        return {venue_id: self.version(venue_id) for venue_id in venue_ids}
+
+    @abstractmethod
+    def load(self, venue_id: str) -> Optional[VersionedState]:
+        ...
+
+    @abstractmethod
+    def save(self, venue_id: str, state: Dict[str, Any], expected_version: int) -> int:
+        """Store ``state`` if the venue is still at ``expected_version``; return the new version."""
+
+    def close(self) -> None:
+        pass
+
+
+class InProcessBackend(StateBackend):
+    """
+    Versioned state in a dict. Nothing outside the process reads it, so the
+    registry does not save to it: the resident managers are the state.
+    """
+
+    def __init__(self) -> None:
+        self._states: Dict[str, VersionedState] = {}
+
+    def version(self, venue_id: str) -> int:
+        current = self._states.get(venue_id)
+        return current.version if current else 0
+
+    def load(self, venue_id: str) -> Optional[VersionedState]:
+        return self._states.get(venue_id)
+
+    def save(self, venue_id: str, state: Dict[str, Any], expected_version: int) -> int:
+        if self.version(venue_id) != expected_version:
+            raise VersionConflict(venue_id)
+        self._states[venue_id] = VersionedState(expected_version + 1, state)
+        return expected_version + 1
+
+
+class SqliteBackend(StateBackend):
+    """
+    Venue state as JSON rows in a SQLite database shared by worker processes.
+
+    Each statement runs in autocommit mode; the compare-and-set on ``version``
+    makes a save atomic without holding a write lock across the caller's work.
+    State survives restarts and registry eviction.
+
+    Calls block: a save can wait up to ``timeout`` for another writer. The
+    registry's async paths (``transaction_async``, ``poll_async``) run them in
+    a worker thread; ``version``/``load`` on the synchronous read path are
+    WAL snapshot reads, which do not wait for writers.
+    """
+
+    shared = True
+    durable = True
+
+    def __init__(self, path: Union[str, Path], timeout: float = 5.0) -> None:
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS venue_state ("
+            " venue_id TEXT PRIMARY KEY,"
+            " version INTEGER NOT NULL,"
+            " state TEXT NOT NULL)"
+        )
+
+    def version(self, venue_id: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM venue_state WHERE venue_id = ?", (venue_id,)).fetchone()
+        return row[0] if row else 0
+
+    def versions(self, venue_ids: Iterable[str]) -> Dict[str, int]:
+        ids = list(venue_ids)
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT venue_id, version FROM venue_state WHERE venue_id IN ({placeholders})", ids
+            ).fetchall()
+        found = dict(rows)
+        return {venue_id: found.get(venue_id, 0) for venue_id in ids}
+
+    def load(self, venue_id: str) -> Optional[VersionedState]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, state FROM venue_state WHERE venue_id = ?", (venue_id,)
+            ).fetchone()
+        return VersionedState(row[0], json.loads(row[1])) if row else None
+
+    def save(self, venue_id: str, state: Dict[str, Any], expected_version: int) -> int:
+        body = json.dumps(state, separators=(",", ":"))
+        with self._lock:
+            if expected_version == 0:
+                cursor = self._conn.execute(
+                    "INSERT INTO venue_state (venue_id, version, state) VALUES (?, 1, ?)"
+                    " ON CONFLICT(venue_id) DO NOTHING",
+                    (venue_id, body),
+                )
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE venue_state SET version = version + 1, state = ?"
+                    " WHERE venue_id = ? AND version = ?",
+                    (body, venue_id, expected_version),
+                )
+        if cursor.rowcount != 1:
+            raise VersionConflict(venue_id)
+        return expected_version + 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def backend_from_url(url: str) -> StateBackend:
+    """``memory`` (default) or ``sqlite:///path/to/state.db``."""
+    if not url or url == "memory":
+        return InProcessBackend()
+    if url.startswith("sqlite:///"):
+        return SqliteBackend(url[len("sqlite:///"):])
+    raise ValueError(f"Unknown state backend {url!r}; expected 'memory' or 'sqlite:///<path>'")
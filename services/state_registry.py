@@ -1,35 +1,490 @@
 from __future__ import annotations
 
+import asyncio
 import contextvars
-from typing import Dict
+import logging
+import sys
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 
 from services.hotel import HotelManager
+from services.journal import Journal
+from services.seating import SeatingOptimizer
+from services.state_backend import InProcessBackend, StateBackend, VersionConflict, VersionedState
 
 
-_managers: Dict[str, HotelManager] = {}
+DEFAULT_VENUE = "mg_cafe"
+
+EvictionListener = Callable[[str, HotelManager, str], None]  # (venue_id, manager, reason)
+SessionListener = Callable[[str, str, str], None]  # (session_id, venue_id, reason)
+T = TypeVar("T")
+
+
+class VenueLimitError(RuntimeError):
+    """A new venue was refused: the registry is at its cap and nothing can be evicted."""
+
+
+def estimate_bytes(manager: HotelManager) -> int:
+    """Rough shallow size of a manager's tables and waitlist (object headers + attribute values)."""
+    total = sys.getsizeof(manager) + sys.getsizeof(manager.tables) + sys.getsizeof(manager.waitlist)
+    for obj in (*manager.tables, *manager.waitlist):
+        total += sys.getsizeof(obj) + sum(sys.getsizeof(getattr(obj, f.name)) for f in fields(obj))
+    return total
+
+
+@dataclass
+class _Binding:
+    last_access: float
+    pins: int = 0
+
+
+@dataclass
+class _Entry:
+    manager: HotelManager
+    last_access: float
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    sessions: Dict[str, _Binding] = field(default_factory=dict)
+    size: int = 0
+    version: int = 0  # backend version the manager reflects
+
+    @property
+    def pinned(self) -> bool:
+        return any(binding.pins for binding in self.sessions.values())
+
+
+@dataclass
+class SessionRegistry:
+    """
+    LRU registry of per-venue HotelManagers shared by every session at that venue.
+
+    Each venue tracks the sessions bound to it. A released session expires
+    after ``ttl_seconds`` idle and is reported to session listeners so
+    per-session state elsewhere (e.g. the ADK session) can be dropped.
+
+    A venue's floor is business state, not a cache entry, so its manager is
+    only evicted when a durable copy exists (a durable backend, or a journal to
+    recover from). Such venues are evicted once idle for ``ttl_seconds``, and
+    the least recently used ones while the registry is over ``max_entries`` or
+    ``max_bytes`` (0 disables a limit). Other venues stay resident, so once
+    the caps are reached and nothing can be evicted, a new venue is refused
+    with ``VenueLimitError``. A venue with a live connection
+    (``acquire``/``release``) is never evicted; the idle clock restarts when
+    the last connection is released.
+
+    With a shared or durable backend, managers are write-through caches:
+    mutations go through ``transaction`` (or ``transaction_async``, which does
+    the backend I/O in a worker thread), which saves with optimistic versioning
+    and retries on conflict, and reads first pick up versions written by other
+    processes (``get_async``/``acquire_async`` read in a worker thread). A
+    process-local backend is never saved to.
+
+    With ``journal_dir`` set (and a process-local backend), each venue keeps a
+    write-ahead journal in ``journal_dir/<venue_id>``; a venue is recovered from
+    it when first loaded, so neither a restart nor eviction loses its state.
+    """
+
+    ttl_seconds: float = 3600.0
+    max_entries: int = 1000
+    max_bytes: int = 0
+    clock: Callable[[], float] = time.monotonic
+    backend: StateBackend = field(default_factory=InProcessBackend)
+    max_retries: int = 8
+    journal_dir: Optional[Path] = None
+    journal_options: Dict[str, Any] = field(default_factory=dict)
+    seating: SeatingOptimizer = field(default_factory=SeatingOptimizer)  # shared by every venue's manager
+    conflicts: int = field(default=0, init=False)
+    refused: int = field(default=0, init=False)  # new venues turned away at the caps
+    _entries: "OrderedDict[str, _Entry]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _listeners: List[EvictionListener] = field(default_factory=list, init=False, repr=False)
+    _session_listeners: List[SessionListener] = field(default_factory=list, init=False, repr=False)
+    _bytes: int = field(default=0, init=False, repr=False)
+    evictions: Counter = field(default_factory=Counter, init=False)
+
+    def configure(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None,
+                  max_bytes: Optional[int] = None, backend: Optional[StateBackend] = None,
+                  journal_dir: Optional[Path] = None, seating: Optional[SeatingOptimizer] = None,
+                  **journal_options: Any) -> None:
+        if backend is not None or journal_dir is not None:
+            if self._entries:
+                raise RuntimeError("Cannot switch state storage while venues are resident")
+        if backend is not None:
+            self.backend.close()
+            self.backend = backend
+        if journal_dir is not None:
+            self.journal_dir = Path(journal_dir)
+            self.journal_options.update(journal_options)
+        if seating is not None:
+            self.seating = seating
+            for entry in self._entries.values():
+                entry.manager.seating = seating
+        if ttl_seconds is not None:
+            self.ttl_seconds = ttl_seconds
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self.sweep()
+
+    def add_eviction_listener(self, listener: EvictionListener) -> None:
+        self._listeners.append(listener)
+
+    def add_session_listener(self, listener: SessionListener) -> None:
+        self._session_listeners.append(listener)
+
+    def get(self, venue_id: str) -> HotelManager:
+        """
+        Get or create the manager for a venue, up to date with the backend, and
+        mark it most recently used. Backend reads block; use ``get_async`` on the
+        event loop.
+        """
+        entry = self._touch(venue_id)
+        self._sync(venue_id, entry)
+        return entry.manager
+
+    async def get_async(self, venue_id: str) -> HotelManager:
+        """``get`` with the backend read in a worker thread."""
+        entry = self._touch(venue_id)
+        await self._sync_async(venue_id, entry)
+        return entry.manager
+
+    def transaction(self, venue_id: str, fn: Callable[[HotelManager], T]) -> T:
+        """
+        Apply ``fn`` to the venue's manager and persist the result. If another
+        writer saved first, reload its state and run ``fn`` again. Backend I/O
+        runs on the calling thread; use ``transaction_async`` on the event loop.
+        """
+        entry = self._touch(venue_id)
+        if not self._persisted:
+            return fn(entry.manager)  # the manager is the only copy (a journal records the change)
+        for _ in range(self.max_retries + 1):
+            self._sync(venue_id, entry)
+            manager = entry.manager
+            generation = manager.generation
+            result = fn(manager)
+            if manager.generation == generation:
+                return result  # read-only or rejected; nothing to save
+            try:
+                entry.version = self.backend.save(venue_id, manager.to_state(), entry.version)
+                return result
+            except VersionConflict:
+                self.conflicts += 1
+        raise VersionConflict(f"{venue_id}: gave up after {self.max_retries} retries")
+
+    async def transaction_async(self, venue_id: str, fn: Callable[[HotelManager], T]) -> T:
+        """
+        ``transaction`` with the backend reads and saves in a worker thread. The
+        venue lock is held across them, so concurrent mutations of the venue
+        cannot interleave with a save in flight.
+        """
+        entry = self._touch(venue_id)
+        if not self._persisted:
+            return fn(entry.manager)
+        async with entry.lock:
+            for _ in range(self.max_retries + 1):
+                self._apply(entry, await asyncio.to_thread(self._fetch, venue_id, entry.version))
+                manager = entry.manager
+                generation = manager.generation
+                result = fn(manager)
+                if manager.generation == generation:
+                    return result
+                state = manager.to_state()
+                try:
+                    entry.version = await asyncio.to_thread(self.backend.save, venue_id, state, entry.version)
+                    return result
+                except VersionConflict:
+                    self.conflicts += 1
+        raise VersionConflict(f"{venue_id}: gave up after {self.max_retries} retries")
+
+    def poll(self) -> int:
+        """Reload resident venues that another process changed; returns how many were reloaded."""
+        if not self.backend.shared or not self._entries:
+            return 0
+        stale = self._stale(self.backend.versions(list(self._entries)))
+        for venue_id in stale:
+            self._sync(venue_id, self._entries[venue_id])
+        return len(stale)
+
+    async def poll_async(self) -> int:
+        """``poll`` with the backend reads in a worker thread; venues mid-transaction are left for later."""
+        if not self.backend.shared or not self._entries:
+            return 0
+        stale = self._stale(await asyncio.to_thread(self.backend.versions, list(self._entries)))
+        reloaded = 0
+        for venue_id in stale:
+            entry = self._entries.get(venue_id)
+            if entry is None or entry.lock.locked():
+                continue
+            self._apply(entry, await asyncio.to_thread(self._fetch, venue_id, entry.version))
+            reloaded += 1
+        return reloaded
+
+    def peek(self, venue_id: str) -> Optional[HotelManager]:
+        entry = self._entries.get(venue_id)
+        return entry.manager if entry else None
+
+    def acquire(self, venue_id: str, session_id: str) -> HotelManager:
+        """Bind a session to a venue and pin both for the lifetime of a connection."""
+        entry = self._touch(venue_id)
+        self._sync(venue_id, entry)
+        return self._pin(entry, session_id)
+
+    async def acquire_async(self, venue_id: str, session_id: str) -> HotelManager:
+        """``acquire`` with the backend read in a worker thread."""
+        entry = self._touch(venue_id)
+        manager = self._pin(entry, session_id)  # before awaiting, so a sweep cannot evict it meanwhile
+        await self._sync_async(venue_id, entry)
+        return manager
+
+    def _pin(self, entry: _Entry, session_id: str) -> HotelManager:
+        binding = entry.sessions.setdefault(session_id, _Binding(entry.last_access))
+        binding.pins += 1
+        binding.last_access = entry.last_access
+        return entry.manager
+
+    def release(self, venue_id: str, session_id: str) -> None:
+        """Drop a connection pin; the session and venue start aging once nothing holds them."""
+        entry = self._entries.get(venue_id)
+        if entry is None:
+            return
+        now = self.clock()
+        binding = entry.sessions.get(session_id)
+        if binding is not None:
+            binding.pins = max(0, binding.pins - 1)
+            binding.last_access = now
+        entry.last_access = now
+        self._entries.move_to_end(venue_id)
+        self._resize(entry)
+        self.sweep(now)
+
+    def evict(self, venue_id: str, reason: str = "manual") -> bool:
+        """Drop a venue's manager (reloaded on next use); refused unless a durable copy exists."""
+        entry = self._entries.get(venue_id)
+        if entry is None or not self._durable(entry):
+            return False
+        del self._entries[venue_id]
+        self._bytes -= entry.size
+        self.evictions[reason] += 1
+        if entry.manager.journal is not None:
+            entry.manager.journal.close()
+            entry.manager.attach_journal(None)
+        for session_id in list(entry.sessions):
+            self._end_session(session_id, venue_id, reason)
+        for listener in list(self._listeners):
+            listener(venue_id, entry.manager, reason)
+        return True
+
+    def sweep(self, now: Optional[float] = None, keep: Optional[str] = None) -> int:
+        """Expire idle sessions, then evict expired and (while over a cap) LRU venues that are durable."""
+        now = self.clock() if now is None else now
+        if self.ttl_seconds:
+            for venue_id, entry in self._entries.items():
+                for session_id, binding in list(entry.sessions.items()):
+                    if not binding.pins and now - binding.last_access >= self.ttl_seconds:
+                        del entry.sessions[session_id]
+                        self._end_session(session_id, venue_id, "ttl")
+        evicted = 0
+        # Oldest first; stop at the first idle entry that is still fresh.
+        for venue_id in list(self._entries):
+            entry = self._entries[venue_id]
+            if entry.pinned or venue_id == keep or not self._durable(entry):
+                continue
+            if not self.ttl_seconds or now - entry.last_access < self.ttl_seconds:
+                break
+            evicted += self.evict(venue_id, "ttl")
+        if self._over_capacity():
+            for venue_id in list(self._entries):
+                if not self._over_capacity():
+                    break
+                entry = self._entries[venue_id]
+                if entry.pinned or venue_id == keep or not self._durable(entry):
+                    continue
+                reason = "max_entries" if self.max_entries and len(self._entries) > self.max_entries else "max_bytes"
+                evicted += self.evict(venue_id, reason)
+        return evicted
+
+    def close(self) -> None:
+        """Flush and close venue journals (on shutdown)."""
+        for entry in self._entries.values():
+            if entry.manager.journal is not None:
+                entry.manager.journal.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, venue_id: str) -> bool:
+        return venue_id in self._entries
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "venues": len(self._entries),
+            "sessions": sum(len(entry.sessions) for entry in self._entries.values()),
+            "connected": sum(
+                1 for entry in self._entries.values() for binding in entry.sessions.values() if binding.pins
+            ),
+            "bytes": self._bytes,
+            "evictions": dict(self.evictions),
+            "conflicts": self.conflicts,
+            "refused": self.refused,
+        }
+
+    def _touch(self, venue_id: str) -> _Entry:
+        entry = self._entries.get(venue_id)
+        now = self.clock()
+        if entry is None:
+            entry = self._entries[venue_id] = _Entry(self._new_manager(venue_id), now)
+            entry.manager.event_source = get_current_session  # set after journal replay
+            self._resize(entry)
+            self.sweep(now, keep=venue_id)
+            if self._over_capacity():
+                # Venue ids come from clients; refuse the new one rather than grow without bound.
+                del self._entries[venue_id]
+                self._bytes -= entry.size
+                if entry.manager.journal is not None:
+                    entry.manager.journal.close()
+                self.refused += 1
+                raise VenueLimitError(f"Venue limit reached; {venue_id!r} was not loaded")
+        else:
+            entry.last_access = now
+            self._entries.move_to_end(venue_id)
+        return entry
+
+    def _new_manager(self, venue_id: str) -> HotelManager:
+        manager = HotelManager(seating=self.seating)
+        if self.journal_dir is None:
+            return manager
+        if self.backend.shared:
+            logging.getLogger(__name__).warning("Journaling is skipped with a shared state backend")
+            return manager
+        journal = Journal(self.journal_dir / venue_id, **self.journal_options)
+        stats = journal.recover(manager)
+        if stats.snapshot_seq or stats.replayed:
+            logging.getLogger(__name__).info(
+                "Recovered venue %s: snapshot @%d + %d records in %.1f ms",
+                venue_id, stats.snapshot_seq, stats.replayed, stats.seconds * 1e3,
+            )
+        manager.attach_journal(journal)
+        return manager
+
+    @property
+    def _persisted(self) -> bool:
+        return self.backend.shared or self.backend.durable
+
+    def _durable(self, entry: _Entry) -> bool:
+        return self.backend.durable or entry.manager.journal is not None
+
+    def _stale(self, versions: Dict[str, int]) -> List[str]:
+        return [
+            venue_id
+            for venue_id, version in versions.items()
+            if venue_id in self._entries and version != self._entries[venue_id].version
+        ]
+
+    def _sync(self, venue_id: str, entry: _Entry) -> None:
+        if self._persisted:
+            self._apply(entry, self._fetch(venue_id, entry.version))
+
+    async def _sync_async(self, venue_id: str, entry: _Entry) -> None:
+        if self._persisted:
+            # Under the venue lock, so a reload never lands between a transaction's change and its save.
+            async with entry.lock:
+                self._apply(entry, await asyncio.to_thread(self._fetch, venue_id, entry.version))
+
+    def _fetch(self, venue_id: str, version: int) -> Optional[VersionedState]:
+        """The backend's state if it moved past ``version`` (blocking I/O); None if unchanged."""
+        if self.backend.version(venue_id) == version:
+            return None
+        return self.backend.load(venue_id) or VersionedState(0, {})
+
+    def _apply(self, entry: _Entry, current: Optional[VersionedState]) -> None:
+        if current is None:
+            return
+        if current.version:
+            entry.manager.load_state(current.state)
+        entry.version = current.version
+
+    def _end_session(self, session_id: str, venue_id: str, reason: str) -> None:
+        for listener in list(self._session_listeners):
+            listener(session_id, venue_id, reason)
+
+    def _resize(self, entry: _Entry) -> None:
+        size = estimate_bytes(entry.manager)
+        self._bytes += size - entry.size
+        entry.size = size
+
+    def _over_capacity(self) -> bool:
+        return bool(
+            (self.max_entries and len(self._entries) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        )
+
+
+registry = SessionRegistry()
 _current_session_id: contextvars.ContextVar[str | None] = contextvars.ContextVar(
     "current_session_id", default=None
 )
+_current_venue_id: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_venue_id", default=DEFAULT_VENUE
+)
+
 
+def ensure_manager(venue_id: str = DEFAULT_VENUE) -> HotelManager:
+    """Get or create the shared HotelManager for a venue."""
+    return registry.get(venue_id)
 
-def ensure_manager(session_id: str) -> HotelManager:
-    """Get or create a HotelManager for the session."""
-    if session_id not in _managers:
-        _managers[session_id] = HotelManager()
-    return _managers[session_id]
 
+async def ensure_manager_async(venue_id: str = DEFAULT_VENUE) -> HotelManager:
+    """``ensure_manager`` for the event loop: backend reads run in a worker thread."""
+    return await registry.get_async(venue_id)
 
-def get_manager(session_id: str) -> HotelManager:
-    return ensure_manager(session_id)
 
+def get_manager(venue_id: str = DEFAULT_VENUE) -> HotelManager:
+    return ensure_manager(venue_id)
 
-def set_current_session(session_id: str) -> None:
+
+def acquire_manager(venue_id: str, session_id: str) -> HotelManager:
+    """Bind a session to its venue and keep both resident until ``release_manager``."""
+    return registry.acquire(venue_id, session_id)
+
+
+async def acquire_manager_async(venue_id: str, session_id: str) -> HotelManager:
+    """``acquire_manager`` for the event loop: backend reads run in a worker thread."""
+    return await registry.acquire_async(venue_id, session_id)
+
+
+def release_manager(venue_id: str, session_id: str) -> None:
+    registry.release(venue_id, session_id)
+
+
+def set_current_session(session_id: str, venue_id: str = DEFAULT_VENUE) -> None:
+    """Bind the running context (and tasks created from it) to a session and its venue."""
     _current_session_id.set(session_id)
+    _current_venue_id.set(venue_id)
+
+
+def get_current_session() -> str | None:
+    return _current_session_id.get()
+
+
+def get_current_venue() -> str:
+    return _current_venue_id.get()
 
 
 def get_current_manager() -> HotelManager:
-    session_id = _current_session_id.get()
-    if not session_id:
-        # Fallback to a shared manager if no session context is set.
-        return ensure_manager("__default__")
-    return ensure_manager(session_id)
+    return ensure_manager(get_current_venue())
+
+
+async def get_current_manager_async() -> HotelManager:
+    return await ensure_manager_async(get_current_venue())
+
+
+def run_transaction(fn: Callable[[HotelManager], T], venue_id: Optional[str] = None) -> T:
+    """Apply a mutation to the (current) venue's manager and persist it; see ``SessionRegistry.transaction``."""
+    return registry.transaction(venue_id or get_current_venue(), fn)
+
+
+async def run_transaction_async(fn: Callable[[HotelManager], T], venue_id: Optional[str] = None) -> T:
+    """``run_transaction`` for the event loop: backend I/O runs in a worker thread."""
+    return await registry.transaction_async(venue_id or get_current_venue(), fn)
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from google.adk.tools.function_tool import FunctionTool
 
-from services.state_registry import get_current_manager
+from services.state_registry import run_transaction_async
 
 
-def _update_reservation(
+async def _update_reservation(
     scope: str,
     name: str,
     party_size: int,
@@ -19,7 +19,10 @@ def _update_reservation(
     party_size: new party size (also used to confirm identity)
     table_id: required when scope="table"
     """
-    manager = get_current_manager()
+    return await run_transaction_async(lambda manager: _apply_update(manager, scope, name, party_size, table_id))
+
+
+def _apply_update(manager, scope: str, name: str, party_size: int, table_id: str) -> dict:
     if scope == "table":
         if not table_id:
             return {"success": False, "message": "table_id is required for table updates."}
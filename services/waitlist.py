@@ -0,0 +1,192 @@
+"""FIFO waitlist indexed by guest name and party size."""
+
+from __future__ import annotations
+
+import heapq
+import sys
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import MutableSequence
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union, overload
+
+
+@dataclass(slots=True)
+class WaitlistEntry:
+    name: str
+    party_size: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "party_size": self.party_size}
+
+
+def _key(name: str) -> str:
+    return name.lower()
+
+
+class Waitlist(MutableSequence):
+    """
+    Waiting parties in arrival order, usable anywhere a ``List[WaitlistEntry]`` was.
+
+    Every entry gets an increasing ticket; entries live in a ticket-ordered dict,
+    so iteration is FIFO and removal is O(1). Tickets are also indexed by
+    normalized name (O(1) lookup) and in a min-heap per party size, so the
+    earliest party that fits a freed table is found in O(log n) per size bucket
+    (stale heap items are skipped lazily). Resizing an entry keeps its ticket,
+    so it does not lose its place in line.
+
+    Positional access (``waitlist[i]``, ``insert``) still works but is O(n).
+    Entries edited in place from outside must be followed by ``rebuild()``.
+    """
+
+    def __init__(self, entries: Iterable[WaitlistEntry] = ()) -> None:
+        self.rebuild(entries)
+
+    def rebuild(self, entries: Optional[Iterable[WaitlistEntry]] = None) -> None:
+        entries = list(self._entries.values()) if entries is None else list(entries)
+        self._entries: Dict[int, WaitlistEntry] = {}
+        self._tickets: Dict[int, int] = {}  # id(entry) -> ticket
+        self._by_name: Dict[str, List[int]] = {}  # normalized name -> tickets, ascending
+        self._by_size: Dict[int, List[int]] = {}  # party size -> min-heap of tickets
+        self._sizes: List[int] = []  # sorted party sizes with a heap
+        self._next_ticket = 0
+        for entry in entries:
+            self.append(entry)
+
+    # --- Indexed operations -------------------------------------------------------
+    def append(self, entry: WaitlistEntry) -> None:
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        self._entries[ticket] = entry
+        self._tickets[id(entry)] = ticket
+        self._by_name.setdefault(_key(entry.name), []).append(ticket)
+        self._push_size(entry.party_size, ticket)
+
+    def find(self, name: str) -> Optional[WaitlistEntry]:
+        """Earliest entry whose name matches case-insensitively."""
+        tickets = self._by_name.get(_key(name))
+        return self._entries[tickets[0]] if tickets else None
+
+    def first_fitting(self, seats: int) -> Optional[WaitlistEntry]:
+        """Earliest entry with ``party_size <= seats``."""
+        best: Optional[int] = None
+        for size in self._sizes[: bisect_right(self._sizes, seats)]:
+            ticket = self._head(size)
+            if ticket is not None and (best is None or ticket < best):
+                best = ticket
+        return None if best is None else self._entries[best]
+
+    def discard(self, entry: WaitlistEntry) -> bool:
+        """Remove ``entry`` (by identity); return whether it was waiting."""
+        ticket = self._tickets.pop(id(entry), None)
+        if ticket is None:
+            return False
+        del self._entries[ticket]
+        tickets = self._by_name[_key(entry.name)]
+        del tickets[bisect_left(tickets, ticket)]
+        if not tickets:
+            del self._by_name[_key(entry.name)]
+        # The size heap keeps the ticket until it surfaces; _head drops it then.
+        return True
+
+    def resize(self, entry: WaitlistEntry, party_size: int) -> None:
+        """Change a waiting party's size without moving it in line."""
+        ticket = self._tickets[id(entry)]
+        if entry.party_size != party_size:
+            entry.party_size = party_size
+            self._push_size(party_size, ticket)
+
+    def _push_size(self, size: int, ticket: int) -> None:
+        heap = self._by_size.get(size)
+        if heap is None:
+            heap = self._by_size[size] = []
+            insort(self._sizes, size)
+        heapq.heappush(heap, ticket)
+        if len(heap) > 2 * len(self._entries) + 16:
+            heap[:] = [t for t in heap if self._live(t, size)]
+            heapq.heapify(heap)
+
+    def _live(self, ticket: int, size: int) -> bool:
+        entry = self._entries.get(ticket)
+        return entry is not None and entry.party_size == size
+
+    def _head(self, size: int) -> Optional[int]:
+        heap = self._by_size[size]
+        while heap and not self._live(heap[0], size):
+            heapq.heappop(heap)
+        if heap:
+            return heap[0]
+        del self._by_size[size]
+        del self._sizes[bisect_left(self._sizes, size)]
+        return None
+
+    # --- List API -------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[WaitlistEntry]:
+        return iter(self._entries.values())
+
+    def __contains__(self, entry: object) -> bool:
+        return id(entry) in self._tickets or any(e == entry for e in self)
+
+    @overload
+    def __getitem__(self, index: int) -> WaitlistEntry: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[WaitlistEntry]: ...
+    def __getitem__(self, index: Union[int, slice]) -> Union[WaitlistEntry, List[WaitlistEntry]]:
+        return list(self._entries.values())[index]
+
+    def __setitem__(self, index, value) -> None:
+        entries = list(self._entries.values())
+        entries[index] = value
+        self.rebuild(entries)
+
+    def __delitem__(self, index) -> None:
+        doomed = self[index]
+        for entry in doomed if isinstance(index, slice) else (doomed,):
+            self.discard(entry)
+
+    def insert(self, index: int, value: WaitlistEntry) -> None:
+        if index >= len(self):
+            self.append(value)
+            return
+        entries = list(self._entries.values())
+        entries.insert(index, value)
+        self.rebuild(entries)
+
+    def pop(self, index: int = -1) -> WaitlistEntry:
+        entry = self[index]
+        self.discard(entry)
+        return entry
+
+    def remove(self, value: WaitlistEntry) -> None:
+        if not self.discard(value):
+            for entry in self:
+                if entry == value:
+                    self.discard(entry)
+                    return
+            raise ValueError("Waitlist.remove(x): x not in waitlist")
+
+    def clear(self) -> None:
+        self.rebuild(())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Waitlist, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Waitlist({list(self._entries.values())!r})"
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._entries)
+            + sys.getsizeof(self._tickets)
+            + sys.getsizeof(self._by_name)
+            + sum(sys.getsizeof(t) for t in self._by_name.values())
+            + sys.getsizeof(self._by_size)
+            + sum(sys.getsizeof(h) for h in self._by_size.values())
+        )